@@ -1,45 +1,242 @@
+import asyncio
+import hashlib
 import json
 import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
 
 import httpx
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, object_session
 
 from .config import FIREBASE_PROJECT_ID
 from .database import get_db
 from .models import User
 from .security_middleware import set_rls_context
+from .services.identity_cache import cache_user, identity_cache, load_cached_user
 
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
-# Cache for Google's public keys
-_cached_keys = None
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+# Used when Google's response carries no usable Cache-Control max-age
+GOOGLE_KEYS_DEFAULT_TTL = int(os.getenv("GOOGLE_KEYS_DEFAULT_TTL", "3600"))
+# Start a background refresh this long before the keys expire
+GOOGLE_KEYS_REFRESH_MARGIN = int(os.getenv("GOOGLE_KEYS_REFRESH_MARGIN", "300"))
+# An unknown kid triggers a refetch at most this often (random kids can't hammer Google)
+GOOGLE_KEYS_MIN_REFETCH_INTERVAL = 30
+# After a failed fetch the previous keys are kept and the fetch retried this much later
+GOOGLE_KEYS_RETRY_INTERVAL = 60
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _cache_lifetime(headers) -> int:
+    """Seconds the response stays fresh: Cache-Control max-age minus Age"""
+    match = _MAX_AGE_RE.search(headers.get("cache-control", ""))
+    if not match:
+        return GOOGLE_KEYS_DEFAULT_TTL
+    try:
+        age = int(headers.get("age", "0"))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
 
 
-async def get_google_public_keys():
-    """Fetch Google's public keys for Firebase token verification"""
-    global _cached_keys
-    if _cached_keys:
-        logger.debug("✅ Using cached Google public keys")
-        return _cached_keys
+def _parse_public_keys(certs: dict) -> dict:
+    """kid -> RSAPublicKey, parsed once per key set rather than once per request"""
+    from cryptography.x509 import load_pem_x509_certificate
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
-            )
-            if response.status_code == 200:
-                _cached_keys = response.json()
-                logger.info(f"✅ Fetched {len(_cached_keys)} Google public keys")
-                return _cached_keys
+    keys = {}
+    for kid, cert_pem in certs.items():
+        try:
+            keys[kid] = load_pem_x509_certificate(cert_pem.encode()).public_key()
+        except Exception as e:
+            logger.error(f"❌ Skipping unparseable Google certificate {kid}: {e}")
+    return keys
+
+
+class GoogleKeyManager:
+    """
+    Google's token signing keys, parsed and cached for as long as Cache-Control allows.
+    Keys are refreshed in the background shortly before they expire, and concurrent
+    refetches (expiry, unknown kid) share a single request to Google. Refreshes are
+    gated on next_refresh_at, so a failed fetch is retried after GOOGLE_KEYS_RETRY_INTERVAL
+    rather than on every request.
+    """
+
+    def __init__(self):
+        self.keys: dict = {}
+        self.expires_at = 0.0
+        self.next_refresh_at = 0.0
+        self.attempted_at = 0.0
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def get_key(self, kid: str):
+        """Public key for kid, or None if Google doesn't (or no longer) publish it"""
+        now = time.time()
+        if now >= self.next_refresh_at:
+            if not self.keys or now >= self.expires_at:
+                await self.refresh()
             else:
-                logger.error(f"❌ Failed to fetch Google public keys: HTTP {response.status_code}")
-    except Exception as e:
-        logger.error(f"❌ Error fetching Google public keys: {str(e)}")
-    return None
+                self.refresh_in_background()
+
+        if kid not in self.keys and now - self.attempted_at >= GOOGLE_KEYS_MIN_REFETCH_INTERVAL:
+            # Google may have rotated in a new key since our last fetch
+            logger.warning(f"⚠️ Key ID {kid} not in cached Google keys, refetching")
+            await self.refresh()
+        return self.keys.get(kid)
+
+    def has_key(self, kid: str) -> bool:
+        return kid in self.keys
+
+    def refresh(self) -> asyncio.Future:
+        """Fetch the keys - callers arriving while a fetch is running share it"""
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._fetch())
+            self._inflight.add_done_callback(self._fetch_done)
+        return asyncio.shield(self._inflight)
+
+    def refresh_in_background(self) -> None:
+        if self._inflight is None:
+            self.refresh()
+
+    def _fetch_done(self, _future) -> None:
+        self._inflight = None
+
+    async def _fetch(self) -> None:
+        self.attempted_at = time.time()
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.get(GOOGLE_CERTS_URL)
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+            keys = _parse_public_keys(response.json())
+            if not keys:
+                raise RuntimeError("response contained no usable certificates")
+        except Exception as e:
+            # Keep serving the keys we have; try again shortly
+            logger.error(f"❌ Failed to fetch Google public keys: {e}")
+            self.next_refresh_at = time.time() + GOOGLE_KEYS_RETRY_INTERVAL
+            return
+
+        lifetime = _cache_lifetime(response.headers)
+        retired = set(self.keys) - set(keys)
+        self.keys = keys
+        if retired:
+            verified_tokens.evict_kids(retired)
+        now = time.time()
+        self.expires_at = now + lifetime
+        # Refresh ahead of expiry, but never more often than an unknown kid may refetch
+        self.next_refresh_at = max(
+            self.expires_at - min(GOOGLE_KEYS_REFRESH_MARGIN, lifetime / 2),
+            now + GOOGLE_KEYS_MIN_REFETCH_INTERVAL,
+        )
+        logger.info(f"✅ Fetched {len(keys)} Google public keys (valid for {lifetime}s)")
+
+
+google_keys = GoogleKeyManager()
+
+
+# Verified ID tokens are reused for up to an hour - remember their claims so repeat
+# requests skip decoding and RSA verification
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "10000"))
+# Cached claims are dropped this long before the token's exp
+VERIFIED_TOKEN_EXP_SKEW = 30
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified token claims keyed by the token's SHA-256. Entries expire
+    shortly before the token does and are dropped once Google stops publishing the key
+    that signed them.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()  # digest -> (claims, kid, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.rotated = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, kid, expires_at = entry
+            expired = time.time() >= expires_at
+            if expired or not google_keys.has_key(kid):
+                del self._entries[digest]
+                if expired:
+                    self.expired += 1
+                else:
+                    self.rotated += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+        return dict(claims)
+
+    def put(self, token: str, claims: dict, kid: str) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = claims.get("exp", 0) - VERIFIED_TOKEN_EXP_SKEW
+        if expires_at <= time.time():
+            return
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (dict(claims), kid, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def evict_kids(self, kids: set) -> None:
+        """Drop tokens signed with keys Google no longer publishes"""
+        with self._lock:
+            stale = [digest for digest, entry in self._entries.items() if entry[1] in kids]
+            for digest in stale:
+                del self._entries[digest]
+            self.rotated += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "rotated": self.rotated,
+                "evicted": self.evicted,
+            }
+
+
+verified_tokens = VerifiedTokenCache(VERIFIED_TOKEN_CACHE_SIZE)
 
 
 async def verify_firebase_token(token: str) -> dict:
@@ -51,15 +248,17 @@ async def verify_firebase_token(token: str) -> dict:
     import json
     import time
 
-    from cryptography.hazmat.backends import default_backend
     from cryptography.hazmat.primitives import hashes
     from cryptography.hazmat.primitives.asymmetric import padding
-    from cryptography.x509 import load_pem_x509_certificate
 
     if not FIREBASE_PROJECT_ID:
         logger.error("❌ FIREBASE_PROJECT_ID not configured")
         raise HTTPException(status_code=500, detail="Firebase not configured")
 
+    cached_claims = verified_tokens.get(token)
+    if cached_claims is not None:
+        return cached_claims
+
     try:
         # Split token into parts
         parts = token.split(".")
@@ -94,25 +293,10 @@ async def verify_firebase_token(token: str) -> dict:
 
         logger.debug(f"✅ Token header validated: alg={alg}, kid={kid}")
 
-        # Fetch Google's public keys
-        public_keys = await get_google_public_keys()
-        if not public_keys or kid not in public_keys:
-            logger.warning(
-                f"⚠️ Key ID {kid} not found in public keys, invalidating cache and retrying"
-            )
-            # Invalidate cache and retry
-            global _cached_keys
-            _cached_keys = None
-            public_keys = await get_google_public_keys()
-            if not public_keys or kid not in public_keys:
-                logger.error(f"❌ Key ID {kid} not found in public keys after retry")
-                raise HTTPException(status_code=401, detail="Unable to verify token signature")
-
-        # Get the certificate for this key ID
-        cert_pem = public_keys[kid]
-        cert = load_pem_x509_certificate(cert_pem.encode(), default_backend())
-        public_key = cert.public_key()
-        logger.debug(f"✅ Public key loaded for kid: {kid}")
+        public_key = await google_keys.get_key(kid)
+        if public_key is None:
+            logger.error(f"❌ Key ID {kid} not found in Google public keys")
+            raise HTTPException(status_code=401, detail="Unable to verify token signature")
 
         # Decode signature
         sig_padding = 4 - len(signature_b64) % 4
@@ -183,6 +367,7 @@ async def verify_firebase_token(token: str) -> dict:
         logger.debug(
             f"✅ Token cryptographically verified for user: {decoded_payload.get('email')}"
         )
+        verified_tokens.put(token, decoded_payload, kid)
         return decoded_payload
 
     except HTTPException:
@@ -243,13 +428,17 @@ async def get_current_user(
             )
             raise HTTPException(status_code=401, detail="Invalid token claims")
 
-        # Find or create user in our database
-        user = (
-            db.query(User)
-            .filter(User.firebase_uid == firebase_uid)
-            .options(joinedload(User.business_config))
-            .first()
-        )
+        # Find or create user in our database - recently seen users come from the identity cache
+        user = load_cached_user(db, firebase_uid)
+        if user is None:
+            user = (
+                db.query(User)
+                .filter(User.firebase_uid == firebase_uid)
+                .options(joinedload(User.business_config))
+                .first()
+            )
+            if user:
+                cache_user(user)
 
         if not user:
             # Check if email is already registered with a different Firebase UID
@@ -303,7 +492,7 @@ async def get_current_user(
 
         logger.debug(f"✅ User authenticated: {user.email}")
 
-        # Set RLS context for this database session
+        # RLS context for this session's transactions (applied with their first statement)
         set_rls_context(db, user.id)
 
         return user
@@ -322,6 +511,14 @@ async def get_current_user_with_plan(
     Get current user and verify they have an active plan.
     Use this dependency for all dashboard routes that require a paid plan.
     """
+    if not user.plan or user.plan.strip() == "":
+        # The identity cache may predate a payment another process just recorded
+        session = object_session(user)
+        if session is not None:
+            session.refresh(user, attribute_names=["plan"])
+            if user.plan:
+                identity_cache.invalidate_user(user.id)
+
     if not user.plan or user.plan.strip() == "":
         logger.warning(f"⚠️ User {user.email} attempted to access protected route without a plan")
         raise HTTPException(
@@ -1,10 +1,26 @@
 """
 Redis caching utilities for frequently accessed data
 Reduces database load and improves response times
+
+Entries can be tagged (e.g. user:{id}); invalidate_tags deletes every entry under a tag
+in one Redis call instead of a KEYS scan over the whole keyspace.
+
+Two tiers: a small in-process LRU (L1) in front of Redis. Every set/delete publishes
+the affected keys on a Redis pub/sub channel and each worker's listener thread evicts
+them from its L1, so workers see each other's writes within milliseconds. L1 is only
+used while that listener is subscribed. Other in-process caches (e.g. the identity
+cache) receive the same messages through on_invalidation().
 """
 
+import fnmatch
 import json
 import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
 from functools import wraps
 from typing import Any, Callable, Optional
 
@@ -12,12 +28,138 @@ from .rate_limiter import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+L1_CACHE_SIZE = int(os.getenv("CACHE_L1_SIZE", "2000"))
+# Also bounds how long a read racing another worker's write can keep a stale value
+L1_CACHE_TTL = float(os.getenv("CACHE_L1_TTL", "30"))
+# Larger serialized values are only cached in Redis
+L1_MAX_ENTRY_BYTES = int(os.getenv("CACHE_L1_MAX_ENTRY_BYTES", "65536"))
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Tag index sets live at least this long (longer if an entry's own TTL is longer)
+CACHE_TAG_TTL = int(os.getenv("CACHE_TAG_TTL", str(24 * 3600)))
+SCAN_BATCH_SIZE = 1000
+# Per-user namespaces that were cached untagged before tags existed (sweep_legacy_user_keys)
+LEGACY_USER_KEY_PATTERNS = (
+    "business_config:*",
+    "user_plan:*",
+    "user_templates_*",
+    "dashboard_summary:*",
+)
+
+# KEYS: tag index sets, ARGV: extra keys. Deletes the tagged entries, the index sets and
+# the extra keys; returns {deleted count, key names}
+INVALIDATE_TAGS_LUA = """
+local names = {}
+for _, tag_key in ipairs(KEYS) do
+    for _, name in ipairs(redis.call('SMEMBERS', tag_key)) do
+        table.insert(names, name)
+    end
+end
+for _, name in ipairs(ARGV) do
+    table.insert(names, name)
+end
+if #KEYS > 0 then
+    redis.call('DEL', unpack(KEYS))
+end
+local deleted = 0
+for i = 1, #names, 1000 do
+    deleted = deleted + redis.call('DEL', unpack(names, i, math.min(i + 999, #names)))
+end
+return {deleted, names}
+"""
+
+
+def tag_key(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def business_config_tag(user_id: int) -> str:
+    return f"business_config:{user_id}"
+
+
+class LocalCache:
+    """In-process LRU with a per-entry expiry (the L1 tier)"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[1]:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        ttl = min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict(self, keys) -> None:
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.evictions += 1
+
+    def evict_matching(self, pattern: str) -> None:
+        with self._lock:
+            matching = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+            for key in matching:
+                del self._entries[key]
+            self.evictions += len(matching)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
 
 class Cache:
-    """Redis cache wrapper with automatic serialization"""
+    """
+    Redis cache wrapper with automatic serialization and an in-process L1 tier.
+    Values served from L1 are shared between callers - treat them as read-only.
+    """
 
-    def __init__(self):
+    def __init__(self, l1_size: int = L1_CACHE_SIZE, l1_ttl: float = L1_CACHE_TTL):
         self.redis_client = None
+        self.local = LocalCache(l1_size, l1_ttl) if l1_size > 0 and l1_ttl > 0 else None
+        # Identifies this process's own invalidation messages
+        self._origin = uuid.uuid4().hex
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+        self._l1_live = False
+        self._invalidation_callbacks: list = []
 
     def _get_client(self):
         """Lazy load Redis client"""
@@ -30,39 +172,76 @@ class Cache:
         return self.redis_client
 
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+        """Get value from cache (L1 first, then Redis)"""
+        if self._l1_enabled():
+            value = self.local.get(key)
+            if value is not None:
+                logger.debug(f"✅ Cache L1 HIT: {key}")
+                return value
+
         client = self._get_client()
         if not client:
             return None
 
         try:
-            value = client.get(key)
+            if not self._l1_enabled():
+                value = client.get(key)
+                ttl_ms = None
+            else:
+                # Value and remaining TTL in one round trip - L1 never outlives Redis
+                pipe = client.pipeline(transaction=False)
+                pipe.get(key)
+                pipe.pttl(key)
+                value, ttl_ms = pipe.execute()
             if value:
                 logger.debug(f"✅ Cache HIT: {key}")
-                return json.loads(value)
+                parsed = json.loads(value)
+                if ttl_ms and ttl_ms > 0 and len(value) <= L1_MAX_ENTRY_BYTES:
+                    self.local.put(key, parsed, ttl_ms / 1000)
+                return parsed
             logger.debug(f"❌ Cache MISS: {key}")
             return None
         except Exception as e:
             logger.error(f"❌ Cache get error for {key}: {e}")
             return None
 
-    def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
-        """Set value in cache with TTL (default 1 hour)"""
+    def set(self, key: str, value: Any, ttl: int = 3600, tags: Iterable[str] = ()) -> bool:
+        """
+        Set value in cache with TTL (default 1 hour).
+        tags: the entry is deleted by invalidate_tags() for any of them
+        """
         client = self._get_client()
         if not client:
             return False
 
+        tags = tuple(tags)
         try:
             serialized = json.dumps(value)
-            client.setex(key, ttl, serialized)
-            logger.debug(f"✅ Cache SET: {key} (TTL: {ttl}s)")
-            return True
+            if tags:
+                # Entry and its tag index updates in one round trip
+                pipe = client.pipeline(transaction=False)
+                pipe.setex(key, ttl, serialized)
+                for tag in tags:
+                    pipe.sadd(tag_key(tag), key)
+                    pipe.expire(tag_key(tag), max(ttl, CACHE_TAG_TTL))
+                pipe.execute()
+            else:
+                client.setex(key, ttl, serialized)
+            logger.debug(f"✅ Cache SET: {key} (TTL: {ttl}s, tags: {list(tags)})")
         except Exception as e:
             logger.error(f"❌ Cache set error for {key}: {e}")
             return False
 
+        self._publish_invalidation(keys=[key])
+        if self._l1_enabled() and len(serialized) <= L1_MAX_ENTRY_BYTES:
+            # A private copy - the caller may keep mutating value
+            self.local.put(key, json.loads(serialized), ttl)
+        return True
+
     def delete(self, key: str) -> bool:
         """Delete value from cache"""
+        if self.local is not None:
+            self.local.evict([key])
         client = self._get_client()
         if not client:
             return False
@@ -70,34 +249,197 @@ class Cache:
         try:
             client.delete(key)
             logger.debug(f"✅ Cache DELETE: {key}")
-            return True
         except Exception as e:
             logger.error(f"❌ Cache delete error for {key}: {e}")
             return False
 
-    def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern (e.g., 'user:123:*')"""
+        if self.local is not None:
+            # A concurrent get may have refilled L1 from Redis before the delete landed
+            self.local.evict([key])
+        self._publish_invalidation(keys=[key])
+        return True
+
+    def invalidate_tags(self, *tags: str, keys: Iterable[str] = ()) -> int:
+        """
+        Delete every entry tagged with any of tags (plus keys) in one Redis call.
+        Cost depends on the number of tagged entries, not on the size of the keyspace.
+        """
         client = self._get_client()
         if not client:
             return 0
 
         try:
-            keys = client.keys(pattern)
-            if keys:
-                deleted = client.delete(*keys)
-                logger.debug(f"✅ Cache DELETE pattern: {pattern} ({deleted} keys)")
-                return deleted
+            deleted, names = client.eval(
+                INVALIDATE_TAGS_LUA, len(tags), *[tag_key(tag) for tag in tags], *keys
+            )
+            logger.debug(f"✅ Cache INVALIDATE tags {list(tags)} ({deleted} keys)")
+        except Exception as e:
+            logger.error(f"❌ Cache invalidate error for tags {list(tags)}: {e}")
             return 0
+
+        if self.local is not None and names:
+            self.local.evict(names)
+        if names:
+            self._publish_invalidation(keys=names)
+        return deleted
+
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Delete all keys matching pattern (e.g., 'user:123:*').
+        Walks the keyspace with SCAN so Redis keeps serving other clients, but it is still
+        O(keyspace) - prefer tags and invalidate_tags() for anything on a request path.
+        """
+        client = self._get_client()
+        if not client:
+            return 0
+
+        if self.local is not None:
+            self.local.evict_matching(pattern)
+        deleted = 0
+        try:
+            batch = []
+            for key in client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    deleted += client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += client.delete(*batch)
+            logger.debug(f"✅ Cache DELETE pattern: {pattern} ({deleted} keys)")
         except Exception as e:
             logger.error(f"❌ Cache delete pattern error for {pattern}: {e}")
-            return 0
+            return deleted
+
+        self._publish_invalidation(patterns=[pattern])
+        return deleted
+
+    # L1 coherence: pub/sub invalidation between workers
+
+    def on_invalidation(self, callback: Callable) -> None:
+        """
+        Call callback(keys, patterns) for every invalidation published by another process,
+        starting this process's listener if needed. Runs on the listener thread.
+        """
+        if callback not in self._invalidation_callbacks:
+            self._invalidation_callbacks.append(callback)
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+
+    def publish_invalidation(self, keys: Iterable[str] = ()) -> None:
+        """Broadcast keys to every other process's listener (L1 and on_invalidation callbacks)"""
+        self._publish(keys, ())
+
+    def _l1_enabled(self) -> bool:
+        """L1 is served only while this process is subscribed to invalidations"""
+        if self.local is None:
+            return False
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        return self._l1_live
+
+    def _start_listener(self) -> None:
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            # New process (first use or after a fork) - nothing inherited is trustworthy
+            self._listener_pid = os.getpid()
+            self._l1_live = False
+            self._clear_local()
+            threading.Thread(
+                target=self._listen, name="cache-invalidation-listener", daemon=True
+            ).start()
+
+    def _listen(self) -> None:
+        backoff = 1
+        while True:
+            pubsub = None
+            try:
+                client = self._get_client()
+                if client is None:
+                    raise RuntimeError("Redis unavailable")
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Invalidations may have been missed before (re)subscribing
+                self._clear_local()
+                self._l1_live = True
+                backoff = 1
+                logger.info("✅ Cache invalidation listener subscribed (L1 enabled)")
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._apply_invalidation(message.get("data"))
+            except Exception as e:
+                if self._l1_live:
+                    logger.warning(f"⚠️ Cache invalidation listener lost, L1 disabled: {e}")
+                self._l1_live = False
+                self._clear_local()
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception as e:
+                        logger.debug(f"Cache invalidation pubsub close failed: {e}")
+
+    def _apply_invalidation(self, data) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self._origin:
+            return  # Already applied locally
+        keys = message.get("keys", ())
+        patterns = message.get("patterns", ())
+        if self.local is not None:
+            self.local.evict(keys)
+            for pattern in patterns:
+                self.local.evict_matching(pattern)
+        for callback in self._invalidation_callbacks:
+            try:
+                callback(keys, patterns)
+            except Exception as e:
+                logger.error(f"❌ Cache invalidation callback failed: {e}")
+
+    def _clear_local(self) -> None:
+        if self.local is not None:
+            self.local.clear()
+        for callback in self._invalidation_callbacks:
+            try:
+                callback((), ("*",))
+            except Exception as e:
+                logger.error(f"❌ Cache invalidation callback failed: {e}")
+
+    def _publish_invalidation(self, keys=(), patterns=()) -> None:
+        if self.local is None:
+            return
+        self._publish(keys, patterns)
+
+    def _publish(self, keys, patterns) -> None:
+        client = self._get_client()
+        if not client:
+            return
+        try:
+            client.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps(
+                    {"origin": self._origin, "keys": list(keys), "patterns": list(patterns)}
+                ),
+            )
+        except Exception as e:
+            logger.error(f"❌ Cache invalidation publish failed: {e}")
 
 
 # Global cache instance
 cache = Cache()
 
 
-def cached(key_prefix: str, ttl: int = 3600, key_builder: Optional[Callable] = None):
+def cached(
+    key_prefix: str,
+    ttl: int = 3600,
+    key_builder: Optional[Callable] = None,
+    tags_builder: Optional[Callable] = None,
+):
     """
     Decorator to cache function results
 
@@ -105,6 +447,7 @@ def cached(key_prefix: str, ttl: int = 3600, key_builder: Optional[Callable] = N
         key_prefix: Prefix for cache key (e.g., 'business_config')
         ttl: Time to live in seconds (default 1 hour)
         key_builder: Optional function to build cache key from function args
+        tags_builder: Optional function returning the entry's tags from function args
 
     Example:
         @cached(key_prefix='business_config', ttl=3600)
@@ -131,7 +474,8 @@ def cached(key_prefix: str, ttl: int = 3600, key_builder: Optional[Callable] = N
             # Call function and cache result
             result = func(*args, **kwargs)
             if result is not None:
-                cache.set(cache_key, result, ttl)
+                tags = tags_builder(*args, **kwargs) if tags_builder else ()
+                cache.set(cache_key, result, ttl, tags=tags)
 
             return result
 
@@ -150,12 +494,18 @@ def get_business_config_cached(user_id: int) -> Optional[dict]:
 
 def set_business_config_cached(user_id: int, config: dict, ttl: int = 3600) -> bool:
     """Set business config in cache"""
-    return cache.set(f"business_config:{user_id}", config, ttl)
+    return cache.set(
+        f"business_config:{user_id}",
+        config,
+        ttl,
+        tags=(user_tag(user_id), business_config_tag(user_id)),
+    )
 
 
 def invalidate_business_config_cache(user_id: int) -> bool:
-    """Invalidate business config cache when updated"""
-    return cache.delete(f"business_config:{user_id}")
+    """Invalidate business config cache (and entries derived from it) when updated"""
+    cache.invalidate_tags(business_config_tag(user_id), keys=[f"business_config:{user_id}"])
+    return True
 
 
 def get_user_plan_cached(user_id: int) -> Optional[dict]:
@@ -165,7 +515,7 @@ def get_user_plan_cached(user_id: int) -> Optional[dict]:
 
 def set_user_plan_cached(user_id: int, plan_data: dict, ttl: int = 300) -> bool:
     """Set user plan info in cache (5 minute TTL)"""
-    return cache.set(f"user_plan:{user_id}", plan_data, ttl)
+    return cache.set(f"user_plan:{user_id}", plan_data, ttl, tags=(user_tag(user_id),))
 
 
 def invalidate_user_plan_cache(user_id: int) -> bool:
@@ -174,10 +524,21 @@ def invalidate_user_plan_cache(user_id: int) -> bool:
 
 
 def invalidate_user_cache(user_id: int) -> int:
-    """Invalidate all cache entries for a user"""
-    pattern1_count = cache.delete_pattern(f"*:{user_id}:*")
-    pattern2_count = cache.delete_pattern(f"*:{user_id}")
-    return pattern1_count + pattern2_count
+    """
+    Invalidate all cache entries tagged with the user (one Redis call, no keyspace scan).
+    Untagged keys from before tagging are removed once by sweep_legacy_user_keys().
+    """
+    return cache.invalidate_tags(user_tag(user_id))
+
+
+def sweep_legacy_user_keys() -> int:
+    """
+    One-off migration for entries cached before tagging existed: deletes every key in
+    the per-user namespaces (plain caches - they refill on the next read). Walks the
+    whole keyspace with SCAN, so run it once after deploying tags, never per request:
+        python -m app.cache --sweep-legacy
+    """
+    return sum(cache.delete_pattern(pattern) for pattern in LEGACY_USER_KEY_PATTERNS)
 
 
 # Cache key builders for complex scenarios
@@ -212,6 +573,7 @@ def get_cache_stats() -> dict:
         info = client.info()
         return {
             "available": True,
+            "l1": cache.local.stats() if cache.local is not None else None,
             "used_memory": info.get("used_memory_human"),
             "connected_clients": info.get("connected_clients"),
             "total_commands_processed": info.get("total_commands_processed"),
@@ -226,3 +588,12 @@ def get_cache_stats() -> dict:
     except Exception as e:
         logger.error(f"❌ Failed to get cache stats: {e}")
         return {"available": False, "error": str(e)}
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] != ["--sweep-legacy"]:
+        sys.exit("Usage: python -m app.cache --sweep-legacy")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.info(f"✅ Swept {sweep_legacy_user_keys()} legacy cache keys")
@@ -8,6 +8,8 @@ env_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional streaming replica for read-only endpoints (see db_replica.py)
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
 
 # Firebase Configuration
 FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
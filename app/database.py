@@ -3,10 +3,14 @@ import os
 import time
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from .config import DATABASE_URL
+from .db_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
+from .db_profiler import DB_PROFILER_ENABLED, record_query
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +22,19 @@ POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
 ENABLE_QUERY_LOGGING = os.getenv("DB_LOG_SLOW_QUERIES", "true").lower() == "true"
 SLOW_QUERY_THRESHOLD = float(os.getenv("DB_SLOW_QUERY_THRESHOLD", "1.0"))
 
+# Async engine pool (separate from the sync pool - size both against max_connections)
+ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", "10"))
+ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "20"))
+
+
+def _async_database_url(url: str):
+    """Same database via psycopg3's async driver (postgresql+psycopg selects it automatically)"""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgres", "postgresql", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    return parsed
+
+
 # Configure engine with optimized connection pooling for scale
 try:
     engine = create_engine(
@@ -28,7 +45,10 @@ try:
         max_overflow=MAX_OVERFLOW,  # Overflow connections (30 for production)
         pool_timeout=POOL_TIMEOUT,  # Wait 30s for connection
         echo=False,  # Don't log all SQL (use slow query logging instead)
+        poolclass=InstrumentedQueuePool,  # Times checkout waits (db_metrics)
+        pool_logging_name="primary",
     )
+    instrument_engine(engine, "primary")
     logger.info("✅ Database engine created successfully")
     logger.info(
         f"📊 Connection pool: size={POOL_SIZE}, max_overflow={MAX_OVERFLOW}, timeout={POOL_TIMEOUT}s"
@@ -37,23 +57,53 @@ except Exception as e:
     logger.error(f"❌ Failed to create database engine: {e}")
     raise
 
-# Slow query logging for performance monitoring
-if ENABLE_QUERY_LOGGING:
+# Async engine for async route handlers - queries await instead of blocking the event loop
+try:
+    async_engine = create_async_engine(
+        _async_database_url(DATABASE_URL),
+        pool_pre_ping=True,
+        pool_recycle=POOL_RECYCLE,
+        pool_size=ASYNC_POOL_SIZE,
+        max_overflow=ASYNC_MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name="primary_async",
+    )
+    instrument_engine(async_engine, "primary_async")
+    logger.info(
+        f"📊 Async connection pool: size={ASYNC_POOL_SIZE}, max_overflow={ASYNC_MAX_OVERFLOW}"
+    )
+except Exception as e:
+    logger.error(f"❌ Failed to create async database engine: {e}")
+    raise
+
+# Slow query logging and per-request profiling (db_profiler) share the cursor listeners
+if ENABLE_QUERY_LOGGING or DB_PROFILER_ENABLED:
 
     @event.listens_for(engine, "before_cursor_execute")
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
     def before_cursor_execute(conn, _cursor, statement, _parameters, context, _executemany):
-        conn.info.setdefault("query_start_time", []).append(time.time())
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
 
     @event.listens_for(engine, "after_cursor_execute")
+    @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
     def after_cursor_execute(conn, _cursor, statement, _parameters, context, _executemany):
-        total = time.time() - conn.info["query_start_time"].pop(-1)
-        if total > SLOW_QUERY_THRESHOLD:
+        total = time.perf_counter() - conn.info["query_start_time"].pop(-1)
+        if DB_PROFILER_ENABLED:
+            record_query(statement, total)
+        if ENABLE_QUERY_LOGGING and total > SLOW_QUERY_THRESHOLD:
             # Log slow queries for optimization
             logger.warning(f"🐌 Slow query ({total:.2f}s): {statement[:200]}...")
 
-    logger.info(f"📊 Slow query logging enabled (threshold: {SLOW_QUERY_THRESHOLD}s)")
+    if ENABLE_QUERY_LOGGING:
+        logger.info(f"📊 Slow query logging enabled (threshold: {SLOW_QUERY_THRESHOLD}s)")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False - expired attributes would need an implicit (sync) refresh in async code
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 Base = declarative_base()
 
 
@@ -63,3 +113,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
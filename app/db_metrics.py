@@ -0,0 +1,255 @@
+"""
+Connection pool telemetry
+Pool events (connect, checkout, checkin, invalidate) plus a timed pool class track
+checkout wait, checked-out and overflow connections, connection age, pool timeouts and
+how long each route holds a connection. Served by GET /internal/metrics/db-pool
+(requires INTERNAL_METRICS_TOKEN in the X-Internal-Token header).
+"""
+
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# Checkout waits longer than this are logged (at most once per POOL_WARN_INTERVAL per pool)
+POOL_WAIT_WARN_MS = float(os.getenv("DB_POOL_WAIT_WARN_MS", "100"))
+POOL_WARN_INTERVAL = float(os.getenv("DB_POOL_WARN_INTERVAL", "10"))
+MAX_TRACKED_ROUTES = 500
+# The metrics endpoint is disabled (404) unless this is set
+INTERNAL_METRICS_TOKEN = os.getenv("INTERNAL_METRICS_TOKEN")
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# Request scope of the current request - checkouts are attributed to its route
+_current_scope: ContextVar[Optional[dict]] = ContextVar("db_pool_request_scope", default=None)
+
+_pools: dict[str, "PoolStats"] = {}
+
+
+def _route_of(scope: Optional[dict]) -> str:
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    return f"{scope.get('method', '')} {getattr(route, 'path', scope.get('path', '?'))}"
+
+
+class PoolStats:
+    """Counters for one engine's pool"""
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.slow_waits = 0
+        self.max_connection_age = 0.0
+        # route -> [checkouts, total hold ms, max hold ms]
+        self.routes: dict[str, list] = {}
+        # id(connection record) -> (request scope, checkout time) for checked-out connections
+        self.holders: dict[int, tuple] = {}
+        self._last_warning = 0.0
+
+    # Pool events
+
+    def on_connect(self, _dbapi_connection, record):
+        record.info["connected_at"] = time.monotonic()
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, _dbapi_connection, record, _proxy):
+        pool = self.engine.pool
+        with self._lock:
+            self.checkouts += 1
+            self.holders[id(record)] = (_current_scope.get(), time.monotonic())
+            self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+            if isinstance(pool, QueuePool):
+                self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+    def on_checkin(self, _dbapi_connection, record):
+        now = time.monotonic()
+        with self._lock:
+            held = self.holders.pop(id(record), None)
+            connected_at = record.info.get("connected_at")
+            if connected_at is not None:
+                self.max_connection_age = max(self.max_connection_age, now - connected_at)
+            if held is None:
+                return
+            route = _route_of(held[0])
+            hold_ms = (now - held[1]) * 1000
+            stats = self.routes.get(route)
+            if stats is None:
+                if len(self.routes) >= MAX_TRACKED_ROUTES:
+                    return
+                stats = self.routes[route] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += hold_ms
+            stats[2] = max(stats[2], hold_ms)
+
+    def on_invalidate(self, _dbapi_connection, record, exception):
+        with self._lock:
+            self.invalidations += 1
+            self.holders.pop(id(record), None)
+        logger.warning(f"⚠️ DB pool {self.name}: connection invalidated ({exception})")
+
+    # Timed checkout (InstrumentedQueuePool)
+
+    def record_wait(self, wait_ms: float):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            bucket = next(
+                (i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound),
+                len(WAIT_BUCKETS_MS),
+            )
+            self.wait_buckets[bucket] += 1
+            slow = wait_ms > POOL_WAIT_WARN_MS
+            if slow:
+                self.slow_waits += 1
+        if slow and self._should_warn():
+            logger.warning(
+                f"🐌 DB pool {self.name}: checkout waited {wait_ms:.0f}ms "
+                f"({self.engine.pool.status()}); longest holders: {self.top_holders()}"
+            )
+
+    def record_timeout(self, wait_ms: float):
+        with self._lock:
+            self.timeouts += 1
+        logger.error(
+            f"❌ DB pool {self.name}: checkout timed out after {wait_ms:.0f}ms "
+            f"({self.engine.pool.status()}); longest holders: {self.top_holders()}"
+        )
+
+    def _should_warn(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_warning < POOL_WARN_INTERVAL:
+            return False
+        self._last_warning = now
+        return True
+
+    # Reporting
+
+    def top_holders(self, limit: int = 5) -> list[str]:
+        """Routes currently holding connections, longest first"""
+        now = time.monotonic()
+        with self._lock:
+            holders = sorted(self.holders.values(), key=lambda held: held[1])[:limit]
+        return [f"{_route_of(scope)} {(now - since) * 1000:.0f}ms" for scope, since in holders]
+
+    def snapshot(self, top_routes: int = 20) -> dict:
+        pool = self.engine.pool
+        with self._lock:
+            routes = sorted(self.routes.items(), key=lambda item: item[1][1], reverse=True)
+            snapshot = {
+                "pool": {
+                    "size": pool.size() if isinstance(pool, QueuePool) else None,
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow() if isinstance(pool, QueuePool) else None,
+                    "max_overflow": getattr(pool, "_max_overflow", None),
+                    "peak_checked_out": self.peak_checked_out,
+                    "peak_overflow": self.peak_overflow,
+                },
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "checkout_wait_ms": {
+                    "count": self.wait_count,
+                    "avg": round(self.wait_total_ms / self.wait_count, 3) if self.wait_count else 0,
+                    "max": round(self.wait_max_ms, 3),
+                    "over_threshold": self.slow_waits,
+                    "buckets": {
+                        **{
+                            f"le_{bound}": n for bound, n in zip(WAIT_BUCKETS_MS, self.wait_buckets)
+                        },
+                        "gt_max": self.wait_buckets[-1],
+                    },
+                },
+                "max_connection_age_s": round(self.max_connection_age, 1),
+                "routes_by_hold_time": [
+                    {
+                        "route": route,
+                        "checkouts": count,
+                        "total_hold_ms": round(total, 1),
+                        "avg_hold_ms": round(total / count, 2),
+                        "max_hold_ms": round(longest, 1),
+                    }
+                    for route, (count, total, longest) in routes[:top_routes]
+                ],
+            }
+        snapshot["current_holders"] = self.top_holders()
+        return snapshot
+
+
+class _TimedCheckout:
+    """Times connection checkout (the wait for a free connection) and counts pool timeouts"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        stats = _pools.get(getattr(self, "logging_name", None) or "")
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if stats is not None:
+                stats.record_timeout((time.perf_counter() - start) * 1000)
+            raise
+        if stats is not None:
+            stats.record_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, name: str) -> PoolStats:
+    """
+    Attach pool event listeners to an engine. The engine must be created with
+    pool_logging_name=name (and an Instrumented*QueuePool poolclass for wait times).
+    """
+    engine = getattr(engine, "sync_engine", engine)  # AsyncEngine events go to its sync engine
+    stats = PoolStats(name, engine)
+    event.listen(engine, "connect", stats.on_connect)
+    event.listen(engine, "checkout", stats.on_checkout)
+    event.listen(engine, "checkin", stats.on_checkin)
+    event.listen(engine, "invalidate", stats.on_invalidate)
+    _pools[name] = stats
+    return stats
+
+
+def pool_metrics() -> dict:
+    return {name: stats.snapshot() for name, stats in _pools.items()}
+
+
+class PoolMetricsMiddleware(BaseHTTPMiddleware):
+    """Make the request's route visible to pool checkouts made while serving it"""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        token = _current_scope.set(request.scope)
+        try:
+            return await call_next(request)
+        finally:
+            _current_scope.reset(token)
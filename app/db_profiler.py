@@ -0,0 +1,118 @@
+"""
+Per-request SQL profiler
+Counts statements and DB time for each request (fed by the cursor-execute listeners in
+database.py), flags repeated statement shapes (N+1 patterns), adds a Server-Timing
+header and logs sampled summaries
+"""
+
+import logging
+import os
+import random
+import re
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+DB_PROFILER_ENABLED = os.getenv("DB_PROFILER_ENABLED", "true").lower() == "true"
+# Same statement shape executed this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_PROFILER_N_PLUS_ONE_THRESHOLD", "5"))
+# Fraction of requests whose query summary is logged (N+1 hits are always logged once per route)
+LOG_SAMPLE_RATE = float(os.getenv("DB_PROFILER_LOG_SAMPLE_RATE", "0.01"))
+MAX_REPORTED_ROUTES = 1000
+
+_IN_LIST_RE = re.compile(r"IN \((?:__\[POSTCOMPILE_\w+\]|[^()]*)\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions differing only in IN-list length compare equal"""
+    statement = _IN_LIST_RE.sub("IN (…)", statement)
+    return _WHITESPACE_RE.sub(" ", statement).strip()
+
+
+class RequestProfile:
+    """Statement counts and DB time for one request"""
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Statement shapes executed at least N_PLUS_ONE_THRESHOLD times, most frequent first"""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= N_PLUS_ONE_THRESHOLD
+        ]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "db_request_profile", default=None
+)
+
+# (route, shape) pairs already reported as N+1 by this process
+_reported_n_plus_one: set[tuple[str, str]] = set()
+
+
+def record_query(statement: str, duration: float):
+    """Called by the engine listeners - no-op outside a profiled request (workers, scripts)"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, duration)
+
+
+class DBProfilerMiddleware(BaseHTTPMiddleware):
+    """Attach a RequestProfile to each request and report it when the response starts"""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_profile.reset(token)
+
+        if profile.count:
+            duration_ms = profile.duration * 1000
+            response.headers.append(
+                "Server-Timing", f'db;dur={duration_ms:.1f};desc="{profile.count} queries"'
+            )
+            _report(request, profile, duration_ms)
+
+        return response
+
+
+def _report(request: Request, profile: RequestProfile, duration_ms: float):
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", request.url.path)
+    endpoint = f"{request.method} {route_path}"
+
+    new_repeats = []
+    for shape, count in profile.repeated():
+        key = (endpoint, shape)
+        if key not in _reported_n_plus_one and len(_reported_n_plus_one) < MAX_REPORTED_ROUTES:
+            _reported_n_plus_one.add(key)
+            new_repeats.append((shape, count))
+
+    for shape, count in new_repeats:
+        logger.warning(f"🔁 Possible N+1 in {endpoint}: {count}x {shape[:300]}")
+
+    if new_repeats or random.random() < LOG_SAMPLE_RATE:  # noqa: S311 - sampling, not security
+        logger.info(
+            f"📊 DB profile {endpoint}: {profile.count} queries, {duration_ms:.1f}ms, "
+            f"{len(profile.shapes)} distinct"
+        )
@@ -0,0 +1,211 @@
+"""
+Read replica routing
+Optional DATABASE_REPLICA_URL with its own connection pools. Read-only endpoints take
+get_read_db / get_async_read_db, which use the replica while it is reachable and caught
+up, and fall back to the primary otherwise. A client that just wrote something reads
+from the primary for DB_READ_STICKY_SECONDS so it always sees its own writes.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from .config import DATABASE_REPLICA_URL
+from .database import (
+    ENABLE_QUERY_LOGGING,
+    POOL_RECYCLE,
+    POOL_TIMEOUT,
+    AsyncSessionLocal,
+    SessionLocal,
+    _async_database_url,
+)
+from .db_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
+from .db_profiler import DB_PROFILER_ENABLED
+
+logger = logging.getLogger(__name__)
+
+REPLICA_POOL_SIZE = int(os.getenv("DB_REPLICA_POOL_SIZE", "20"))
+REPLICA_MAX_OVERFLOW = int(os.getenv("DB_REPLICA_MAX_OVERFLOW", "30"))
+REPLICA_ASYNC_POOL_SIZE = int(os.getenv("DB_REPLICA_ASYNC_POOL_SIZE", "10"))
+REPLICA_ASYNC_MAX_OVERFLOW = int(os.getenv("DB_REPLICA_ASYNC_MAX_OVERFLOW", "20"))
+# Replica further behind the primary than this serves no reads
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "5"))
+# Reads stay on the primary this long after a client's successful write
+READ_STICKY_SECONDS = int(os.getenv("DB_READ_STICKY_SECONDS", "10"))
+READ_STICKY_COOKIE = "db_read_primary"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Replay lag in seconds; 0 when the replica has applied everything it received
+# (an idle primary would otherwise look like a growing lag)
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+replica_engine = None
+async_replica_engine = None
+ReplicaSessionLocal = None
+AsyncReplicaSessionLocal = None
+
+if DATABASE_REPLICA_URL:
+    try:
+        replica_engine = create_engine(
+            DATABASE_REPLICA_URL,
+            pool_pre_ping=True,
+            pool_recycle=POOL_RECYCLE,
+            pool_size=REPLICA_POOL_SIZE,
+            max_overflow=REPLICA_MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+            echo=False,
+            poolclass=InstrumentedQueuePool,
+            pool_logging_name="replica",
+        )
+        async_replica_engine = create_async_engine(
+            _async_database_url(DATABASE_REPLICA_URL),
+            pool_pre_ping=True,
+            pool_recycle=POOL_RECYCLE,
+            pool_size=REPLICA_ASYNC_POOL_SIZE,
+            max_overflow=REPLICA_ASYNC_MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+            echo=False,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_logging_name="replica_async",
+        )
+        instrument_engine(replica_engine, "replica")
+        instrument_engine(async_replica_engine, "replica_async")
+        ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+        AsyncReplicaSessionLocal = async_sessionmaker(
+            async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+        logger.info(
+            f"📊 Read replica pool: size={REPLICA_POOL_SIZE}, "
+            f"max_overflow={REPLICA_MAX_OVERFLOW}, max_lag={REPLICA_MAX_LAG_SECONDS}s"
+        )
+    except Exception as e:
+        # Reads fall back to the primary - a bad replica URL must not take the API down
+        logger.error(f"❌ Failed to create read replica engine, using primary for reads: {e}")
+        replica_engine = async_replica_engine = None
+        ReplicaSessionLocal = AsyncReplicaSessionLocal = None
+
+    if replica_engine is not None and (ENABLE_QUERY_LOGGING or DB_PROFILER_ENABLED):
+        from .database import after_cursor_execute, before_cursor_execute
+
+        for target in (replica_engine, async_replica_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", before_cursor_execute)
+            event.listen(target, "after_cursor_execute", after_cursor_execute)
+
+
+class _ReplicaHealth:
+    """Last measured replica lag, refreshed at most every REPLICA_LAG_CHECK_INTERVAL"""
+
+    def __init__(self):
+        self.checked_at = 0.0
+        self.usable = False
+        self.lag = None
+        self._lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.checked_at >= REPLICA_LAG_CHECK_INTERVAL
+
+    def refresh(self) -> bool:
+        # One check at a time - concurrent callers use the previous result
+        if not self._lock.acquire(blocking=False):
+            return self.usable
+        try:
+            if not self.is_stale():
+                return self.usable
+            try:
+                with replica_engine.connect() as conn:
+                    lag = float(conn.execute(REPLICA_LAG_SQL).scalar() or 0)
+                usable = lag <= REPLICA_MAX_LAG_SECONDS
+                if usable and not self.usable:
+                    logger.info(f"✅ Read replica serving reads (lag {lag:.1f}s)")
+                elif not usable and self.usable:
+                    logger.warning(
+                        f"⚠️ Read replica lag {lag:.1f}s exceeds {REPLICA_MAX_LAG_SECONDS}s - "
+                        f"reads go to the primary"
+                    )
+                self.lag = lag
+            except Exception as e:
+                if self.usable:
+                    logger.warning(f"⚠️ Read replica unreachable, reads go to the primary: {e}")
+                usable = False
+                self.lag = None
+            self.usable = usable
+            self.checked_at = time.monotonic()
+            return usable
+        finally:
+            self._lock.release()
+
+
+replica_health = _ReplicaHealth()
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """Writes, and reads shortly after this client's last write, use the primary"""
+    return request.method not in SAFE_METHODS or READ_STICKY_COOKIE in request.cookies
+
+
+def replica_available() -> bool:
+    if replica_engine is None:
+        return False
+    if replica_health.is_stale():
+        return replica_health.refresh()
+    return replica_health.usable
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints - the replica when usable, otherwise the primary"""
+    if not reads_pinned_to_primary(request) and replica_available():
+        db = ReplicaSessionLocal()
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of get_read_db"""
+    use_replica = False
+    if replica_engine is not None and not reads_pinned_to_primary(request):
+        if replica_health.is_stale():
+            # The lag check is a blocking round trip - keep it off the event loop
+            use_replica = await asyncio.to_thread(replica_health.refresh)
+        else:
+            use_replica = replica_health.usable
+
+    session_factory = AsyncReplicaSessionLocal if use_replica else AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+class ReadAfterWriteMiddleware(BaseHTTPMiddleware):
+    """Pin the client's reads to the primary for READ_STICKY_SECONDS after a successful write"""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        response = await call_next(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                key=READ_STICKY_COOKIE,
+                value="1",
+                max_age=READ_STICKY_SECONDS,
+                httponly=True,
+                secure=True,
+                samesite="lax",
+                path="/",
+            )
+        return response
@@ -171,12 +171,8 @@ class ClientRepository:
             query = query.filter(Client.status == status)
 
         if search:
-            search_term = f"%{search.lower()}%"
-            query = query.filter(
-                (Client.business_name.ilike(search_term))
-                | (Client.contact_name.ilike(search_term))
-                | (Client.email.ilike(search_term))
-            )
+            # search_text is lower(name/contact/email) with a trigram index
+            query = query.filter(Client.search_text.like(f"%{search.lower()}%"))
 
         if start_date:
             query = query.filter(Client.created_at >= start_date)
@@ -3,22 +3,24 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from ...models import BusinessConfig, Client, Contract, User
+from ...pagination import filter_status
 
 
 class ContractRepository:
     """Repository for contract database operations"""
 
     @staticmethod
-    def get_contracts(
+    def contracts_query(
         db: Session,
         user_id: int,
         client_id: Optional[int] = None,
         include_all: bool = False,
-    ) -> list[Contract]:
-        """Get all contracts for a user with optional filters"""
+        status: Optional[str] = None,
+    ) -> Query:
+        """Unordered query for a user's contracts with optional filters"""
         query = db.query(Contract).filter(Contract.user_id == user_id)
 
         # Filter by onboarding status unless include_all is True
@@ -28,7 +30,7 @@ class ContractRepository:
         if client_id:
             query = query.filter(Contract.client_id == client_id)
 
-        return query.order_by(Contract.created_at.desc()).all()
+        return filter_status(query, Contract.status, status)
 
     @staticmethod
     def get_contract_by_id(db: Session, contract_id: int, user_id: int) -> Optional[Contract]:
@@ -81,31 +83,27 @@ class ContractRepository:
         db.commit()
 
     @staticmethod
-    def batch_delete_contracts(db: Session, contract_ids: list[int], user_id: int) -> int:
+    def batch_delete_contracts(db: Session, contract_ids: list[int], user_id: int) -> dict:
         """
-        Batch delete multiple contracts.
-        Returns count of deleted contracts.
+        Batch delete multiple contracts (set-based, one transaction).
+        Returns deletedCount and per-id results.
         """
-        deleted_count = 0
-
-        for contract_id in contract_ids:
-            contract = (
-                db.query(Contract)
-                .filter(Contract.id == contract_id, Contract.user_id == user_id)
-                .first()
-            )
-            if contract:
-                db.delete(contract)
-                deleted_count += 1
+        from ...services.batch_delete import delete_contracts
 
-        db.commit()
-        return deleted_count
+        return delete_contracts(db, user_id, contract_ids)
 
     @staticmethod
     def get_client_by_id(db: Session, client_id: int) -> Optional[Client]:
         """Get a client by ID"""
         return db.query(Client).filter(Client.id == client_id).first()
 
+    @staticmethod
+    def get_clients_by_ids(db: Session, client_ids: set[int]) -> dict[int, Client]:
+        """Get clients keyed by ID in a single query"""
+        if not client_ids:
+            return {}
+        return {c.id: c for c in db.query(Client).filter(Client.id.in_(client_ids)).all()}
+
     @staticmethod
     def get_business_config(db: Session, user_id: int) -> Optional[BusinessConfig]:
         """Get business configuration for a user"""
@@ -118,10 +116,15 @@ class ContractRepository:
 
     @staticmethod
     def update_contract_pdf(
-        db: Session, contract: Contract, pdf_key: str, pdf_url: Optional[str] = None
+        db: Session,
+        contract: Contract,
+        pdf_key: str,
+        pdf_url: Optional[str] = None,
+        pdf_hash: Optional[str] = None,
     ) -> Contract:
-        """Update contract with PDF information"""
+        """Update contract with PDF information (pdf_hash is the download ETag)"""
         contract.pdf_key = pdf_key
+        contract.pdf_hash = pdf_hash
         if pdf_url:
             contract.pdf_url = pdf_url
         db.commit()
@@ -3,17 +3,21 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from arq.connections import ArqRedis
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from ...auth import get_current_user
 from ...database import get_db
+from ...job_queue import get_arq_pool
 from ...models import User
+from ...pagination import ListParams, set_page_headers
 from ...routes.upload import generate_presigned_url
 from .pdf_service import ContractPDFService
 from .schemas import (
     BatchDeleteRequest,
     ContractCreate,
+    ContractRerenderRequest,
     ContractResponse,
     ContractUpdate,
     ProviderSignatureRequest,
@@ -37,13 +41,23 @@ def get_contract_service(db: Session = Depends(get_db)) -> ContractService:
 
 @router.get("", response_model=list[ContractResponse])
 async def get_contracts(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     service: ContractService = Depends(get_contract_service),
     client_id: Optional[int] = Query(None, description="Filter contracts by client ID"),
+    status: Optional[str] = Query(None, description="Filter by status (comma-separated)"),
     include_all: bool = Query(False, description="Include contracts in all onboarding statuses"),
+    params: ListParams = Depends(),
 ):
-    """Get all contracts for the current user"""
-    contracts = service.get_contracts(current_user, client_id, include_all)
+    """
+    Get contracts for the current user
+    Paginated with limit/cursor; the next cursor is returned in X-Next-Cursor
+    """
+    page = service.get_contracts_page(current_user, params, client_id, include_all, status)
+    set_page_headers(request, response, page)
+    contracts = page.items
+    clients_by_id = service.repo.get_clients_by_ids(service.db, {c.client_id for c in contracts})
 
     # Get provider's default signature
     business_config = service.repo.get_business_config(service.db, current_user.id)
@@ -56,7 +70,7 @@ async def get_contracts(
 
     result = []
     for contract in contracts:
-        client = service.repo.get_client_by_id(service.db, contract.client_id)
+        client = clients_by_id.get(contract.client_id)
         pdf_url = ContractPDFService.get_pdf_url(contract.pdf_key, contract.public_id)
 
         result.append(
@@ -199,6 +213,36 @@ async def batch_delete_contracts(
     return service.batch_delete_contracts(data.contract_ids, current_user)
 
 
+@router.post("/rerender")
+async def rerender_contract_pdfs(
+    data: ContractRerenderRequest,
+    current_user: User = Depends(get_current_user),
+    arq_pool: Optional[ArqRedis] = Depends(get_arq_pool),
+):
+    """
+    Queue regeneration of all contract PDFs after branding, terms or pricing changes.
+    Runs on the low-priority queue - poll /jobs/status/{jobId} for progress.
+    """
+    from ...services.contract_rerender import LOW_PRIORITY_QUEUE
+
+    if arq_pool is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    try:
+        job = await arq_pool.enqueue_job(
+            "rerender_business_contracts_task",
+            current_user.id,
+            data.includeSigned,
+            _queue_name=LOW_PRIORITY_QUEUE,
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to queue contract re-render for user {current_user.id}: {e}")
+        raise HTTPException(status_code=503, detail="Failed to queue contract re-render") from e
+
+    logger.info(f"✅ Contract re-render queued for user {current_user.id}: job {job.job_id}")
+    return {"message": "Contract re-render queued", "jobId": job.job_id}
+
+
 # ============================================================================
 # CONTRACT SIGNING
 # ============================================================================
@@ -419,9 +463,12 @@ async def sign_contract_public(
 
     # Regenerate PDF with client signature
     try:
-        from arq import create_pool
-        from ...worker import get_redis_settings
-        from ...routes.contracts_pdf import calculate_quote, generate_contract_html, html_to_pdf
+        from ...routes.contracts_pdf import (
+            calculate_quote,
+            generate_contract_html,
+            html_to_pdf,
+            set_contract_pdf,
+        )
         from ...routes.upload import get_r2_client
         from ...config import R2_BUCKET_NAME
 
@@ -460,8 +507,8 @@ async def sign_contract_public(
             ContentType="application/pdf",
         )
 
-        # Update contract with new PDF key
-        contract.pdf_key = pdf_key
+        # Update contract with new PDF key and hash
+        set_contract_pdf(contract, pdf_key, pdf_bytes)
         service.db.commit()
 
         logger.info(f"✅ PDF regenerated successfully with client signature: {pdf_key}")
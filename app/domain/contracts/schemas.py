@@ -78,6 +78,12 @@ class BatchDeleteRequest(BaseModel):
     contract_ids: list[int]
 
 
+class ContractRerenderRequest(BaseModel):
+    """Schema for bulk PDF re-render after branding/terms changes"""
+
+    includeSigned: bool = False  # Also refresh branding on signed/active contracts
+
+
 class ContractGenerateRequest(BaseModel):
     """Schema for PDF generation request"""
 
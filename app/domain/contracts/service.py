@@ -12,6 +12,7 @@ from ...email_service import (
     send_provider_contract_signed_confirmation,
 )
 from ...models import BusinessConfig, Contract, User
+from ...pagination import ListParams, Page, paginate
 from ...utils.sanitization import sanitize_string
 from ...routes.upload import generate_presigned_url
 from .pdf_service import ContractPDFService
@@ -20,6 +21,12 @@ from .schemas import ContractCreate, ContractUpdate, ProviderSignatureRequest
 
 logger = logging.getLogger(__name__)
 
+CONTRACT_SORT_FIELDS = {
+    "created_at": Contract.created_at,
+    "status": Contract.status,
+    "start_date": Contract.start_date,
+}
+
 
 class ContractService:
     """Service layer for contract business logic"""
@@ -29,14 +36,17 @@ class ContractService:
         self.repo = ContractRepository()
         self.pdf_service = ContractPDFService()
 
-    def get_contracts(
+    def get_contracts_page(
         self,
         user: User,
+        params: ListParams,
         client_id: Optional[int] = None,
         include_all: bool = False,
-    ) -> list[Contract]:
-        """Get all contracts for a user"""
-        return self.repo.get_contracts(self.db, user.id, client_id, include_all)
+        status: Optional[str] = None,
+    ) -> Page:
+        """Get one page of a user's contracts"""
+        query = self.repo.contracts_query(self.db, user.id, client_id, include_all, status)
+        return paginate(query, params, model=Contract, sort_fields=CONTRACT_SORT_FIELDS)
 
     def get_contract(self, contract_id: int, user: User) -> Contract:
         """Get a specific contract"""
@@ -118,13 +128,11 @@ class ContractService:
         if not contract_ids:
             raise HTTPException(status_code=400, detail="No contract IDs provided")
 
-        deleted_count = self.repo.batch_delete_contracts(self.db, contract_ids, user.id)
-
-        logger.info(f"✅ User {user.id} deleted {deleted_count} contracts")
+        result = self.repo.batch_delete_contracts(self.db, contract_ids, user.id)
 
         return {
-            "message": f"Successfully deleted {deleted_count} contract(s)",
-            "deletedCount": deleted_count,
+            "message": f"Successfully deleted {result['deletedCount']} contract(s)",
+            **result,
         }
 
     async def sign_contract_as_provider(
@@ -157,7 +165,12 @@ class ContractService:
 
         # Regenerate PDF with provider signature
         try:
-            from ...routes.contracts_pdf import calculate_quote, generate_contract_html, html_to_pdf
+            from ...routes.contracts_pdf import (
+                calculate_quote,
+                generate_contract_html,
+                html_to_pdf,
+                set_contract_pdf,
+            )
             from ...routes.upload import get_r2_client
             from ...config import R2_BUCKET_NAME
 
@@ -198,8 +211,8 @@ class ContractService:
                     ContentType="application/pdf",
                 )
 
-                # Update contract with new PDF key
-                contract.pdf_key = pdf_key
+                # Update contract with new PDF key and hash
+                set_contract_pdf(contract, pdf_key, pdf_bytes)
                 self.db.commit()
 
                 logger.info(f"✅ PDF regenerated successfully with provider signature: {pdf_key}")
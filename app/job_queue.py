@@ -0,0 +1,114 @@
+"""
+Shared ARQ Redis pool for enqueuing background jobs and reading job status
+One pool per API process, opened in the app lifespan and kept healthy in the background
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from arq import create_pool
+from arq.connections import ArqRedis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+
+logger = logging.getLogger(__name__)
+
+ARQ_POOL_MAX_CONNECTIONS = int(os.getenv("ARQ_POOL_MAX_CONNECTIONS", "20"))
+ARQ_POOL_HEALTH_CHECK_INTERVAL = int(os.getenv("ARQ_POOL_HEALTH_CHECK_INTERVAL", "30"))  # seconds
+ARQ_POOL_RECONNECT_INTERVAL = 5  # Minimum seconds between reconnect attempts while Redis is down
+
+
+class ArqPool:
+    """Lazily (re)connecting ARQ pool with a periodic PING health check"""
+
+    def __init__(self):
+        self._pool: Optional[ArqRedis] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._next_connect_at = 0.0
+
+    async def start(self):
+        """Start the health check loop, which opens the first connection in the background"""
+        self._lock = asyncio.Lock()
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self):
+        """Stop the health check and close the pool"""
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        await self._discard()
+
+    async def get(self) -> Optional[ArqRedis]:
+        """Return the shared pool, reconnecting if needed (None while Redis is unreachable)"""
+        if self._pool is not None:
+            return self._pool
+
+        if self._lock is None:  # Used outside the lifespan (e.g. scripts)
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._pool is not None:
+                return self._pool
+            if time.monotonic() < self._next_connect_at:
+                return None
+            try:
+                self._pool = await self._connect()
+            except Exception as e:
+                self._next_connect_at = time.monotonic() + ARQ_POOL_RECONNECT_INTERVAL
+                logger.warning(f"⚠️ ARQ Redis pool unavailable: {type(e).__name__}: {e}")
+            return self._pool
+
+    async def _connect(self) -> ArqRedis:
+        from .worker import get_redis_settings
+
+        settings = get_redis_settings()
+        settings.max_connections = ARQ_POOL_MAX_CONNECTIONS
+        # Fail fast - the health loop keeps retrying instead of blocking requests
+        settings.conn_retries = 1
+        # Transparently retry commands on dropped connections (idle TLS sockets get reaped)
+        settings.retry_on_timeout = True
+        settings.retry = Retry(ExponentialBackoff(cap=2, base=0.1), retries=3)
+        return await create_pool(settings)
+
+    async def _discard(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            try:
+                await pool.close()
+            except Exception as e:
+                logger.debug(f"ARQ pool close failed (non-critical): {e}")
+
+    async def _health_loop(self):
+        # Don't hold up app startup on a slow or unreachable Redis
+        if await self.get() is not None:
+            logger.info("✅ ARQ Redis pool ready")
+
+        while True:
+            await asyncio.sleep(ARQ_POOL_HEALTH_CHECK_INTERVAL)
+            pool = self._pool
+            if pool is None:
+                await self.get()
+                continue
+            try:
+                await asyncio.wait_for(pool.ping(), timeout=5)
+            except Exception as e:
+                logger.warning(f"⚠️ ARQ Redis health check failed, reconnecting: {e}")
+                await self._discard()
+                await self.get()
+
+
+# Global pool instance
+arq_pool = ArqPool()
+
+
+async def get_arq_pool() -> Optional[ArqRedis]:
+    """FastAPI dependency - shared ARQ pool, or None when Redis is unavailable"""
+    return await arq_pool.get()
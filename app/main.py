@@ -1,9 +1,11 @@
 import logging
 import os
+import secrets
 import time
 from contextlib import asynccontextmanager
+from typing import Optional
 
-from fastapi import FastAPI, Request, Response
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -21,7 +23,11 @@ from . import (
     models_visit,  # noqa: F401
 )
 from .csrf import CSRF_COOKIE_NAME, CSRFMiddleware, generate_csrf_token
-from .database import Base, engine, get_db
+from .database import engine, get_db
+from .db_metrics import INTERNAL_METRICS_TOKEN, PoolMetricsMiddleware, pool_metrics
+from .db_profiler import DB_PROFILER_ENABLED, DBProfilerMiddleware
+from .db_replica import ReadAfterWriteMiddleware, replica_engine
+from .pagination import PAGINATION_HEADERS
 from .routes import auth_router
 
 # NEW: Use domain-driven billing router
@@ -36,7 +42,9 @@ from .domain.contracts import router as contracts_router
 
 # Keep original contracts_pdf router for PDF generation (will be integrated later)
 from .routes.contracts_pdf import router as contracts_pdf_router
+from .routes.dashboard import router as dashboard_router
 from .routes.email import router as email_router
+from .routes.exports import router as exports_router
 from .routes.geocoding import router as geocoding_router
 from .routes.google_calendar import router as google_calendar_router
 from .routes.integration_requests import router as integration_requests_router
@@ -91,16 +99,11 @@ SECURITY_HEADERS_ENABLED = os.getenv("SECURITY_HEADERS_ENABLED", "true").lower()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Application starting up...")
-    try:
-        Base.metadata.create_all(bind=engine, checkfirst=True)
-        logger.info("Database tables created successfully")
-    except Exception as e:
-        # Ignore "already exists" errors from race conditions between workers
-        error_msg = str(e)
-        if "already exists" in error_msg or "duplicate key" in error_msg:
-            logger.info("Database tables already exist (created by another worker)")
-        else:
-            logger.error(f"Failed to create database tables: {e}")
+    # One-row version check instead of create_all (which reflected every table in every
+    # worker and raced on DDL). Tables are created by `python run_migration.py`
+    from .schema_version import check_schema_version
+
+    check_schema_version(engine)
 
     try:
         from .rate_limiter import get_redis_client
@@ -112,8 +115,17 @@ async def lifespan(app: FastAPI):
             f"Redis connection failed - Rate limiting will operate in fail-open mode: {e}"
         )
 
+    # Shared ARQ pool - reused by every request that enqueues or polls jobs
+    from .job_queue import arq_pool
+
+    await arq_pool.start()
+
     yield
     logger.info("Application shutting down...")
+    from .services.job_events import job_event_hub
+
+    await job_event_hub.close()
+    await arq_pool.close()
 
 
 app = FastAPI(title="CleanEnroll API", version="1.0.0", lifespan=lifespan)
@@ -208,6 +220,17 @@ async def log_requests(request: Request, call_next):
         raise
 
 
+if DB_PROFILER_ENABLED:
+    app.add_middleware(DBProfilerMiddleware)
+    logger.info("Per-request DB profiling enabled")
+
+# Attributes pool checkouts to routes for /internal/metrics/db-pool
+app.add_middleware(PoolMetricsMiddleware)
+
+if replica_engine is not None:
+    app.add_middleware(ReadAfterWriteMiddleware)
+    logger.info("Read replica routing enabled for public read endpoints")
+
 if SECURITY_HEADERS_ENABLED:
     app.add_middleware(
         SecurityHeadersMiddleware, exclude_paths=["/health", "/docs", "/openapi.json"]
@@ -234,7 +257,8 @@ app.add_middleware(
     allow_credentials=True,  # Enable credentials for CSRF cookies
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # Credentialed responses ignore the "*" wildcard, so list the headers clients read
+    expose_headers=["*", *PAGINATION_HEADERS],
     max_age=600,  # Cache preflight requests for 10 minutes
 )
 
@@ -251,6 +275,8 @@ app.include_router(verification_router)
 app.include_router(security_router)
 app.include_router(business_router, prefix="/business")
 app.include_router(clients_router)
+app.include_router(dashboard_router)
+app.include_router(exports_router)
 app.include_router(upload_router)
 app.include_router(property_shots_router)
 app.include_router(contracts_router)
@@ -373,6 +399,44 @@ async def redis_health_check():
         return {"status": "unhealthy", "redis": {"connected": False, "error": str(e)}}
 
 
+def _require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """Internal metrics are hidden (404) without INTERNAL_METRICS_TOKEN configured"""
+    if not INTERNAL_METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_internal_token or not secrets.compare_digest(x_internal_token, INTERNAL_METRICS_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@app.get(
+    "/internal/metrics/db-pool",
+    include_in_schema=False,
+    dependencies=[Depends(_require_internal_token)],
+)
+def db_pool_metrics():
+    """Connection pool telemetry per engine (checkout waits, overflow, timeouts, route hold times)"""
+    return pool_metrics()
+
+
+@app.get(
+    "/internal/metrics/auth",
+    include_in_schema=False,
+    dependencies=[Depends(_require_internal_token)],
+)
+def auth_metrics():
+    """Verified-token and identity cache hit rates and Google signing key state"""
+    from .auth import google_keys, verified_tokens
+    from .services.identity_cache import identity_cache
+
+    return {
+        "verified_tokens": verified_tokens.stats(),
+        "identities": identity_cache.stats(),
+        "google_keys": {
+            "kids": sorted(google_keys.keys),
+            "expires_in_s": round(google_keys.expires_at - time.time()),
+        },
+    }
+
+
 @app.get("/csrf-token")
 async def get_csrf_token(request: Request, response: Response):
     """
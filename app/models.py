@@ -1,16 +1,22 @@
 import uuid
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Boolean,
     Column,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    event,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -230,7 +236,7 @@ class BusinessConfig(Base):
 
     # Custom packages for "packages" pricing model
     custom_packages = Column(
-        JSON, nullable=True
+        JSONB, nullable=True
     )  # Custom packages: [{"id": "uuid", "name": "Full Deep Clean", "description": "...", "included": ["..."], "duration": 120, "priceType": "flat|range|quote", "price": 150, "priceMin": 100, "priceMax": 200}]
 
     # Custom forms domain (white-labeled public form links)
@@ -309,7 +315,7 @@ class Client(Base):
     frequency = Column(String(50), nullable=True)
     status = Column(String(50), default="pending")
     notes = Column(String(1000), nullable=True)
-    form_data = Column(JSON, nullable=True)  # Store structured form submission data
+    form_data = Column(JSONB, nullable=True)  # Store structured form submission data
 
     # Quote approval workflow fields
     quote_status = Column(
@@ -340,6 +346,17 @@ class Client(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    # Lower-cased name/contact/email maintained by Postgres for trigram search
+    # (migrations/add_client_search_trgm.sql)
+    search_text = Column(
+        Text,
+        Computed(
+            "lower(coalesce(business_name, '') || ' ' || coalesce(contact_name, '') || ' ' "
+            "|| coalesce(email, ''))",
+            persisted=True,
+        ),
+    )
+
     user = relationship("User", back_populates="clients")
     contracts = relationship("Contract", back_populates="client", cascade="all, delete-orphan")
     schedules = relationship("Schedule", back_populates="client", cascade="all, delete-orphan")
@@ -352,6 +369,39 @@ class Client(Base):
         "QuoteHistory", back_populates="client", cascade="all, delete-orphan"
     )
 
+    # Per-tenant hot queries (migrations/add_tenant_composite_indexes.sql)
+    __table_args__ = (
+        Index("idx_clients_user_status_created", "user_id", "status", created_at.desc()),
+        Index(
+            "idx_clients_user_created_signed",
+            "user_id",
+            created_at.desc(),
+            postgresql_where=text("status <> 'pending_signature'"),
+        ),
+        Index(
+            "idx_clients_user_quote_status_submitted",
+            "user_id",
+            "quote_status",
+            quote_submitted_at.desc(),
+        ),
+        # @> / ? filters on form_data answers (cleaningFrequency, selectedPackage, propertyShots)
+        Index("idx_clients_form_data_gin", "form_data", postgresql_using="gin"),
+        Index(
+            "idx_clients_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
+
+
+# The trigram index needs pg_trgm - create it with the table on fresh databases
+event.listen(
+    Client.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 
 class QuoteHistory(Base):
     """Audit trail for quote approval workflow"""
@@ -402,6 +452,9 @@ class Contract(Base):
     terms_conditions = Column(String(5000), nullable=True)
     pdf_key = Column(String(500), nullable=True)  # R2 key for the contract PDF
     pdf_hash = Column(String(64), nullable=True)  # SHA-256 hash of the PDF for integrity
+    # Quote, form data and provider terms the PDF was last rendered with - a signed
+    # contract is re-rendered from these so only its branding can change
+    terms_snapshot = Column(JSONB, nullable=True)
     # Provider signature audit trail
     provider_signature = Column(String(100000), nullable=True)  # Base64 signature image
     signed_at = Column(DateTime, nullable=True)
@@ -425,7 +478,7 @@ class Contract(Base):
     custom_quote = Column(
         JSON, nullable=True
     )  # Provider's custom pricing if different from auto-quote
-    custom_scope = Column(JSON, nullable=True)  # Provider's custom scope (inclusions/exclusions)
+    custom_scope = Column(JSONB, nullable=True)  # Provider's custom scope (inclusions/exclusions)
 
     # Square payment integration
     square_invoice_id = Column(String(255), nullable=True)  # Square invoice ID (deposit invoice)
@@ -464,7 +517,7 @@ class Contract(Base):
     invoice_auto_sent = Column(Boolean, default=False)  # Whether Square invoice was auto-sent
 
     # Scope of Work (Exhibit A)
-    scope_of_work = Column(JSON, nullable=True)  # Structured scope of work data
+    scope_of_work = Column(JSONB, nullable=True)  # Structured scope of work data
     exhibit_a_pdf_key = Column(String(500), nullable=True)  # R2 key for Exhibit A PDF
     invoice_auto_sent_at = Column(DateTime, nullable=True)  # When invoice was auto-sent
 
@@ -476,6 +529,16 @@ class Contract(Base):
     invoices = relationship("Invoice", back_populates="contract", cascade="all, delete-orphan")
     visits = relationship("Visit", back_populates="contract", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index(
+            "idx_contracts_user_signature_ip",
+            "user_id",
+            "client_signature_ip",
+            postgresql_where=text("client_signature IS NOT NULL"),
+        ),
+        Index("idx_contracts_user_status", "user_id", "status"),
+    )
+
 
 class Schedule(Base):
     __tablename__ = "schedules"
@@ -514,6 +577,8 @@ class Schedule(Base):
     user = relationship("User", back_populates="schedules")
     client = relationship("Client", back_populates="schedules")
 
+    __table_args__ = (Index("idx_schedules_user_scheduled_date", "user_id", "scheduled_date"),)
+
 
 class SchedulingProposal(Base):
     __tablename__ = "scheduling_proposals"
@@ -660,7 +725,7 @@ class ScopeProposal(Base):
 
     # Scope data with frequency per task
     scope_data = Column(
-        JSON, nullable=False
+        JSONB, nullable=False
     )  # {serviceAreas: [{id, name, tasks: [{id, label, frequency, notes}]}]}
     provider_notes = Column(Text, nullable=True)
 
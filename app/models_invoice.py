@@ -4,7 +4,18 @@ Invoice and Payment Models for Client Invoicing System
 
 import uuid
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -80,6 +91,11 @@ class Invoice(Base):
     contract = relationship("Contract", back_populates="invoices")
     visit = relationship("Visit", back_populates="invoice", uselist=False)
 
+    __table_args__ = (
+        Index("idx_invoices_user_status_paid", "user_id", "status", paid_at.desc()),
+        Index("idx_invoices_client_status_paid", "client_id", "status", paid_at.desc()),
+    )
+
 
 class Payout(Base):
     """Payout tracking for service providers"""
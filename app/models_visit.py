@@ -4,7 +4,7 @@ Visit Management Models for Contract Execution
 
 import uuid
 
-from sqlalchemy import ARRAY, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import ARRAY, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -93,3 +93,5 @@ class Visit(Base):
     contract = relationship("Contract", back_populates="visits")
     client = relationship("Client", back_populates="visits")
     invoice = relationship("Invoice", back_populates="visit", uselist=False)
+
+    __table_args__ = (Index("idx_visits_contract_visit_number", "contract_id", "visit_number"),)
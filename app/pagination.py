@@ -0,0 +1,211 @@
+"""
+Keyset pagination for dashboard list endpoints
+Shared query parameters (limit, cursor, sort, created_after/created_before, include_total)
+and a paginate() helper that pages any ORM query on (sort column, id). List bodies keep
+their existing shape; the next cursor and optional total travel in response headers.
+"""
+
+import base64
+import binascii
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query as OrmQuery
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "200"))
+# Results estimated above this size report the planner's row estimate instead of COUNT(*)
+EXACT_COUNT_THRESHOLD = int(os.getenv("LIST_EXACT_COUNT_THRESHOLD", "10000"))
+
+PAGINATION_HEADERS = ["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Estimated", "Link"]
+
+
+class ListParams:
+    """FastAPI dependency - pagination, sort and created_at range shared by list endpoints"""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(
+            None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit to return every row)"
+        ),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+        sort: Optional[str] = Query(
+            None, description="Sort field, prefixed with '-' for descending (e.g. -created_at)"
+        ),
+        created_after: Optional[datetime] = Query(None, description="Only rows created at/after"),
+        created_before: Optional[datetime] = Query(None, description="Only rows created before"),
+        include_total: bool = Query(
+            False, description="Return X-Total-Count (estimated for large results)"
+        ),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.created_after = created_after
+        self.created_before = created_before
+        self.include_total = include_total
+
+
+@dataclass
+class Page:
+    items: list
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_estimated: bool = False
+
+
+def encode_cursor(sort: str, value: Any, last_id: int) -> str:
+    if isinstance(value, datetime):
+        payload = {"s": sort, "v": value.isoformat(), "t": "dt", "id": last_id}
+    else:
+        payload = {"s": sort, "v": value, "id": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple[Any, int]:
+    """Return (sort value, id) - 400 for malformed cursors or a cursor from another sort"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        value = payload["v"]
+        if payload.get("t") == "dt" and value is not None:
+            value = datetime.fromisoformat(value)
+        last_id = int(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+    if payload.get("s") != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+    return value, last_id
+
+
+def _resolve_sort(params: ListParams, sort_fields: dict, default_sort: str):
+    sort = params.sort or default_sort
+    name = sort.lstrip("-")
+    if name not in sort_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort field '{name}'. Allowed: {', '.join(sorted(sort_fields))}",
+        )
+    return sort, sort_fields[name], sort.startswith("-")
+
+
+def _after_cursor(column, id_column, value, last_id: int, descending: bool):
+    """
+    Rows strictly after (value, last_id) in (column, id) order.
+    Follows PostgreSQL's default NULL placement (NULLs sort as the largest value: last
+    ascending, first descending) so the composite indexes still serve the ORDER BY.
+    """
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), id_column < last_id), column.isnot(None))
+        return or_(column < value, and_(column == value, id_column < last_id))
+
+    if value is None:
+        return and_(column.is_(None), id_column > last_id)
+    return or_(column > value, and_(column == value, id_column > last_id), column.is_(None))
+
+
+def count_rows(query: OrmQuery) -> tuple[int, bool]:
+    """
+    Total rows for a list query as (total, estimated).
+    Uses the planner's row estimate and only runs an exact COUNT(*) when the estimate
+    is small enough for the count to be cheap.
+    """
+    query = query.order_by(None)
+    try:
+        statement = query.statement
+        connection = query.session.connection()
+        compiled = statement.compile(
+            dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        raw = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+        ).scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        estimate = int(plan["Plan Rows"])
+    except Exception as e:
+        logger.debug(f"Row estimate unavailable, counting exactly: {e}")
+        estimate = 0
+
+    if estimate > EXACT_COUNT_THRESHOLD:
+        return estimate, True
+    return query.count(), False
+
+
+def paginate(
+    query: OrmQuery,
+    params: ListParams,
+    *,
+    model,
+    sort_fields: dict,
+    default_sort: str = "-created_at",
+) -> Page:
+    """
+    Apply the shared created_at range, sort and keyset cursor to an ORM query.
+
+    sort_fields maps public sort names to columns of `model`; rows are ordered by
+    (sort column, model.id) in the same direction so the cursor is stable under ties.
+    Queries returning tuples (e.g. joined entities) must select `model` first.
+    """
+    if params.created_after:
+        query = query.filter(model.created_at >= params.created_after)
+    if params.created_before:
+        query = query.filter(model.created_at < params.created_before)
+
+    total, total_estimated = None, False
+    if params.include_total:
+        total, total_estimated = count_rows(query)
+
+    sort, column, descending = _resolve_sort(params, sort_fields, default_sort)
+    if params.cursor:
+        value, last_id = decode_cursor(params.cursor, sort)
+        query = query.filter(_after_cursor(column, model.id, value, last_id, descending))
+
+    # Explicit NULL placement matches PostgreSQL's defaults (and the index order)
+    if descending:
+        query = query.order_by(column.desc().nulls_first(), model.id.desc())
+    else:
+        query = query.order_by(column.asc().nulls_last(), model.id.asc())
+
+    if params.limit is None:
+        return Page(items=query.all(), total=total, total_estimated=total_estimated)
+
+    rows = query.limit(params.limit + 1).all()
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1][0] if isinstance(rows[-1], Row) else rows[-1]
+        next_cursor = encode_cursor(sort, getattr(last, column.key), last.id)
+
+    return Page(items=rows, next_cursor=next_cursor, total=total, total_estimated=total_estimated)
+
+
+def set_page_headers(request: Request, response: Response, page: Page):
+    """Expose the next cursor (also as an RFC 8288 Link) and optional total on the response"""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+        next_url = request.url.include_query_params(cursor=page.next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+        if page.total_estimated:
+            response.headers["X-Total-Count-Estimated"] = "true"
+
+
+def filter_status(query: OrmQuery, column, status: Optional[str]) -> OrmQuery:
+    """Filter on one status or a comma-separated list ('all' and empty mean no filter)"""
+    if not status or status == "all":
+        return query
+    values = [value.strip() for value in status.split(",") if value.strip()]
+    if len(values) == 1:
+        return query.filter(column == values[0])
+    return query.filter(column.in_(values))
@@ -1,6 +1,7 @@
 """
 Standalone PDF generation worker script.
 This runs as a separate process to avoid asyncio conflicts with Playwright on Windows.
+Used as the fallback when no warm browser pool is running (see services/pdf_renderer.py).
 """
 
 import base64
@@ -15,6 +16,7 @@ def generate_pdf(html: str) -> bytes:
         browser = p.chromium.launch()
         page = browser.new_page()
         page.set_content(html, wait_until="networkidle")
+        # Keep in sync with PDF_OPTIONS in services/pdf_renderer.py
         pdf = page.pdf(
             format="A4",
             margin={"top": "20px", "bottom": "20px", "left": "20px", "right": "20px"},
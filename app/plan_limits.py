@@ -1,17 +1,27 @@
 """
 Plan limits and utilities for subscription-based client restrictions.
+
+The user passed in may come from the identity cache (up to IDENTITY_CACHE_TTL old), and
+the ARQ worker, billing webhooks and other API processes update the same counters. So the
+counter columns are reloaded before they are read and changed with SQL expressions,
+never written back from a possibly stale in-memory value.
 """
 
 from datetime import datetime, timedelta
 from typing import Optional
 
+from sqlalchemy import func, or_, update
 from sqlalchemy.orm import Session
 
 from .models import User
+from .services.identity_cache import invalidate_identity_on_commit
 
 # Plan limits configuration (no free plan - all users must have paid plans)
 PLAN_LIMITS = {"team": 50, "scale": None}  # None means unlimited
 
+# Columns the monthly counter logic reads - reloaded from the database before use
+COUNTER_COLUMNS = ["clients_this_month", "month_reset_date", "subscription_start_date"]
+
 
 def get_plan_limit(plan: Optional[str]) -> Optional[int]:
     """Get the client limit for a given plan. Returns None for unlimited, 0 for no plan."""
@@ -33,33 +43,45 @@ def _calculate_next_reset_date(subscription_start: datetime, current_time: datet
     return next_reset
 
 
+def _reload_counters(user: User, db: Session) -> None:
+    db.refresh(user, attribute_names=COUNTER_COLUMNS)
+
+
+def _update_user(user: User, db: Session, *criteria, **values) -> None:
+    """UPDATE the user's row in SQL and expire the changed attributes so they reload"""
+    db.execute(
+        update(User).where(User.id == user.id, *criteria).values(**values),
+        execution_options={"synchronize_session": False},
+    )
+    db.expire(user, list(values))
+    invalidate_identity_on_commit(db, user.id)
+
+
 def check_and_reset_monthly_counter(user: User, db: Session) -> None:
     """
     Check if the billing period has rolled over and reset the counter if needed.
     Reset happens 30 days after the subscription start date, not on the first of the month.
     """
+    _reload_counters(user, db)
     now = datetime.utcnow()
 
-    # Use subscription_start_date if available, otherwise fall back to created_at
-    subscription_start = user.subscription_start_date or user.created_at or now
-
-    # If no reset date set, initialize it based on subscription start
-    if user.month_reset_date is None:
-        next_reset = _calculate_next_reset_date(subscription_start, now)
-        user.month_reset_date = next_reset
-        user.clients_this_month = 0
-        db.commit()
+    # Nothing to do until the reset date has passed (or was never set)
+    if user.month_reset_date is not None and now < user.month_reset_date:
         return
 
-    # Check if we've passed the reset date
-    if now >= user.month_reset_date:
-        # Reset counter
-        user.clients_this_month = 0
+    # Use subscription_start_date if available, otherwise fall back to created_at
+    subscription_start = user.subscription_start_date or user.created_at or now
 
-        # Calculate next reset date (30 days from subscription anniversary)
-        next_reset = _calculate_next_reset_date(subscription_start, now)
-        user.month_reset_date = next_reset
-        db.commit()
+    # Reset counter; next reset is 30 days from the subscription anniversary. The
+    # condition makes a reset committed concurrently by another process win.
+    _update_user(
+        user,
+        db,
+        or_(User.month_reset_date.is_(None), User.month_reset_date <= now),
+        clients_this_month=0,
+        month_reset_date=_calculate_next_reset_date(subscription_start, now),
+    )
+    db.commit()
 
 
 def can_add_client(user: User, db: Session) -> tuple:
@@ -99,20 +121,26 @@ def increment_client_count(user: User, db: Session) -> None:
     This counts the client for plan limits and statistics.
     """
     check_and_reset_monthly_counter(user, db)
-    user.clients_this_month += 1
+    _update_user(user, db, clients_this_month=User.clients_this_month + 1)
     db.commit()
 
 
-def decrement_client_count(user: User, db: Session) -> None:
+def decrement_client_count(user: User, db: Session, count: int = 1, commit: bool = True) -> None:
     """
-    Decrement the user's monthly client count.
-    Should be called when a client is deleted.
-    Only decrements if count is greater than 0.
+    Decrement the user's monthly client count by `count`.
+    Should be called when clients are deleted.
+    Never goes below 0. commit=False leaves the change in the caller's transaction.
     """
     check_and_reset_monthly_counter(user, db)
-    if user.clients_this_month > 0:
-        user.clients_this_month -= 1
-        db.commit()
+    if count > 0:
+        _update_user(
+            user,
+            db,
+            User.clients_this_month > 0,
+            clients_this_month=func.greatest(User.clients_this_month - count, 0),
+        )
+        if commit:
+            db.commit()
 
 
 def get_usage_stats(user: User, db: Session) -> dict:
@@ -157,7 +185,7 @@ def get_usage_stats(user: User, db: Session) -> dict:
 
     # Update the counter in the database to match actual count
     if user.clients_this_month != current:
-        user.clients_this_month = current
+        _update_user(user, db, clients_this_month=current)
         db.commit()
 
     return {
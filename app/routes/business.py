@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from ..auth import get_current_user, get_current_user_with_plan
 from ..database import get_db
+from ..db_replica import get_read_db
 from ..models import BusinessConfig, User
 from .upload import generate_presigned_url
 
@@ -131,7 +132,9 @@ def is_provided(val) -> bool:
 
 
 @router.get("/public/{firebase_uid}")
-def get_public_business_info(firebase_uid: str, request: Request, db: Session = Depends(get_db)):
+def get_public_business_info(
+    firebase_uid: str, request: Request, db: Session = Depends(get_read_db)
+):
     """Get public business info for embedding (no authentication required)"""
     logger.info(f"📥 Getting public business info for firebase_uid: {firebase_uid}")
 
@@ -751,7 +754,7 @@ def get_business_config(firebase_uid: str, db: Session = Depends(get_db)):
 
 
 @router.get("/public/branding/{firebase_uid}")
-def get_public_branding(firebase_uid: str, request: Request, db: Session = Depends(get_db)):
+def get_public_branding(firebase_uid: str, request: Request, db: Session = Depends(get_read_db)):
     """
     Public endpoint to get business branding (logo, name) for client-facing forms.
     No authentication required - accessed via shareable form links.
@@ -814,7 +817,7 @@ def get_public_branding(firebase_uid: str, request: Request, db: Session = Depen
 
 
 @router.get("/public/addons/{firebase_uid}")
-def get_public_addons(firebase_uid: str, request: Request, db: Session = Depends(get_db)):
+def get_public_addons(firebase_uid: str, request: Request, db: Session = Depends(get_read_db)):
     """
     Public endpoint to get business addon services for client-facing forms.
     No authentication required - accessed via shareable form links.
@@ -882,7 +885,9 @@ def get_public_addons(firebase_uid: str, request: Request, db: Session = Depends
 
 
 @router.get("/public/calendly-status/{firebase_uid}")
-def get_public_calendly_status(firebase_uid: str, request: Request, db: Session = Depends(get_db)):
+def get_public_calendly_status(
+    firebase_uid: str, request: Request, db: Session = Depends(get_read_db)
+):
     """
     Public endpoint to check if business owner has Calendly integration connected.
     DEPRECATED: Calendly integration has been removed.
@@ -928,7 +933,9 @@ def get_public_calendly_status(firebase_uid: str, request: Request, db: Session
 
 
 @router.get("/{firebase_uid}/public-info")
-def get_public_business_info(firebase_uid: str, request: Request, db: Session = Depends(get_db)):
+def get_public_business_info(
+    firebase_uid: str, request: Request, db: Session = Depends(get_read_db)
+):
     """
     Get public business information including working hours and schedules (for business-aware calendar)
     No authentication required - accessed via client forms and scheduling components.
@@ -1,21 +1,23 @@
-import csv
 import logging
 import re
 import uuid
 from datetime import datetime
-from io import StringIO
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
-from fastapi.responses import StreamingResponse
+from arq.connections import ArqRedis
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel, field_validator
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer, joinedload
 
 from ..auth import get_current_user, get_current_user_with_plan
-from ..database import get_db
+from ..database import get_async_db, get_db
+from ..job_queue import get_arq_pool
 from ..models import BusinessConfig, Client, Contract, Schedule, User
+from ..pagination import ListParams, filter_status, paginate, set_page_headers
 from ..rate_limiter import create_rate_limiter
+from ..utils.jsonb import jsonb_array_not_empty, jsonb_contains, jsonb_projection, parse_keys
 from ..utils.sanitization import sanitize_string
 
 logger = logging.getLogger(__name__)
@@ -124,18 +126,64 @@ class ClientResponse(BaseModel):
         from_attributes = True
 
 
+CLIENT_SORT_FIELDS = {
+    "created_at": Client.created_at,
+    "business_name": Client.business_name,
+    "status": Client.status,
+}
+
+
+def filter_form_data(
+    query,
+    cleaning_frequency: Optional[str] = None,
+    selected_package: Optional[str] = None,
+    has_property_shots: Optional[bool] = None,
+):
+    """Filter clients on submitted form answers (served by idx_clients_form_data_gin)"""
+    answers = {}
+    if cleaning_frequency:
+        answers["cleaningFrequency"] = cleaning_frequency
+    if selected_package:
+        answers["selectedPackage"] = selected_package
+    if answers:
+        query = query.filter(jsonb_contains(Client.form_data, **answers))
+
+    if has_property_shots is not None:
+        condition = jsonb_array_not_empty(Client.form_data, "propertyShots")
+        query = query.filter(
+            condition if has_property_shots else or_(Client.form_data.is_(None), ~condition)
+        )
+    return query
+
+
 @router.get("", response_model=list[ClientResponse])
 async def get_clients(
-    current_user: User = Depends(get_current_user_with_plan), db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None, description="Filter by status (comma-separated)"),
+    cleaning_frequency: Optional[str] = Query(None, description="Form answer cleaningFrequency"),
+    selected_package: Optional[str] = Query(None, description="Form answer selectedPackage"),
+    has_property_shots: Optional[bool] = Query(None, description="Submitted property photos"),
+    params: ListParams = Depends(),
+    current_user: User = Depends(get_current_user_with_plan),
+    db: Session = Depends(get_db),
 ):
-    """Get all clients for the current user (excludes pending_signature clients)"""
+    """
+    Get clients for the current user (excludes pending_signature clients)
+    Paginated with limit/cursor; the next cursor is returned in X-Next-Cursor
+    """
     # Filter out clients with "pending_signature" status - they haven't signed the contract yet
-    clients = (
+    query = (
         db.query(Client)
+        .options(defer(Client.form_data))
         .filter(Client.user_id == current_user.id, Client.status != "pending_signature")
-        .order_by(Client.created_at.desc())
-        .all()
     )
+    query = filter_status(query, Client.status, status)
+    query = filter_form_data(query, cleaning_frequency, selected_package, has_property_shots)
+
+    page = paginate(query, params, model=Client, sort_fields=CLIENT_SORT_FIELDS)
+    set_page_headers(request, response, page)
+    clients = page.items
     return [
         ClientResponse(
             id=c.id,
@@ -157,7 +205,6 @@ async def get_clients(
 @router.get("/export")
 async def export_clients_csv(
     current_user: User = Depends(get_current_user_with_plan),
-    db: Session = Depends(get_db),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
@@ -165,114 +212,62 @@ async def export_clients_csv(
 ):
     """
     Export clients as CSV with optional filters.
+    Same as GET /exports/clients - rows are streamed from a server-side cursor.
 
     Requires authentication via Bearer token in Authorization header.
     """
-    try:
-        logger.info(f"📊 CSV Export requested by user {current_user.id} ({current_user.email})")
-
-        # Base query - exclude pending_signature clients
-        query = db.query(Client).filter(
-            Client.user_id == current_user.id, Client.status != "pending_signature"
-        )
+    from ..services.csv_export import parse_export_filters
+    from .exports import csv_streaming_response
 
-        # Apply status filter
-        if status and status != "all":
-            query = query.filter(Client.status == status)
-            logger.info(f"  Filter: status={status}")
-
-        # Apply search filter (by name or email)
-        if search:
-            search_term = f"%{search.lower()}%"
-            query = query.filter(
-                (Client.business_name.ilike(search_term))
-                | (Client.contact_name.ilike(search_term))
-                | (Client.email.ilike(search_term))
-            )
-            logger.info(f"  Filter: search={search}")
+    filters = parse_export_filters(status, search, start_date, end_date)
+    return csv_streaming_response("clients", current_user.id, filters)
 
-        # Apply date range filter
-        if start_date:
-            try:
-                start_dt = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
-                query = query.filter(Client.created_at >= start_dt)
-                logger.info(f"  Filter: start_date={start_date}")
-            except ValueError as e:
-                logger.warning(f"  Invalid start_date format: {start_date} - {e}")
-
-        if end_date:
-            try:
-                end_dt = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-                query = query.filter(Client.created_at <= end_dt)
-                logger.info(f"  Filter: end_date={end_date}")
-            except ValueError as e:
-                logger.warning(f"  Invalid end_date format: {end_date} - {e}")
-
-        # Get filtered clients
-        clients = query.order_by(Client.created_at.desc()).all()
-        logger.info(f"  Found {len(clients)} clients to export")
-
-        # Create CSV
-        output = StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        writer.writerow(
-            [
-                "ID",
-                "Business Name",
-                "Contact Name",
-                "Email",
-                "Phone",
-                "Property Type",
-                "Property Size (sq ft)",
-                "Frequency",
-                "Status",
-                "Notes",
-                "Created At",
-            ]
-        )
 
-        # Write data
-        for client in clients:
-            writer.writerow(
-                [
-                    client.id,
-                    client.business_name or "",
-                    client.contact_name or "",
-                    client.email or "",
-                    client.phone or "",
-                    client.property_type or "",
-                    client.property_size or "",
-                    client.frequency or "",
-                    client.status or "",
-                    client.notes or "",
-                    client.created_at.strftime("%Y-%m-%d %H:%M:%S") if client.created_at else "",
-                ]
-            )
+class ClientSearchResult(BaseModel):
+    id: int
+    public_id: Optional[str] = None
+    businessName: str
+    contactName: Optional[str] = None
+    email: Optional[str] = None
+    status: Optional[str] = None
+    score: float
 
-        # Prepare response
-        output.seek(0)
-        filename = f"clients_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
-        logger.info(f"✅ CSV export successful: {filename} ({len(clients)} clients)")
+class ClientSearchResponse(BaseModel):
+    results: list[ClientSearchResult]
+    timedOut: bool = False
 
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Cache-Control": "no-cache",
-            },
-        )
 
-    except HTTPException:
-        # Re-raise HTTP exceptions (like auth errors)
-        raise
-    except Exception as e:
-        logger.error(f"❌ CSV export failed for user {current_user.id}: {str(e)}")
-        logger.exception(e)
-        raise HTTPException(status_code=500, detail="Failed to export clients. Please try again.")
+@router.get("/search", response_model=ClientSearchResponse)
+async def search_clients(
+    q: str = Query(..., min_length=1, max_length=100, description="Name, contact or email"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_user_with_plan),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Ranked client search for the dashboard search box and typeahead.
+    Prefix matches on name/contact/email rank first, then fuzzy trigram matches.
+    Returns timedOut=true with no results if the search exceeds its latency budget.
+    """
+    from ..services.client_search import search_clients as run_search
+
+    rows, timed_out = await run_search(db, current_user.id, q, limit)
+    return ClientSearchResponse(
+        results=[
+            ClientSearchResult(
+                id=row.id,
+                public_id=row.public_id,
+                businessName=row.business_name,
+                contactName=row.contact_name,
+                email=row.email,
+                status=row.status,
+                score=round(float(row.score), 4),
+            )
+            for row in rows
+        ],
+        timedOut=timed_out,
+    )
 
 
 # ============================================================================
@@ -288,76 +283,80 @@ async def get_quote_requests_stats(
 ):
     """
     Get summary statistics for quote requests.
+    One filtered-aggregate query; GET /dashboard/summary returns the same counters cached.
     """
-    # Count by status
-    pending_count = (
-        db.query(func.count(Client.id))
-        .filter(Client.user_id == current_user.id, Client.quote_status == "pending_review")
-        .scalar()
-    )
-
-    approved_count = (
-        db.query(func.count(Client.id))
-        .filter(Client.user_id == current_user.id, Client.quote_status == "approved")
-        .scalar()
-    )
-
-    adjusted_count = (
-        db.query(func.count(Client.id))
-        .filter(Client.user_id == current_user.id, Client.quote_status == "adjusted")
-        .scalar()
-    )
-
-    rejected_count = (
-        db.query(func.count(Client.id))
-        .filter(Client.user_id == current_user.id, Client.quote_status == "rejected")
-        .scalar()
-    )
-
-    # Total quote value pending
-    total_pending_value = (
-        db.query(func.sum(Client.original_quote_amount))
-        .filter(Client.user_id == current_user.id, Client.quote_status == "pending_review")
-        .scalar()
-        or 0
-    )
+    from ..services.dashboard_summary import quote_stats_query
 
+    row = db.execute(quote_stats_query(current_user.id)).one()
     return {
-        "pending_count": pending_count,
-        "approved_count": approved_count,
-        "adjusted_count": adjusted_count,
-        "rejected_count": rejected_count,
-        "total_pending_value": float(total_pending_value),
+        "pending_count": row.pending_review_count,
+        "approved_count": row.approved_count,
+        "adjusted_count": row.adjusted_count,
+        "rejected_count": row.rejected_count,
+        "total_pending_value": float(row.total_pending_value),
     }
 
 
+QUOTE_REQUEST_SORT_FIELDS = {
+    "quote_submitted_at": Client.quote_submitted_at,
+    "created_at": Client.created_at,
+}
+
+
 @router.get("/quote-requests")
 async def get_quote_requests(
-    status: Optional[str] = Query(None, description="Filter by quote status"),
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None, description="Filter by quote status (comma-separated)"),
+    include_form_data: bool = Query(
+        True, description="Include each client's form_data (omit for list views)"
+    ),
+    form_fields: Optional[str] = Query(
+        None, description="Only these form_data keys (comma-separated), projected in SQL"
+    ),
+    cleaning_frequency: Optional[str] = Query(None, description="Form answer cleaningFrequency"),
+    selected_package: Optional[str] = Query(None, description="Form answer selectedPackage"),
+    has_property_shots: Optional[bool] = Query(None, description="Submitted property photos"),
+    params: ListParams = Depends(),
     current_user: User = Depends(get_current_user_with_plan),
     db: Session = Depends(get_db),
 ):
     """
-    Get all quote requests for the provider dashboard.
-    Returns clients with quote_status = 'pending_review' or other specified status.
+    Get quote requests for the provider dashboard.
+    Returns clients with quote_status = 'pending_review' or other specified status,
+    most recent first. Paginated with limit/cursor (next_cursor in the body and X-Next-Cursor).
     """
-    query = db.query(Client).filter(Client.user_id == current_user.id)
-
-    # Filter by status if provided
-    if status:
-        query = query.filter(Client.quote_status == status)
-    else:
-        # Default to pending review
-        query = query.filter(Client.quote_status == "pending_review")
-
-    # Order by most recent first
-    query = query.order_by(Client.quote_submitted_at.desc())
-
-    clients = query.all()
+    projected_keys = parse_keys(form_fields) if include_form_data else []
+    query = db.query(Client)
+    if projected_keys:
+        # Build the smaller document in Postgres instead of shipping the whole blob
+        query = query.add_columns(jsonb_projection(Client.form_data, projected_keys))
+    if projected_keys or not include_form_data:
+        query = query.options(defer(Client.form_data))
+    query = query.filter(Client.user_id == current_user.id)
+
+    # Default to pending review
+    query = filter_status(query, Client.quote_status, status or "pending_review")
+    query = filter_form_data(query, cleaning_frequency, selected_package, has_property_shots)
+
+    page = paginate(
+        query,
+        params,
+        model=Client,
+        sort_fields=QUOTE_REQUEST_SORT_FIELDS,
+        default_sort="-quote_submitted_at",
+    )
+    set_page_headers(request, response, page)
+    clients = page.items
 
     # Format response
     quote_requests = []
-    for client in clients:
+    for row in clients:
+        if projected_keys:
+            client, form_data = row
+        else:
+            client = row
+            form_data = client.form_data if include_form_data else None
         quote_requests.append(
             {
                 "id": client.id,
@@ -379,14 +378,15 @@ async def get_quote_requests(
                 "original_quote_amount": client.original_quote_amount,
                 "adjusted_quote_amount": client.adjusted_quote_amount,
                 "quote_adjustment_notes": client.quote_adjustment_notes,
-                "form_data": client.form_data,
+                "form_data": form_data,
                 "created_at": client.created_at.isoformat() if client.created_at else None,
             }
         )
 
     return {
         "quote_requests": quote_requests,
-        "total": len(quote_requests),
+        "total": page.total if page.total is not None else len(quote_requests),
+        "next_cursor": page.next_cursor,
     }
 
 
@@ -510,32 +510,18 @@ async def batch_delete_quote_requests(
 ):
     """
     Batch delete multiple quote requests (clients with quote_status).
-    Only deletes clients that belong to the current user.
+    Only deletes clients that belong to the current user; results reports each id
+    as deleted or not_found.
     """
+    from ..services.batch_delete import delete_clients
+
     if not data.quoteRequestIds:
         raise HTTPException(status_code=400, detail="No quote request IDs provided")
 
-    deleted_count = 0
-
-    for client_id in data.quoteRequestIds:
-        client = (
-            db.query(Client)
-            .filter(Client.id == client_id, Client.user_id == current_user.id)
-            .first()
-        )
-
-        if client:
-            # Delete the client (cascades to quote_history, contracts, schedules, etc.)
-            db.delete(client)
-            deleted_count += 1
-
-    db.commit()
-
-    logger.info(f"✅ User {current_user.id} deleted {deleted_count} quote requests")
-
+    result = delete_clients(db, current_user, data.quoteRequestIds)
     return {
-        "message": f"Successfully deleted {deleted_count} quote request(s)",
-        "deletedCount": deleted_count,
+        "message": f"Successfully deleted {result['deletedCount']} quote request(s)",
+        **result,
     }
 
 
@@ -711,53 +697,18 @@ async def batch_delete_clients(
     current_user: User = Depends(get_current_user_with_plan),
     db: Session = Depends(get_db),
 ):
-    """Batch delete multiple clients"""
-    from ..models_invoice import Invoice
-    from ..plan_limits import decrement_client_count
+    """
+    Batch delete multiple clients with their contracts, schedules, invoices and visits.
+    One set-based delete per table in a single transaction; results reports each id
+    as deleted or not_found.
+    """
+    from ..services.batch_delete import delete_clients
 
     if not data.clientIds:
         raise HTTPException(status_code=400, detail="No client IDs provided")
 
-    # Verify all clients belong to the current user and delete them
-    deleted_count = 0
-    signed_clients_count = 0
-
-    for client_id in data.clientIds:
-        client = (
-            db.query(Client)
-            .filter(Client.id == client_id, Client.user_id == current_user.id)
-            .first()
-        )
-        if client:
-            # Check if client has signed the contract (client signature exists)
-            has_signed_contract = any(
-                c.client_signature or c.client_signature_timestamp for c in client.contracts
-            )
-            if has_signed_contract:
-                signed_clients_count += 1
-
-            # Get contract IDs for this client
-            contract_ids = [c.id for c in client.contracts]
-
-            # Delete invoices linked to these contracts first (FK constraint)
-            if contract_ids:
-                db.query(Invoice).filter(Invoice.contract_id.in_(contract_ids)).delete(
-                    synchronize_session=False
-                )
-
-            db.delete(client)
-            deleted_count += 1
-
-    db.commit()
-
-    # Decrement client count for each deleted client that had signed
-    for _ in range(signed_clients_count):
-        decrement_client_count(current_user, db)
-
-    return {
-        "message": f"Successfully deleted {deleted_count} client(s)",
-        "deletedCount": deleted_count,
-    }
+    result = delete_clients(db, current_user, data.clientIds)
+    return {"message": f"Successfully deleted {result['deletedCount']} client(s)", **result}
 
 
 class PublicClientCreate(BaseModel):
@@ -834,7 +785,7 @@ class PublicSubmitResponse(BaseModel):
 
 @router.post("/public/quote-preview", response_model=QuotePreviewResponse)
 async def get_quote_preview(
-    data: QuotePreviewRequest, request: Request, db: Session = Depends(get_db)
+    data: QuotePreviewRequest, request: Request, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Public endpoint to calculate and preview quote before form submission.
@@ -865,14 +816,20 @@ async def get_quote_preview(
             )
         logger.info(f"✅ Custom domain validation passed for quote preview {data.ownerUid}")
 
-    # Find the user by Firebase UID
-    user = db.query(User).filter(User.firebase_uid == data.ownerUid).first()
+    # Find the user by Firebase UID (with business_config - no lazy loads on an async session)
+    user = (
+        await db.execute(
+            select(User)
+            .where(User.firebase_uid == data.ownerUid)
+            .options(joinedload(User.business_config))
+        )
+    ).scalar_one_or_none()
     if not user:
         logger.error(f"❌ User not found for Firebase UID: {data.ownerUid}")
         raise HTTPException(status_code=404, detail="Business not found")
 
     # Get business config
-    config = db.query(BusinessConfig).filter(BusinessConfig.user_id == user.id).first()
+    config = user.business_config
     if not config:
         logger.warning(f"⚠️ No business config found for user {user.id}")
         return QuotePreviewResponse(
@@ -892,14 +849,16 @@ async def get_quote_preview(
 
     # Check if this IP has any signed contracts with this business (first cleaning detection)
     existing_signed_contract = (
-        db.query(Contract)
-        .filter(
-            Contract.user_id == user.id,
-            Contract.client_signature_ip == client_ip,
-            Contract.client_signature.isnot(None),
+        await db.execute(
+            select(Contract.id)
+            .where(
+                Contract.user_id == user.id,
+                Contract.client_signature_ip == client_ip,
+                Contract.client_signature.isnot(None),
+            )
+            .limit(1)
         )
-        .first()
-    )
+    ).scalar_one_or_none()
 
     # Auto-set isFirstCleaning based on IP - if no signed contracts from this IP, it's their first cleaning
     # BUT: If frontend explicitly sent isFirstCleaning=true (for quote preview), respect that
@@ -1098,7 +1057,8 @@ async def submit_public_form(
     data: PublicClientCreate,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    arq_pool: Optional[ArqRedis] = Depends(get_arq_pool),
     _ip: None = Depends(rate_limit_form_per_ip),
     _global: None = Depends(rate_limit_form_global),
 ):
@@ -1109,10 +1069,6 @@ async def submit_public_form(
     No authentication required - this is accessed via shareable link.
     Supports custom domain validation for security.
     """
-    from arq import create_pool
-
-    from ..worker import get_redis_settings
-
     # Capture client info
     client_ip = request.headers.get(
         "X-Forwarded-For", request.client.host if request.client else "unknown"
@@ -1196,25 +1152,28 @@ async def submit_public_form(
 
     # Find the user by Firebase UID (with business_config for business name)
     user = (
-        db.query(User)
-        .filter(User.firebase_uid == data.ownerUid)
-        .options(joinedload(User.business_config))
-        .first()
-    )
+        await db.execute(
+            select(User)
+            .where(User.firebase_uid == data.ownerUid)
+            .options(joinedload(User.business_config))
+        )
+    ).scalar_one_or_none()
     if not user:
         logger.error(f"❌ User not found for Firebase UID: {data.ownerUid}")
         raise HTTPException(status_code=404, detail="Business not found")
 
     # Check if this IP has any signed contracts with this business (first cleaning detection)
     existing_signed_contract = (
-        db.query(Contract)
-        .filter(
-            Contract.user_id == user.id,
-            Contract.client_signature_ip == client_ip,
-            Contract.client_signature.isnot(None),
+        await db.execute(
+            select(Contract.id)
+            .where(
+                Contract.user_id == user.id,
+                Contract.client_signature_ip == client_ip,
+                Contract.client_signature.isnot(None),
+            )
+            .limit(1)
         )
-        .first()
-    )
+    ).scalar_one_or_none()
 
     # Auto-set isFirstCleaning based on IP - if no signed contracts from this IP, it's their first cleaning
     is_first_cleaning = existing_signed_contract is None
@@ -1294,8 +1253,8 @@ async def submit_public_form(
         ),  # Store original automated quote (None if 0 or not calculated)
     )
     db.add(client)
-    db.commit()
-    db.refresh(client)
+    await db.commit()
+    await db.refresh(client)
 
     # Create quote history entry if quote was accepted
     if data.quoteAccepted and quote_amount:
@@ -1309,7 +1268,7 @@ async def submit_public_form(
             created_by=f"client:{data.email or 'unknown'}",
         )
         db.add(quote_history_entry)
-        db.commit()
+        await db.commit()
 
     # Send emails if quote was accepted
     if data.quoteAccepted and data.email:
@@ -1377,14 +1336,14 @@ async def submit_public_form(
     if data.formData:
         try:
             # Get business config to check if it exists
-            config = db.query(BusinessConfig).filter(BusinessConfig.user_id == user.id).first()
+            config = user.business_config
 
             if config:
-                # Enqueue contract generation job
-                redis_settings = get_redis_settings()
-                pool = await create_pool(redis_settings)
+                if arq_pool is None:
+                    raise RuntimeError("Job queue unavailable")
 
-                job = await pool.enqueue_job(
+                # Enqueue contract generation job on the shared pool
+                job = await arq_pool.enqueue_job(
                     "generate_contract_pdf_task",
                     client.id,
                     data.ownerUid,
@@ -1405,11 +1364,11 @@ async def submit_public_form(
 
     # Queue email notifications as background job (don't block response)
     try:
-        redis_settings = get_redis_settings()
-        pool = await create_pool(redis_settings)
+        if arq_pool is None:
+            raise RuntimeError("Job queue unavailable")
 
         # Queue email notification job
-        await pool.enqueue_job(
+        await arq_pool.enqueue_job(
             "send_form_notification_emails_task", client.id, user.id, data.ownerUid
         )
     except Exception as email_err:
@@ -1470,16 +1429,13 @@ async def generate_contract_for_client(
     client_id: int,
     data: GenerateContractRequest,
     db: Session = Depends(get_db),
+    arq_pool: Optional[ArqRedis] = Depends(get_arq_pool),
 ):
     """
     Public endpoint to generate a contract for an existing client.
     Used in the new flow: create client → schedule → generate contract → sign.
     No authentication required - accessed via public form flow.
     """
-    from arq import create_pool
-
-    from ..worker import get_redis_settings
-
     logger.info(f"📋 Generating contract for client ID: {client_id}")
 
     # Find the client
@@ -1514,17 +1470,11 @@ async def generate_contract_for_client(
 
     # Try to use worker first, but fall back to synchronous generation if worker is unavailable
     try:
-        # Attempt to enqueue contract generation job
-        logger.info(f"🔄 Attempting to connect to Redis for ARQ worker...")
-        redis_settings = get_redis_settings()
-        logger.info(
-            f"📡 Redis settings: host={redis_settings.host}, port={redis_settings.port}, ssl={redis_settings.ssl}"
-        )
+        # Attempt to enqueue contract generation job on the shared pool
+        if arq_pool is None:
+            raise RuntimeError("Job queue unavailable")
 
-        pool = await create_pool(redis_settings)
-        logger.info(f"✅ Redis pool created successfully")
-
-        job = await pool.enqueue_job(
+        job = await arq_pool.enqueue_job(
             "generate_contract_pdf_task",
             client.id,
             user.firebase_uid,
@@ -1554,7 +1504,12 @@ async def generate_contract_for_client(
             # Generate contract synchronously
 
             from ..config import R2_BUCKET_NAME
-            from ..routes.contracts_pdf import calculate_quote, generate_contract_html, html_to_pdf
+            from ..routes.contracts_pdf import (
+                calculate_quote,
+                generate_contract_html,
+                html_to_pdf,
+                set_contract_pdf,
+            )
             from ..routes.upload import get_r2_client
 
             logger.info(f"📊 Starting synchronous contract generation for client {client_id}")
@@ -1608,8 +1563,8 @@ async def generate_contract_for_client(
             )
             logger.info(f"✅ PDF uploaded successfully")
 
-            # Update contract with PDF key
-            contract.pdf_key = pdf_key
+            # Update contract with PDF key and hash
+            set_contract_pdf(contract, pdf_key, pdf_bytes)
             db.commit()
 
             logger.info(
@@ -1710,7 +1665,7 @@ async def sign_contract(
     )
     from ..models import Contract
     from .contracts_pdf import generate_contract_html, html_to_pdf
-    from .upload import R2_BUCKET_NAME, generate_presigned_url, get_r2_client
+    from .upload import R2_BUCKET_NAME, get_r2_client
 
     # Validate UUID format
     if not validate_uuid(data.clientPublicId):
@@ -1859,18 +1814,11 @@ async def sign_contract(
                 # Provider signature is base64, need to upload it too if not already done
                 provider_signature_url = contract.provider_signature
 
-            # Generate presigned URL for client signature if it's an R2 key
+            # Pass the client signature's R2 key through - the contract renderer loads it
+            # via the branding asset cache
             client_signature_for_pdf = data.signature  # Default to base64
             if contract.client_signature and not contract.client_signature.startswith("data:image"):
-                # It's an R2 key, generate presigned URL
-                try:
-                    client_signature_for_pdf = generate_presigned_url(
-                        contract.client_signature, expiration=604800
-                    )
-                    logger.info(f"✅ Generated presigned URL for client signature")
-                except Exception as url_err:
-                    logger.warning(f"⚠️ Failed to generate presigned URL: {url_err}")
-                    client_signature_for_pdf = data.signature
+                client_signature_for_pdf = contract.client_signature
 
             # Generate HTML with signature URLs - use contract's created_at for consistent dates
             html = await generate_contract_html(
@@ -1885,8 +1833,8 @@ async def sign_contract(
                 contract_public_id=contract.public_id,
             )
 
-            # Verify signature URL is in HTML
-            if client_signature_for_pdf and client_signature_for_pdf in html:
+            # Verify signature image is in HTML
+            if client_signature_for_pdf and "alt='Client Signature'" in html:
                 logger.info("✅ Client signature found in generated HTML")
             else:
                 logger.warning("⚠️ Client signature NOT found in generated HTML!")
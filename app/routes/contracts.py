@@ -560,7 +560,7 @@ async def sign_contract_as_provider(
         import hashlib
 
         from .contracts_pdf import calculate_quote, generate_contract_html, html_to_pdf
-        from .upload import R2_BUCKET_NAME, generate_presigned_url, get_r2_client
+        from .upload import R2_BUCKET_NAME, get_r2_client
 
         # Get form data for regeneration
         form_data = client.form_data if client.form_data else {}
@@ -593,17 +593,8 @@ async def sign_contract_as_provider(
             f"🖊️ [PROVIDER SIGN] Client signature: {'SET (' + str(len(contract.client_signature)) + ' chars)' if contract.client_signature else 'NOT SET'}"
         )
 
-        # Generate presigned URL for client signature if it's an R2 key
+        # Client signature may be an R2 key - the contract renderer loads it via the asset cache
         client_signature_for_pdf = contract.client_signature
-        if contract.client_signature and not contract.client_signature.startswith("data:image"):
-            # It's an R2 key, generate presigned URL
-            try:
-                client_signature_for_pdf = generate_presigned_url(
-                    contract.client_signature, expiration=604800
-                )
-                logger.info(f"✅ Generated presigned URL for client signature in provider sign")
-            except Exception as url_err:
-                logger.warning(f"⚠️ Failed to generate presigned URL: {url_err}")
 
         # Generate HTML with both signatures - use contract's created_at for consistent dates
         html = await generate_contract_html(
@@ -1041,7 +1032,7 @@ async def provider_sign_contract(
             import hashlib
 
             from .contracts_pdf import calculate_quote, generate_contract_html, html_to_pdf
-            from .upload import R2_BUCKET_NAME, generate_presigned_url, get_r2_client
+            from .upload import R2_BUCKET_NAME, get_r2_client
 
             # Get form data for regeneration
             form_data = client.form_data if client.form_data else {}
@@ -1062,16 +1053,8 @@ async def provider_sign_contract(
                 quote["addon_amount"] = 0.0
                 quote["addon_details"] = []
 
-            # Generate presigned URL for client signature if it's an R2 key
+            # Client signature may be an R2 key - the contract renderer loads it via the asset cache
             client_signature_for_pdf = contract.client_signature
-            if contract.client_signature and not contract.client_signature.startswith("data:image"):
-                try:
-                    client_signature_for_pdf = generate_presigned_url(
-                        contract.client_signature, expiration=604800
-                    )
-                    logger.info(f"✅ Generated presigned URL for client signature")
-                except Exception as url_err:
-                    logger.warning(f"⚠️ Failed to generate presigned URL: {url_err}")
 
             # Generate HTML with both signatures
             html = await generate_contract_html(
@@ -3,33 +3,134 @@ PDF Contract Generation using Playwright (Chromium)
 Generates professional contracts from HTML templates and stores them privately in R2
 """
 
+import asyncio
+import hashlib
 import logging
-import os
+import re
 from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
 from ..config import FRONTEND_URL, R2_BUCKET_NAME
 from ..database import get_db
+from ..db_replica import get_read_db
 from ..models import BusinessConfig, Client, Contract, User
 from ..rate_limiter import create_rate_limiter, rate_limit_dependency
-from .upload import generate_presigned_url, get_r2_client
+from ..services.asset_cache import get_asset_data_url
+from ..services.contract_templates import render_msa
+from ..services.pdf_renderer import render_pdf
+from .upload import get_r2_client
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/contracts", tags=["Contracts PDF"])
 
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 # Rate limiters for contract download
 rate_limit_download_per_ip = create_rate_limiter(
     limit=5, window_seconds=60, key_prefix="contract_download_ip", use_ip=True
 )
 
 
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison of an If-None-Match / If-Range header against our ETag"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def _pdf_etag(pdf_hash: Optional[str]) -> Optional[str]:
+    return f'"{pdf_hash}"' if pdf_hash else None
+
+
+def _requested_range(request: Request, etag: Optional[str]) -> Optional[str]:
+    """The Range header to honour - None if absent, malformed or the client's copy is stale"""
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range"):
+        if not etag or not _etag_matches(request.headers["if-range"], etag):
+            return None
+    if range_header:
+        match = _RANGE_RE.match(range_header.strip())
+        if not match or match.groups() == ("", ""):
+            return None
+        return range_header.strip()
+    return None
+
+
+def _not_modified_response(request: Request, pdf_hash: Optional[str], headers: dict):
+    """304 response if the client's If-None-Match still matches the stored PDF, else None"""
+    etag = _pdf_etag(pdf_hash)
+    if etag and _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=304, headers={**headers, "Accept-Ranges": "bytes", "ETag": etag}
+        )
+    return None
+
+
+def _stream_pdf_response(
+    request: Request, pdf_key: str, pdf_hash: Optional[str], headers: dict
+) -> Response:
+    """
+    Stream a PDF from R2 in chunks, honouring If-None-Match (304) and single byte
+    ranges (206) so viewers can revalidate and load progressively
+    """
+    not_modified = _not_modified_response(request, pdf_hash, headers)
+    if not_modified:
+        return not_modified
+
+    etag = _pdf_etag(pdf_hash)
+    headers = {**headers, "Accept-Ranges": "bytes"}
+    if etag:
+        headers["ETag"] = etag
+    range_header = _requested_range(request, etag)
+
+    r2 = get_r2_client()
+    get_kwargs = {"Bucket": R2_BUCKET_NAME, "Key": pdf_key}
+    if range_header:
+        get_kwargs["Range"] = range_header
+
+    try:
+        obj = r2.get_object(**get_kwargs)
+    except Exception as e:
+        if getattr(e, "response", {}).get("Error", {}).get("Code") == "InvalidRange":
+            head = r2.head_object(Bucket=R2_BUCKET_NAME, Key=pdf_key)
+            headers["Content-Range"] = f"bytes */{head['ContentLength']}"
+            return Response(status_code=416, headers=headers)
+        raise
+
+    if not etag and obj.get("ETag"):
+        headers["ETag"] = obj["ETag"]
+    headers["Content-Length"] = str(obj["ContentLength"])
+
+    status_code = 200
+    if range_header and obj.get("ContentRange"):
+        headers["Content-Range"] = obj["ContentRange"]
+        status_code = 206
+
+    body = obj["Body"]
+
+    def iter_body():
+        # Sync iterator - Starlette runs it in the threadpool
+        try:
+            yield from body.iter_chunks(PDF_STREAM_CHUNK_SIZE)
+        finally:
+            body.close()
+
+    return StreamingResponse(
+        iter_body(), status_code=status_code, media_type="application/pdf", headers=headers
+    )
+
+
 async def rate_limit_per_contract(request: Request, contract_id: int):
     """Rate limit by contract ID - 3 downloads per minute per contract"""
     await rate_limit_dependency(
@@ -41,6 +142,18 @@ async def rate_limit_per_contract(request: Request, contract_id: int):
     )
 
 
+async def _rate_limit_full_download(request: Request, contract_id: int, pdf_hash: Optional[str]):
+    """
+    Apply the download rate limits to requests that fetch the whole PDF. Byte-range
+    requests from a viewer loading the same document progressively (and 304
+    revalidations, answered before this runs) don't use up the quota
+    """
+    if _requested_range(request, _pdf_etag(pdf_hash)):
+        return
+    await rate_limit_download_per_ip(request)
+    await rate_limit_per_contract(request, contract_id)
+
+
 class ContractGenerateRequest(BaseModel):
     clientId: int
     ownerUid: str
@@ -614,71 +727,26 @@ async def generate_contract_html(
         pass  # Provider signature provided
     # Get branding
     business_name = business_config.business_name or "Cleaning Service"
-    logo_url = None
-    signature_url = None
 
     logger.info(
         f"🏢 Business config - name: {business_name}, logo_url key: {business_config.logo_url}"
     )
 
-    # Download and convert logo to base64 for Playwright
-    if business_config.logo_url:
-        try:
-            # Check if logo_url is already a full URL (shouldn't be, but handle it)
-            if business_config.logo_url.startswith("http"):
-                presigned_logo_url = business_config.logo_url
-            else:
-                presigned_logo_url = generate_presigned_url(business_config.logo_url)
-            logo_url = await download_image_as_base64(presigned_logo_url)
-            if logo_url:
-                pass  # Logo successfully downloaded
-            else:
-                logger.warning(
-                    f"⚠️ Logo download returned None for URL: {presigned_logo_url[:100]}..."
-                )
-        except Exception as e:
-            logger.error(f"❌ Failed to generate/download logo: {type(e).__name__}: {e}")
-            import traceback
+    # Resolve logo and signatures to data URLs for Playwright (fetched concurrently).
+    # R2 keys go through the branding asset cache; full URLs are downloaded as before.
+    logo_url, signature_url, client_signature_src = await asyncio.gather(
+        resolve_image_data_url(business_config.logo_url, "logo"),
+        resolve_image_data_url(
+            provider_signature or business_config.signature_url, "provider signature"
+        ),
+        resolve_image_data_url(client_signature, "client signature"),
+    )
+    if client_signature_src:
+        client_signature = client_signature_src
+    elif client_signature and not client_signature.startswith("http"):
+        # Unresolvable R2 key - don't emit a broken image
+        client_signature = None
 
-            logger.error(f"❌ Traceback: {traceback.format_exc()}")
-    else:
-        pass  # No logo URL configured
-    # Download and convert provider signature to base64
-    if provider_signature:
-        # Check if it's already base64 or a URL
-        if provider_signature.startswith("data:image"):
-            signature_url = provider_signature
-        elif provider_signature.startswith("http"):
-            signature_url = await download_image_as_base64(provider_signature)
-            if signature_url:
-                pass  # Signature successfully downloaded
-        else:
-            signature_url = provider_signature
-    elif business_config.signature_url:
-        try:
-            presigned_sig_url = generate_presigned_url(business_config.signature_url)
-            signature_url = await download_image_as_base64(presigned_sig_url)
-            if signature_url:
-                pass  # Signature successfully downloaded
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to generate signature URL: {e}")
-
-    # Download and convert client signature to base64
-    if client_signature:
-        if client_signature.startswith("data:image"):
-            # Already base64, use as-is
-            pass
-        elif client_signature.startswith("http"):
-            # Download from URL
-            logger.info(f"📥 Downloading client signature from URL: {client_signature[:100]}...")
-            client_signature_b64 = await download_image_as_base64(client_signature)
-            if client_signature_b64:
-                client_signature = client_signature_b64
-            else:
-                logger.warning("⚠️ Failed to download client signature from URL")
-        # else: assume it's already in correct format
-    else:
-        pass  # No client signature provided
     # Contract details - use passed date or current date for new contracts
     base_date = contract_created_at or datetime.now()
     contract_date = base_date.strftime("%B %d, %Y")
@@ -746,19 +814,6 @@ async def generate_contract_html(
             f"🖊️ [BEFORE TEMPLATE] Client sig is base64: {client_signature.startswith('data:image')}"
         )
 
-    # Prepare signature HTML fragments
-    provider_signature_html = ""
-    if signature_url:
-        provider_signature_html = f"<img src='{signature_url}' alt='Provider Signature' style='max-height: 75px; max-width: 280px; object-fit: contain; display: block; margin-bottom: 0;'>"
-    else:
-        provider_signature_html = ""
-
-    client_signature_html = ""
-    if client_signature:
-        client_signature_html = f"<img src='{client_signature}' alt='Client Signature' style='max-height: 75px; max-width: 280px; object-fit: contain; display: block; margin-bottom: 0;'>"
-    else:
-        client_signature_html = ""
-
     # Format accepted payment methods
     accepted_methods = "check, bank transfer, or other agreed-upon methods"  # Default
     if (
@@ -791,481 +846,54 @@ async def generate_contract_html(
         else:
             accepted_methods = ", ".join(method_list[:-1]) + f", and {method_list[-1]}"
 
-    html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Master Service Agreement - {contract_number}</title>
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-            -webkit-print-color-adjust: exact !important;
-            print-color-adjust: exact !important;
-        }}
-        body {{
-            font-family: 'Poppins', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            font-size: 10pt;
-            line-height: 1.7;
-            color: #0A2540;
-            background: white;
-            padding: 50px 60px;
-        }}
-        .header {{
-            display: flex;
-            justify-content: flex-end;
-            align-items: flex-start;
-            margin-bottom: 40px;
-        }}
-        .logo-section {{
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-        .logo {{
-            max-height: 40px;
-            max-width: 150px;
-            object-fit: contain;
-        }}
-        .company-name {{
-            font-size: 14pt;
-            font-weight: 600;
-            color: #0A2540;
-        }}
-        .contract-title {{
-            font-size: 22pt;
-            font-weight: 600;
-            color: #0A2540;
-            margin-bottom: 20px;
-        }}
-        .contract-intro {{
-            font-size: 10pt;
-            color: #425466;
-            margin-bottom: 30px;
-            line-height: 1.8;
-        }}
-        .contract-intro strong {{
-            color: #0A2540;
-        }}
-        .section {{
-            margin-bottom: 28px;
-        }}
-        .section-title {{
-            font-size: 11pt;
-            font-weight: 600;
-            color: #0A2540;
-            margin-bottom: 12px;
-        }}
-        .section-number {{
-            color: #0A2540;
-            margin-right: 8px;
-        }}
-        .section-content {{
-            color: #425466;
-            font-size: 10pt;
-            line-height: 1.8;
-        }}
-        .section-content strong {{
-            color: #0A2540;
-        }}
-        .info-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
-        }}
-        .info-box {{
-            background: #F8FAFC;
-            padding: 18px;
-            border-radius: 6px;
-        }}
-        .info-box h4 {{
-            font-size: 8pt;
-            text-transform: uppercase;
-            letter-spacing: 0.8px;
-            color: #64748B;
-            margin-bottom: 10px;
-            font-weight: 500;
-        }}
-        .info-box p {{
-            font-size: 10pt;
-            color: #0A2540;
-            margin-bottom: 4px;
-        }}
-        .pricing-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 12px;
-            background-color: white;
-            page-break-inside: avoid;
-        }}
-        .pricing-table thead {{
-            display: table-row-group;
-        }}
-        .pricing-table th,
-        .pricing-table td {{
-            padding: 12px 16px;
-            text-align: left;
-            border-bottom: 1px solid #E2E8F0;
-            background: white !important;
-            background-color: white !important;
-            -webkit-print-color-adjust: exact !important;
-            print-color-adjust: exact !important;
-        }}
-        .pricing-table .table-header {{
-            font-size: 8pt;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            color: #64748B !important;
-            font-weight: 600;
-            border-bottom: 2px solid #E2E8F0;
-            background: white !important;
-            background-color: white !important;
-        }}
-        .pricing-table th {{
-            background: white !important;
-            background-color: white !important;
-            font-size: 8pt;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            color: #64748B !important;
-            font-weight: 600;
-            border-bottom: 2px solid #E2E8F0;
-            -webkit-print-color-adjust: exact !important;
-            print-color-adjust: exact !important;
-        }}
-        .pricing-table td {{
-            font-size: 10pt;
-            color: #0A2540 !important;
-            background: white !important;
-            background-color: white !important;
-        }}
-        .pricing-table .total-row {{
-            font-weight: 600;
-        }}
-        .pricing-table .total-row td {{
-            border-bottom: none;
-            border-top: 2px solid #e5e7eb;
-            background: white !important;
-            background-color: white !important;
-            color: #0A2540 !important;
-            font-size: 10pt;
-        }}
-        .pricing-table tr {{
-            background: white !important;
-            background-color: white !important;
-        }}
-        .bullet-list {{
-            list-style: none;
-            padding: 0;
-            margin: 0;
-        }}
-        .bullet-list li {{
-            padding: 6px 0;
-            padding-left: 20px;
-            position: relative;
-            font-size: 10pt;
-            color: #425466;
-            line-height: 1.6;
-        }}
-        .bullet-list li:before {{
-            content: "•";
-            color: #0A2540;
-            font-weight: bold;
-            position: absolute;
-            left: 0;
-        }}
-        .signatures {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 50px;
-            margin-top: 50px;
-            padding-top: 30px;
-            border-top: 1px solid #E2E8F0;
-            page-break-inside: avoid;
-        }}
-        .signature-box {{
-            page-break-inside: avoid;
-        }}
-        .signature-box h4 {{
-            font-size: 9pt;
-            color: #64748B;
-            margin-bottom: 12px;
-            font-weight: 500;
-        }}
-        .signature-line {{
-            height: 80px;
-            border-bottom: 2px solid #0A2540;
-            display: flex;
-            align-items: flex-end;
-            justify-content: flex-start;
-            margin-bottom: 8px;
-            padding-bottom: 2px;
-            position: relative;
-        }}
-        .signature-line img {{
-            max-height: 75px;
-            max-width: 280px;
-            object-fit: contain;
-            display: block;
-            margin-bottom: 0;
-        }}
-        .signature-name {{
-            font-size: 10pt;
-            font-weight: 600;
-            color: #0A2540;
-        }}
-        .signature-role {{
-            font-size: 9pt;
-            color: #64748B;
-            font-weight: 400;
-        }}
-        .footer {{
-            margin-top: 50px;
-            padding-top: 20px;
-            border-top: 1px solid #E2E8F0;
-            text-align: center;
-            font-size: 8pt;
-            color: #94A3B8;
-        }}
-        .terms-note {{
-            font-size: 9pt;
-            color: #64748B;
-            font-style: italic;
-            margin-top: 8px;
-        }}
-
-        /* Print-specific styles */
-        @media print {{
-            * {{
-                -webkit-print-color-adjust: exact !important;
-                print-color-adjust: exact !important;
-                color-adjust: exact !important;
-            }}
-            .pricing-table {{
-                page-break-inside: avoid;
-            }}
-            .pricing-table th {{
-                background: white !important;
-                background-color: white !important;
-                color: #64748B !important;
-            }}
-            .pricing-table td {{
-                background: white !important;
-                background-color: white !important;
-                color: #0A2540 !important;
-            }}
-            .pricing-table .total-row td {{
-                background: white !important;
-                background-color: white !important;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <!-- Header with Logo on Top Right -->
-    <div class="header">
-        <div class="logo-section">
-            {"<img src='" + logo_url + "' alt='Logo' class='logo'>" if logo_url else ""}
-            {"" if logo_url else "<span class='company-name'>" + business_name + "</span>"}
-        </div>
-    </div>
-
-    <!-- Contract Title -->
-    <div class="contract-title">Master Service Agreement</div>
-
-    <!-- Contract Intro -->
-    <p class="contract-intro">
-        This Master Service Agreement (the "Agreement") is made and entered into on <strong>{contract_date}</strong>
-        by and between <strong>{business_name}</strong> ("Service Provider") and <strong>{client_name}</strong> ("Client").
-        <br/><span style="color: #94A3B8; font-size: 9pt;">Contract #{contract_number}</span>
-    </p>
-
-    <!-- 1. Purpose -->
-    <div class="section">
-        <div class="section-title"><span class="section-number">1.</span>Purpose</div>
-        <p class="section-content">
-            The purpose of this Agreement is to outline the terms and conditions for the cleaning and maintenance services
-            to be provided by <strong>{business_name}</strong> ("Service Provider") to <strong>{client_name}</strong> ("Client").
-        </p>
-    </div>
-
-    <!-- 2. Scope of Work -->
-    <div class="section">
-        <div class="section-title"><span class="section-number">2.</span>Scope of Work</div>
-        <p class="section-content">Service Provider will provide cleaning and maintenance services to Client as detailed in the attached <strong>Exhibit A – Scope of Work</strong>, which forms an integral part of this Agreement. Exhibit A includes all service tasks, inclusions, exclusions, service areas, special notes, and frequency details.</p>
-    </div>
-
-    <!-- 3. Property & Service Details -->
-    <div class="section">
-        <div class="section-title"><span class="section-number">3.</span>Property & Service Details</div>
-        <div class="info-grid">
-            <div class="info-box">
-                <h4>Service Location</h4>
-                <p><strong>{client.business_name}</strong></p>
-                <p>{client_address or "To be confirmed"}</p>
-                <p>{client_email}</p>
-                <p>{client_phone}</p>
-            </div>
-            <div class="info-box">
-                <h4>Property Information</h4>
-                <p><strong>Type:</strong> {property_type}</p>
-                <p><strong>Size:</strong> {property_size} sq ft</p>
-                <p><strong>Frequency:</strong> {frequency}</p>
-                <p><strong>Start Date:</strong> {start_date}</p>
-            </div>
-        </div>
-    </div>
-
-    <!-- 4. Special Requests & Notes -->
-    {"<div class='section'><div class='section-title'><span class='section-number'>4.</span>Special Requests & Client Notes</div><div class='info-box' style='background: #FEF3C7; border-left: 4px solid #F59E0B; margin-top: 12px;'><h4 style='color: #92400E; margin-bottom: 8px;'>⚠️ Important Client Requirements</h4><p style='color: #92400E; font-size: 10pt; line-height: 1.6; white-space: pre-wrap;'>" + special_requests + "</p></div></div>" if special_requests else ""}
-
-    <!-- 5. Payment and Pricing -->
-    <div class="section">
-        <div class="section-title"><span class="section-number">5.</span>Payment and Pricing</div>
-        <p class="section-content" style="margin-bottom: 12px;">
-            The Client will pay the Service Provider the total agreed sum, outlined in the pricing below, for
-            the completion of the scope of work outlined in this Agreement.
-        </p>
-        <table class="pricing-table">
-            <tbody>
-                <tr class="header-row">
-                    <td class="table-header">Description</td>
-                    <td class="table-header">Details</td>
-                    <td class="table-header" style="text-align: right;">Amount (USD)</td>
-                </tr>
-                <tr>
-                    <td>Base Service Rate</td>
-                    <td>{frequency} cleaning service</td>
-                    <td style="text-align: right;">{"Quote Pending" if quote.get('quote_pending') else f"USD ${quote['base_price']:,.2f}"}</td>
-                </tr>
-                {"<tr><td>Frequency Discount</td><td>" + str(quote['discount_percent']) + "% off for " + frequency.lower() + " service</td><td style='text-align: right; color: #10B981;'>-USD $" + f"{quote['discount_amount']:,.2f}" + "</td></tr>" if quote['discount_amount'] > 0 else ""}
-                {"<tr><td>First Cleaning Discount</td><td>" + (f"${quote['first_cleaning_discount_value']:.2f} off" if quote.get('first_cleaning_discount_type') == 'fixed' else f"{quote['first_cleaning_discount_value']:.0f}% off") + " for first visit</td><td style='text-align: right; color: #10B981;'>-USD $" + f"{quote['first_cleaning_discount_amount']:,.2f}" + "</td></tr>" if quote.get('first_cleaning_discount_amount', 0) > 0 else ""}
-                {"".join([f"<tr><td>{addon['name']}</td><td>{addon['quantity']} × ${addon['unit_price']:,.2f} {addon['pricing_metric']}</td><td style='text-align: right;'>USD ${addon['total_price']:,.2f}</td></tr>" for addon in quote.get('addon_details', [])]) if quote.get('addon_details') else ""}
-                <tr class="total-row">
-                    <td><strong>Total Per Visit</strong></td>
-                    <td>{"Service provider will provide quote" if quote.get('quote_pending') else f"Estimated {quote['estimated_hours']} hours, {quote['cleaners']} cleaner(s)"}</td>
-                    <td style="text-align: right;"><strong>{"Quote Pending" if quote.get('quote_pending') else f"USD ${quote['final_price']:,.2f}"}</strong></td>
-                </tr>
-                {f"<tr><td style='padding-top: 20px;'><strong>Contract Term</strong></td><td style='padding-top: 20px;'>{quote['term_duration']} {quote['term_unit']} ({quote['service_occurrences']} visits)</td><td style='text-align: right; padding-top: 20px;'></td></tr><tr class='total-row'><td><strong>Total Contract Value</strong></td><td>For entire {quote['term_duration']} {quote['term_unit'].lower()} term</td><td style='text-align: right;'><strong>USD ${quote['total_term_rate']:,.2f}</strong></td></tr>" if quote.get('total_term_rate') and not quote.get('quote_pending') else ""}
-            </tbody>
-        </table>
-
-        {f'''<div style="background: #FEF3C7; border: 1px solid #F59E0B; border-radius: 6px; padding: 12px; margin-top: 16px; font-size: 9pt; color: #92400E;">
-            <strong>⚠️ Time Estimate Disclaimer:</strong> The estimated {quote['estimated_hours']} hours is based on similar jobs for this service provider and property size. Actual cleaning time may be shorter or longer depending on specific conditions, level of cleaning required, and property layout. This estimate is provided for planning purposes only.
-        </div>''' if not quote.get('quote_pending') else ""}
-
-        <p class="terms-note">Payment due within {payment_due_days} days of service completion. A {late_fee}% late fee applies after due date.</p>
-    </div>
-
-    <!-- 6. Terms and Conditions -->
-    <div class="section">
-        <div class="section-title"><span class="section-number">6.</span>Terms and Conditions</div>
-        <p class="section-content">
-            This Agreement will begin on the date of acceptance and will remain in effect until all services have been completed.
-        </p>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">Payment Terms</h4>
-        <ul class="bullet-list">
-            <li><strong>Payment Due:</strong> Payment is due within {payment_due_days} days of service completion</li>
-            <li><strong>Late Fee:</strong> A {late_fee}% late fee will be applied to any balance not paid by the due date</li>
-            <li><strong>Accepted Methods:</strong> Payment may be made via {accepted_methods}</li>
-            {f"<li><strong>Weekend Premium:</strong> Services performed on Saturdays or Sundays are subject to a {weekend_premium}% premium rate</li>" if weekend_premium and weekend_premium > 0 else ""}
-        </ul>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">Cancellation Policy</h4>
-        <ul class="bullet-list">
-            <li><strong>Notice Required:</strong> {cancellation_window}-hour advance notice is required for cancellations</li>
-            <li><strong>Late Cancellation:</strong> Cancellations made with less than {cancellation_window} hours notice may be subject to a cancellation fee</li>
-        </ul>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">Termination</h4>
-        <ul class="bullet-list">
-            <li><strong>Termination for Convenience:</strong> Either party may terminate this Agreement without cause upon thirty (30) days' written notice to the other party. Written notice may be provided via email to the address on file or via certified mail to the address listed in this Agreement.</li>
-            <li><strong>Termination for Cause:</strong> If either party materially breaches any provision of this Agreement, the non-breaching party may terminate this Agreement if the breach is not cured within seven (7) calendar days after the breaching party receives written notice describing the breach in reasonable detail. Material breaches include, but are not limited to, failure to pay amounts due, failure to provide agreed-upon services, or violation of any material term of this Agreement.</li>
-            <li><strong>Payment Upon Termination:</strong> Notwithstanding any termination of this Agreement, Client remains responsible for payment of all services performed by Service Provider up to and including the effective date of termination. This includes any services scheduled or performed during the thirty (30) day notice period for termination for convenience, or during the seven (7) day cure period for termination for cause. All outstanding invoices shall become immediately due and payable upon the effective date of termination.</li>
-            <li><strong>Effect of Termination:</strong> Upon termination, Service Provider shall cease providing services as of the effective termination date, and Client shall return any property, materials, or equipment belonging to Service Provider. Any provisions of this Agreement that by their nature should survive termination shall remain in effect, including but not limited to payment obligations, confidentiality provisions, and limitation of liability clauses.</li>
-        </ul>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">Rate Adjustments</h4>
-        <ul class="bullet-list">
-            <li><strong>Rate Adjustment:</strong> Service Provider may adjust rates with thirty (30) days' written notice to Client. Adjusted rates apply prospectively from the effective date specified in the notice.</li>
-        </ul>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">General Terms</h4>
-        <ul class="bullet-list">
-            <li><strong>Access:</strong> Client agrees to provide necessary access to the property</li>
-            <li><strong>Liability:</strong> Service provider maintains appropriate insurance coverage</li>
-        </ul>
-        <p class="terms-note">For recurring services, billing begins immediately upon signing, and the first cleaning will be scheduled separately based on your availability.</p>
-    </div>
-
-    <!-- 7. Legal Provisions -->
-    <div class="section">
-        <div class="section-title"><span class="section-number">7.</span>Legal Provisions</div>
-        
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">Limitation of Liability</h4>
-        <ul class="bullet-list">
-            <li><strong>Liability Cap:</strong> Service Provider's total liability under this Agreement shall not exceed the total fees paid by Client in the three (3) months immediately preceding the claim.</li>
-            <li><strong>Insurance:</strong> Service Provider maintains general liability insurance coverage. Client acknowledges that insurance coverage may contain limitations and exclusions.</li>
-        </ul>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">Independent Contractor</h4>
-        <ul class="bullet-list">
-            <li><strong>Independent Contractor Status:</strong> Service Provider is an independent contractor, not an employee, agent, or partner of Client. Service Provider retains control over the manner and means of performing services and is responsible for all taxes, insurance, and employment obligations for its personnel.</li>
-        </ul>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">Force Majeure</h4>
-        <ul class="bullet-list">
-            <li><strong>Excused Performance:</strong> Neither party shall be liable for failure to perform due to events beyond reasonable control, including acts of God, severe weather, natural disasters, government actions, pandemics, or similar emergencies. The affected party shall provide prompt notice and use reasonable efforts to resume performance. If such events continue for more than thirty (30) days, either party may terminate this Agreement without penalty.</li>
-        </ul>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">Non-Solicitation</h4>
-        <ul class="bullet-list">
-            <li><strong>Personnel Hiring:</strong> Client agrees not to directly hire assigned personnel during the active term of this Agreement without written consent from Service Provider.</li>
-        </ul>
-
-        <h4 style="margin-top: 16px; margin-bottom: 8px; color: #000000; font-size: 11pt;">General Legal Terms</h4>
-        <ul class="bullet-list">
-            <li><strong>Governing Law:</strong> This Agreement shall be governed by the laws of the state in which the Service Provider operates.</li>
-            <li><strong>Severability:</strong> If any provision is found invalid, the remaining provisions continue in full force.</li>
-            <li><strong>Dispute Resolution:</strong> Parties agree to resolve disputes through good faith negotiation first.</li>
-            <li><strong>Electronic Signatures:</strong> Electronic signatures are legally binding and have the same effect as handwritten signatures.</li>
-        </ul>
-    </div>
-
-    <!-- Signatures -->
-    <div class="signatures">
-        <div class="signature-box">
-            <h4>Service Provider</h4>
-            <div class="signature-line">
-                {provider_signature_html}
-            </div>
-            <div class="signature-name">{business_name}</div>
-            <div class="signature-role">Authorized Representative</div>
-        </div>
-        <div class="signature-box">
-            <h4>Client</h4>
-            <div class="signature-line">
-                {client_signature_html}
-            </div>
-            <div class="signature-name">{client_name}</div>
-            <div class="signature-role">Client Representative</div>
-        </div>
-    </div>
-
-    <!-- Footer -->
-    <div class="footer">
-        <p>Contract #{contract_number} • Generated on {contract_date}</p>
-        <p style="margin-top: 4px;">All monetary amounts are in USD unless otherwise specified</p>
-    </div>
-</body>
-</html>
-"""
-    return html
+    return render_msa(
+        contract_number=contract_number,
+        contract_date=contract_date,
+        start_date=start_date,
+        business_name=business_name,
+        logo_url=logo_url,
+        signature_url=signature_url,
+        client=client,
+        client_name=client_name,
+        client_email=client_email,
+        client_phone=client_phone,
+        client_address=client_address,
+        client_signature=client_signature,
+        property_type=property_type,
+        property_size=property_size,
+        frequency=frequency,
+        special_requests=special_requests,
+        quote=quote,
+        payment_due_days=payment_due_days,
+        late_fee=late_fee,
+        cancellation_window=cancellation_window,
+        weekend_premium=weekend_premium,
+        accepted_methods=accepted_methods,
+    )
+
+
+async def resolve_image_data_url(value: Optional[str], label: str = "image") -> Optional[str]:
+    """
+    Turn a stored image reference into a data URL that Playwright can render offline.
+    Accepts a data URL (returned as-is), a full http(s) URL, or an R2 object key.
+    """
+    if not value:
+        return None
+    if value.startswith("data:image"):
+        return value
+
+    try:
+        if value.startswith("http"):
+            data_url = await download_image_as_base64(value)
+        else:
+            data_url = await get_asset_data_url(value)
+    except Exception as e:
+        logger.error(f"❌ Failed to load {label}: {type(e).__name__}: {e}")
+        return None
+
+    if not data_url:
+        logger.warning(f"⚠️ Could not load {label}: {value[:100]}")
+    return data_url
 
 
 async def download_image_as_base64(url: str) -> str:
@@ -1319,52 +947,11 @@ async def download_image_as_base64(url: str) -> str:
 
 async def html_to_pdf(html: str) -> bytes:
     """
-    Convert HTML to PDF using Playwright via subprocess.
-    Runs in a separate process to avoid asyncio conflicts on Windows.
+    Convert HTML to PDF using Playwright.
+    Renders on the warm browser pool owned by the ARQ worker, or in a one-off
+    subprocess when this process has no pool (see services/pdf_renderer.py).
     """
-    import asyncio
-    import base64
-    import subprocess
-    import sys
-
-    # Get the path to the pdf_worker script
-    worker_path = os.path.join(os.path.dirname(__file__), "..", "pdf_worker.py")
-    worker_path = os.path.abspath(worker_path)
-
-    # Get the correct Python executable from the venv
-    # sys.executable should point to the venv python when running from uvicorn
-    python_exe = sys.executable
-
-    # Encode HTML as base64 to safely pass via stdin
-    html_b64 = base64.b64encode(html.encode("utf-8")).decode("utf-8")
-
-    def run_worker():
-        # Run the worker script as a separate process
-        try:
-            result = subprocess.run(
-                [python_exe, worker_path],
-                input=html_b64,
-                capture_output=True,
-                text=True,
-                timeout=120,  # 120 second timeout for slow systems
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-            )
-
-            if result.returncode != 0:
-                raise Exception(f"PDF worker failed (exit {result.returncode}): {result.stderr}")
-
-            # Decode the base64 PDF from stdout
-            pdf_b64 = result.stdout.strip()
-            if not pdf_b64:
-                raise Exception("PDF worker returned empty output")
-            return base64.b64decode(pdf_b64)
-        except subprocess.TimeoutExpired as e:
-            raise Exception("PDF generation timed out after 120 seconds") from e
-        except Exception as e:
-            raise Exception(f"PDF generation error: {str(e)}") from e
-
-    # Run in thread pool to not block the event loop
-    return await asyncio.to_thread(run_worker)
+    return await render_pdf(html)
 
 
 def upload_pdf_to_r2(pdf_bytes: bytes, owner_uid: str, contract_public_id: str) -> str:
@@ -1382,6 +969,16 @@ def upload_pdf_to_r2(pdf_bytes: bytes, owner_uid: str, contract_public_id: str)
     return key
 
 
+def set_contract_pdf(contract: Contract, pdf_key: str, pdf_bytes: bytes):
+    """
+    Point a contract at a newly uploaded PDF (no commit).
+    pdf_hash is the download ETag, so it must change whenever the bytes do - even when
+    the object is overwritten under the same key.
+    """
+    contract.pdf_key = pdf_key
+    contract.pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
+
+
 @router.post("/generate-pdf")
 async def generate_contract_pdf(data: ContractGenerateRequest, db: Session = Depends(get_db)):
     """Generate a PDF contract for a client submission and store in R2"""
@@ -1437,7 +1034,7 @@ async def generate_contract_pdf(data: ContractGenerateRequest, db: Session = Dep
 
         # Upload PDF to R2 and store the key
         pdf_key = upload_pdf_to_r2(pdf_bytes, data.ownerUid, contract.public_id)
-        contract.pdf_key = pdf_key
+        set_contract_pdf(contract, pdf_key, pdf_bytes)
         db.commit()
 
         # Generate backend URL instead of presigned R2 URL to avoid CORS issues
@@ -1513,14 +1110,12 @@ async def download_contract_pdf(
     request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-    _ip: None = Depends(rate_limit_download_per_ip),
 ):
     """
     Download a contract PDF directly
     Rate limited: 5 downloads per minute per IP, 3 downloads per minute per contract
+    (byte-range requests and 304 revalidations don't count)
     """
-    # Apply per-contract rate limit
-    await rate_limit_per_contract(request, contract_id)
     contract = (
         db.query(Contract)
         .filter(Contract.id == contract_id, Contract.user_id == current_user.id)
@@ -1533,21 +1128,22 @@ async def download_contract_pdf(
     if not contract.pdf_key:
         raise HTTPException(status_code=404, detail="No PDF available for this contract")
 
-    try:
-        r2 = get_r2_client()
-        response = r2.get_object(Bucket=R2_BUCKET_NAME, Key=contract.pdf_key)
-        pdf_bytes = response["Body"].read()
+    headers = {
+        "Content-Disposition": f"attachment; filename=contract-{contract.id}.pdf",
+        "Access-Control-Allow-Origin": FRONTEND_URL,
+        "Access-Control-Allow-Methods": "GET",
+        "Access-Control-Allow-Headers": "Content-Type, Authorization, Range, If-None-Match",
+        "Access-Control-Expose-Headers": "Accept-Ranges, Content-Range, Content-Length, ETag",
+        "Cache-Control": "private, no-cache",
+    }
+    not_modified = _not_modified_response(request, contract.pdf_hash, headers)
+    if not_modified:
+        return not_modified
 
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=contract-{contract.id}.pdf",
-                "Access-Control-Allow-Origin": FRONTEND_URL,
-                "Access-Control-Allow-Methods": "GET",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization",
-            },
-        )
+    await _rate_limit_full_download(request, contract.id, contract.pdf_hash)
+
+    try:
+        return _stream_pdf_response(request, contract.pdf_key, contract.pdf_hash, headers)
     except Exception as e:
         logger.error(f"❌ Failed to download PDF: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to download PDF") from e
@@ -1557,12 +1153,12 @@ async def download_contract_pdf(
 async def view_contract_pdf_public(
     contract_public_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    _ip: None = Depends(rate_limit_download_per_ip),
+    db: Session = Depends(get_read_db),
 ):
     """
     View a contract PDF publicly using the contract's public ID
     Rate limited: 5 downloads per minute per IP, 3 downloads per minute per contract
+    (byte-range requests and 304 revalidations don't count)
     """
     # Validate UUID format
     from .contracts import validate_uuid
@@ -1578,25 +1174,22 @@ async def view_contract_pdf_public(
     if not contract.pdf_key:
         raise HTTPException(status_code=404, detail="No PDF available for this contract")
 
-    # Apply per-contract rate limit
-    await rate_limit_per_contract(request, contract.id)
+    headers = {
+        "Content-Disposition": f"inline; filename=contract-{contract.id}.pdf",
+        "Access-Control-Allow-Origin": FRONTEND_URL,
+        "Access-Control-Allow-Methods": "GET",
+        "Access-Control-Allow-Headers": "Content-Type, Authorization, Range, If-None-Match",
+        "Access-Control-Expose-Headers": "Accept-Ranges, Content-Range, Content-Length, ETag",
+        "Cache-Control": "no-cache, must-revalidate",
+    }
+    not_modified = _not_modified_response(request, contract.pdf_hash, headers)
+    if not_modified:
+        return not_modified
 
-    try:
-        r2 = get_r2_client()
-        response = r2.get_object(Bucket=R2_BUCKET_NAME, Key=contract.pdf_key)
-        pdf_bytes = response["Body"].read()
-
-        headers = {
-            "Content-Disposition": f"inline; filename=contract-{contract.id}.pdf",
-            "Access-Control-Allow-Origin": FRONTEND_URL,
-            "Access-Control-Allow-Methods": "GET",
-            "Access-Control-Allow-Headers": "Content-Type, Authorization",
-            "Cache-Control": "no-cache, must-revalidate",
-        }
-        if contract.pdf_hash:
-            headers["ETag"] = contract.pdf_hash
+    await _rate_limit_full_download(request, contract.id, contract.pdf_hash)
 
-        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+    try:
+        return _stream_pdf_response(request, contract.pdf_key, contract.pdf_hash, headers)
     except Exception as e:
         logger.error(f"❌ Failed to serve PDF: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to load PDF") from e
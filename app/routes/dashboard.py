@@ -0,0 +1,37 @@
+"""
+Dashboard Routes
+One summary call for the dashboard home instead of a request per counter
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from ..auth import get_current_user_with_plan
+from ..database import get_db
+from ..models import User
+from ..services.dashboard_summary import get_dashboard_summary
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("/summary")
+async def get_summary(
+    current_user: User = Depends(get_current_user_with_plan),
+    db: Session = Depends(get_db),
+):
+    """
+    Quote counts by status and pending value, active contracts, upcoming visits,
+    unpaid invoices and unread payment notifications.
+    Counters are cached per user and refreshed whenever one of the counted tables is written.
+    """
+    summary = get_dashboard_summary(db, current_user.id)
+    # Read from the user row on every call - mark-payments-read must show immediately.
+    # The cached summary may be shared (in-process cache tier), so it isn't modified
+    return {
+        **summary,
+        "payments": {"unread_count": current_user.unread_payments_count or 0},
+    }
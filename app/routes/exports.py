@@ -0,0 +1,88 @@
+"""
+CSV Export Routes
+Streamed exports for clients, contracts, invoices and visits, plus background
+exports (gzipped CSV in R2) for very large tenants
+"""
+
+import logging
+from typing import Literal, Optional
+
+from arq.connections import ArqRedis
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ..auth import get_current_user_with_plan
+from ..job_queue import get_arq_pool
+from ..models import User
+from ..services.csv_export import export_filename, parse_export_filters, stream_csv
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+ExportEntity = Literal["clients", "contracts", "invoices", "visits"]
+
+
+def csv_streaming_response(entity: str, user_id: int, filters: dict) -> StreamingResponse:
+    """Stream an export as it is read from the database cursor"""
+    filename = export_filename(entity)
+    logger.info(f"📊 CSV export of {entity} requested by user {user_id}")
+    return StreamingResponse(
+        stream_csv(entity, user_id, filters),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Cache-Control": "no-cache",
+        },
+    )
+
+
+@router.get("/{entity}")
+async def export_csv(
+    entity: ExportEntity,
+    current_user: User = Depends(get_current_user_with_plan),
+    status: Optional[str] = Query(None, description="Filter by status (comma-separated)"),
+    search: Optional[str] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+):
+    """
+    Export clients, contracts, invoices or visits as CSV with optional filters.
+    Rows are streamed from a server-side cursor; use POST /exports/{entity}/jobs
+    for very large exports.
+    """
+    filters = parse_export_filters(status, search, start_date, end_date)
+    return csv_streaming_response(entity, current_user.id, filters)
+
+
+@router.post("/{entity}/jobs")
+async def queue_csv_export(
+    entity: ExportEntity,
+    current_user: User = Depends(get_current_user_with_plan),
+    arq_pool: Optional[ArqRedis] = Depends(get_arq_pool),
+    status: Optional[str] = Query(None, description="Filter by status (comma-separated)"),
+    search: Optional[str] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+):
+    """
+    Queue a background export that writes a gzipped CSV to R2.
+    Runs on the low-priority queue - the finished job's result (via /jobs/status/{jobId}
+    or /jobs/events/{jobId}) carries a download_url.
+    """
+    from ..services.contract_rerender import LOW_PRIORITY_QUEUE
+
+    if arq_pool is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    filters = parse_export_filters(status, search, start_date, end_date)
+    try:
+        job = await arq_pool.enqueue_job(
+            "export_csv_task", current_user.id, entity, filters, _queue_name=LOW_PRIORITY_QUEUE
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to queue {entity} export for user {current_user.id}: {e}")
+        raise HTTPException(status_code=503, detail="Failed to queue export") from e
+
+    logger.info(f"✅ {entity} export queued for user {current_user.id}: job {job.job_id}")
+    return {"message": "Export queued", "jobId": job.job_id}
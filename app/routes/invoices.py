@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -21,6 +21,7 @@ from ..config import (
 from ..database import get_db
 from ..models import BusinessConfig, Client, Contract, Schedule, User
 from ..models_invoice import Invoice
+from ..pagination import ListParams, filter_status, paginate, set_page_headers
 from ..utils.sanitization import sanitize_string
 
 logger = logging.getLogger(__name__)
@@ -120,13 +121,28 @@ def get_billing_interval(frequency: str) -> tuple:
     return intervals.get(frequency, ("month", 1))
 
 
+INVOICE_SORT_FIELDS = {
+    "created_at": Invoice.created_at,
+    "due_date": Invoice.due_date,
+    "paid_at": Invoice.paid_at,
+    "total_amount": Invoice.total_amount,
+}
+
+
 @router.get("", response_model=list[InvoiceResponse])
 async def get_invoices(
-    status: Optional[str] = None,
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None, description="Filter by status (comma-separated)"),
+    client_id: Optional[int] = Query(None, description="Filter invoices by client ID"),
+    params: ListParams = Depends(),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Get all invoices for the current user"""
+    """
+    Get invoices for the current user
+    Paginated with limit/cursor; the next cursor is returned in X-Next-Cursor
+    """
     # Optimized query with JOIN to avoid N+1 problem
     query = (
         db.query(Invoice, Client)
@@ -134,11 +150,13 @@ async def get_invoices(
         .filter(Invoice.user_id == current_user.id)
     )
 
-    if status:
-        query = query.filter(Invoice.status == status)
+    query = filter_status(query, Invoice.status, status)
+    if client_id:
+        query = query.filter(Invoice.client_id == client_id)
 
-    # Order by created_at descending and execute query
-    invoice_client_pairs = query.order_by(Invoice.created_at.desc()).all()
+    page = paginate(query, params, model=Invoice, sort_fields=INVOICE_SORT_FIELDS)
+    set_page_headers(request, response, page)
+    invoice_client_pairs = page.items
 
     result = []
     for inv, client in invoice_client_pairs:
@@ -3,97 +3,97 @@ Job Status Tracking for Background Tasks
 """
 
 import asyncio
+import json
 import logging
 from typing import Optional
 
-from arq import create_pool
-from arq.jobs import Job, JobStatus
-from fastapi import APIRouter, HTTPException
+from arq.connections import ArqRedis
+from arq.constants import default_queue_name, in_progress_key_prefix, result_key_prefix
+from arq.jobs import deserialize_result
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from ..worker import get_redis_settings
+from ..job_queue import get_arq_pool
+from ..services.contract_rerender import LOW_PRIORITY_QUEUE
+from ..services.job_events import TERMINAL_STATUSES, job_event_hub, progress_key
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+SSE_RECHECK_INTERVAL = 15  # Seconds between status re-checks (also the keep-alive interval)
+SSE_MAX_DURATION = 15 * 60  # Close long-lived streams; EventSource reconnects automatically
+
 
 class JobStatusResponse(BaseModel):
     jobId: str
     status: str  # queued, in_progress, complete, failed
     result: Optional[dict] = None
     error: Optional[str] = None
+    progress: Optional[dict] = None  # Reported by long-running jobs (e.g. bulk re-render)
 
 
-async def get_job_status_with_retry(job_id: str, max_retries: int = 3, retry_delay: float = 1.0):
+async def fetch_job_status(pool: ArqRedis, job_id: str) -> JobStatusResponse:
+    """
+    Read a job's state in a single Redis round trip.
+    Fetches the result, in-progress marker, position in both queues and any
+    progress snapshot in one pipeline instead of arq's separate status/result calls.
+    """
+    async with pool.pipeline(transaction=False) as pipe:
+        pipe.get(result_key_prefix + job_id)
+        pipe.exists(in_progress_key_prefix + job_id)
+        pipe.zscore(default_queue_name, job_id)
+        pipe.zscore(LOW_PRIORITY_QUEUE, job_id)
+        pipe.get(progress_key(job_id))
+        raw_result, in_progress, score, low_score, raw_progress = await asyncio.wait_for(
+            pipe.execute(), timeout=15.0
+        )
+
+    progress = json.loads(raw_progress) if raw_progress else None
+    result = None
+    error = None
+
+    if raw_result:
+        status = "complete"
+        try:
+            job_result = deserialize_result(raw_result)
+            if not job_result.success:
+                status = "failed"
+                error = str(job_result.result)
+                logger.error(f"❌ Job {job_id} failed: {error}")
+            elif isinstance(job_result.result, dict):
+                result = job_result.result
+            else:
+                result = {"data": job_result.result}
+        except Exception as e:
+            status = "failed"
+            error = str(e)
+            logger.error(f"❌ Job {job_id} result could not be read: {error}")
+    elif in_progress:
+        status = "in_progress"
+    elif score or low_score:
+        # Deferred and queued jobs are both reported as queued
+        status = "queued"
+    else:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JobStatusResponse(
+        jobId=job_id, status=status, result=result, error=error, progress=progress
+    )
+
+
+async def get_job_status_with_retry(
+    pool: ArqRedis, job_id: str, max_retries: int = 3, retry_delay: float = 1.0
+):
     """
     Get job status with exponential backoff retry logic
     """
     for attempt in range(max_retries):
         try:
-            redis_settings = get_redis_settings()
-
-            # Create pool with timeout
-            pool = await asyncio.wait_for(
-                create_pool(redis_settings), timeout=20.0  # 20 second timeout for pool creation
-            )
-
-            try:
-                # Use Job class directly with the pool
-                job = Job(job_id, pool)
-
-                # Get job status with timeout
-                job_status = await asyncio.wait_for(
-                    job.status(), timeout=15.0  # 15 second timeout for status check
-                )
-
-                # Map ARQ job status to our response
-                status_map = {
-                    JobStatus.deferred: "queued",
-                    JobStatus.queued: "queued",
-                    JobStatus.in_progress: "in_progress",
-                    JobStatus.complete: "complete",
-                    JobStatus.not_found: "not_found",
-                }
-
-                status = status_map.get(job_status, "unknown")
-
-                if job_status == JobStatus.not_found:
-                    await pool.close()
-                    raise HTTPException(status_code=404, detail="Job not found")
-
-                # Get job result if complete
-                result = None
-                error = None
-
-                if job_status == JobStatus.complete:
-                    try:
-                        job_result = await asyncio.wait_for(
-                            job.result(), timeout=10.0  # 10 second timeout for result
-                        )
-                        if isinstance(job_result, dict):
-                            result = job_result
-                        else:
-                            result = {"data": job_result}
-                    except asyncio.TimeoutError:
-                        logger.warning(f"⏰ Timeout getting result for job {job_id}")
-                        error = "Timeout retrieving job result"
-                        status = "failed"
-                    except Exception as e:
-                        error = str(e)
-                        status = "failed"
-                        logger.error(f"❌ Job {job_id} failed: {error}")
-
-                await pool.close()
-                return JobStatusResponse(jobId=job_id, status=status, result=result, error=error)
-
-            finally:
-                # Ensure pool is always closed
-                try:
-                    await pool.close()
-                except Exception as e:
-                    logger.debug(f"Pool close failed (non-critical): {e}")
-
+            return await fetch_job_status(pool, job_id)
+        except HTTPException:
+            raise
         except asyncio.TimeoutError:
             logger.warning(f"⏰ Timeout on attempt {attempt + 1}/{max_retries} for job {job_id}")
             if attempt == max_retries - 1:
@@ -106,23 +106,88 @@ async def get_job_status_with_retry(job_id: str, max_retries: int = 3, retry_del
                 logger.error(f"❌ All retries failed for job {job_id}: {str(e)}")
                 raise HTTPException(
                     status_code=500, detail="Failed to retrieve job status after retries"
-                )
+                ) from e
         # Exponential backoff
         if attempt < max_retries - 1:
             await asyncio.sleep(retry_delay * (2**attempt))
 
 
 @router.get("/status/{job_id}")
-async def get_job_status(job_id: str):
+async def get_job_status(job_id: str, pool: Optional[ArqRedis] = Depends(get_arq_pool)):
     """
     Get the status of a background job
     Used to check contract generation progress
     Includes retry logic for Redis connectivity issues
     """
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable - please try again")
+
     try:
-        return await get_job_status_with_retry(job_id)
+        return await get_job_status_with_retry(pool, job_id)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"❌ Unexpected error getting job status: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _sse(data: dict) -> str:
+    return f"data: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/events/{job_id}")
+async def stream_job_events(
+    job_id: str, request: Request, pool: Optional[ArqRedis] = Depends(get_arq_pool)
+):
+    """
+    Server-sent events for a background job
+    Sends the current status immediately, then pushes progress and the final
+    complete/failed transition as workers publish them. /jobs/status stays
+    available as a polling fallback.
+    """
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable - please try again")
+
+    # Subscribe before reading the snapshot so no transition falls in between
+    queue = job_event_hub.subscribe(pool, job_id)
+    try:
+        snapshot = await get_job_status_with_retry(pool, job_id)
+    except BaseException:
+        job_event_hub.unsubscribe(job_id, queue)
+        raise
+
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SSE_MAX_DURATION
+        last = snapshot.model_dump(exclude_none=True)
+        try:
+            yield f"retry: {SSE_RECHECK_INTERVAL * 1000}\n"
+            yield _sse(last)
+            while last["status"] not in TERMINAL_STATUSES and loop.time() < deadline:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_RECHECK_INTERVAL)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # Catch transitions without a published event (queued -> in_progress,
+                    # job timeouts, missed pub/sub messages) with one pipelined read
+                    try:
+                        event = (await fetch_job_status(pool, job_id)).model_dump(exclude_none=True)
+                    except Exception as e:
+                        logger.debug(f"Status re-check failed for job {job_id}: {e}")
+                        event = None
+                    if event is None or event == last:
+                        yield ": keep-alive\n\n"
+                        continue
+                if event == last:
+                    continue
+                last = event
+                yield _sse(event)
+        finally:
+            job_event_hub.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -4,13 +4,15 @@ import secrets
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user_with_plan
 from ..database import get_db
 from ..models import BusinessConfig, Client, Contract, Schedule, User
+from ..pagination import ListParams, filter_status, paginate, set_page_headers
+from ..utils.jsonb import jsonb_projection
 
 logger = logging.getLogger(__name__)
 
@@ -85,20 +87,65 @@ class ScheduleResponse(BaseModel):
         from_attributes = True
 
 
+SCHEDULE_SORT_FIELDS = {
+    "scheduled_date": Schedule.scheduled_date,
+    "created_at": Schedule.created_at,
+}
+
+
 @router.get("", response_model=list[ScheduleResponse])
 async def get_schedules(
-    current_user: User = Depends(get_current_user_with_plan), db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None, description="Filter by status (comma-separated)"),
+    client_id: Optional[int] = Query(None, description="Filter schedules by client ID"),
+    params: ListParams = Depends(),
+    current_user: User = Depends(get_current_user_with_plan),
+    db: Session = Depends(get_db),
 ):
-    """Get all schedules for the current user"""
-    schedules = (
-        db.query(Schedule)
-        .filter(Schedule.user_id == current_user.id)
-        .order_by(Schedule.scheduled_date.asc())
-        .all()
+    """
+    Get schedules for the current user, earliest first
+    Paginated with limit/cursor; the next cursor is returned in X-Next-Cursor
+    """
+    query = db.query(Schedule).filter(Schedule.user_id == current_user.id)
+    query = filter_status(query, Schedule.status, status)
+    if client_id:
+        query = query.filter(Schedule.client_id == client_id)
+
+    page = paginate(
+        query,
+        params,
+        model=Schedule,
+        sort_fields=SCHEDULE_SORT_FIELDS,
+        default_sort="scheduled_date",
     )
+    set_page_headers(request, response, page)
+    schedules = page.items
+
+    # Load the page's clients in one query instead of one per schedule. Only the
+    # property type keys of form_data are projected, not the whole document.
+    client_ids = {s.client_id for s in schedules}
+    clients_by_id = (
+        {
+            c.id: c
+            for c in db.query(
+                Client.id,
+                Client.business_name,
+                Client.property_type,
+                jsonb_projection(Client.form_data, ["propertyType", "property_type"]).label(
+                    "form_data"
+                ),
+            )
+            .filter(Client.id.in_(client_ids))
+            .all()
+        }
+        if client_ids
+        else {}
+    )
+
     result = []
     for s in schedules:
-        client = db.query(Client).filter(Client.id == s.client_id).first()
+        client = clients_by_id.get(s.client_id)
         # Get property type from client
         property_type = None
         if client:
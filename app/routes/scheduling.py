@@ -4,10 +4,13 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
-from ..database import get_db
+from ..database import get_async_db, get_db
+from ..db_replica import get_async_read_db, get_read_db
 from ..email_service import (
     send_pending_booking_notification,
     send_scheduling_accepted_email,
@@ -744,7 +747,7 @@ async def client_counter_proposal(
 
 
 @router.get("/proposals/public/{contract_id}")
-async def get_public_contract_proposals(contract_id: int, db: Session = Depends(get_db)):
+async def get_public_contract_proposals(contract_id: int, db: Session = Depends(get_read_db)):
     """Public endpoint for client to view proposals (no auth required)"""
     proposals = (
         db.query(SchedulingProposal)
@@ -774,7 +777,7 @@ async def get_public_contract_proposals(contract_id: int, db: Session = Depends(
 
 
 @router.get("/public/contract/{contract_public_id}")
-async def get_public_scheduling_info(contract_public_id: str, db: Session = Depends(get_db)):
+async def get_public_scheduling_info(contract_public_id: str, db: Session = Depends(get_read_db)):
     """
     Public endpoint for client to get scheduling info for a contract.
     Returns contract details, business info, and available time slots.
@@ -949,7 +952,7 @@ class DirectBookingRequest(BaseModel):
 async def get_public_busy_intervals(
     contract_public_id: str,
     date: str,  # YYYY-MM-DD
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Public endpoint to get provider busy intervals for a given date.
 
@@ -959,8 +962,10 @@ async def get_public_busy_intervals(
     """
 
     # Find contract by public_id (used only to resolve provider/user)
-    contract = db.query(Contract).filter(Contract.public_id == contract_public_id).first()
-    if not contract:
+    provider_id = (
+        await db.execute(select(Contract.user_id).where(Contract.public_id == contract_public_id))
+    ).scalar_one_or_none()
+    if provider_id is None:
         raise HTTPException(status_code=404, detail="Contract not found")
 
     try:
@@ -973,16 +978,20 @@ async def get_public_busy_intervals(
     # Get all schedules for that provider on that day.
     # We include any schedules that represent a blocked time on the calendar.
     schedules = (
-        db.query(Schedule)
-        .filter(
-            Schedule.user_id == contract.user_id,
-            Schedule.scheduled_date == day,
-            (
-                Schedule.status.in_(["scheduled", "in-progress", "pending", "confirmed"])
-                if hasattr(Schedule, "status")
-                else True
-            ),
+        (
+            await db.execute(
+                select(Schedule).where(
+                    Schedule.user_id == provider_id,
+                    Schedule.scheduled_date == day,
+                    (
+                        Schedule.status.in_(["scheduled", "in-progress", "pending", "confirmed"])
+                        if hasattr(Schedule, "status")
+                        else True
+                    ),
+                )
+            )
         )
+        .scalars()
         .all()
     )
 
@@ -1230,7 +1239,7 @@ async def create_direct_booking(data: DirectBookingRequest, db: Session = Depend
 
 @router.get("/busy-slots/{client_id}")
 async def get_busy_slots_by_client(
-    client_id: int, date: str, db: Session = Depends(get_db)  # YYYY-MM-DD
+    client_id: int, date: str, db: AsyncSession = Depends(get_async_db)  # YYYY-MM-DD
 ):
     """
     Public endpoint to get provider's busy time slots for a given date.
@@ -1239,8 +1248,10 @@ async def get_busy_slots_by_client(
     Returns list of busy intervals with start and end times.
     """
     # Get client to find the provider
-    client = db.query(Client).filter(Client.id == client_id).first()
-    if not client:
+    provider_id = (
+        await db.execute(select(Client.user_id).where(Client.id == client_id))
+    ).scalar_one_or_none()
+    if provider_id is None:
         raise HTTPException(status_code=404, detail="Client not found")
 
     try:
@@ -1253,12 +1264,16 @@ async def get_busy_slots_by_client(
     # Get all schedules for that provider on that day
     # Include scheduled, in-progress, and pending appointments
     schedules = (
-        db.query(Schedule)
-        .filter(
-            Schedule.user_id == client.user_id,
-            Schedule.scheduled_date == day,
-            Schedule.status.in_(["scheduled", "in-progress", "pending", "confirmed"]),
+        (
+            await db.execute(
+                select(Schedule).where(
+                    Schedule.user_id == provider_id,
+                    Schedule.scheduled_date == day,
+                    Schedule.status.in_(["scheduled", "in-progress", "pending", "confirmed"]),
+                )
+            )
         )
+        .scalars()
         .all()
     )
 
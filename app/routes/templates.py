@@ -3,11 +3,14 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user_with_plan
-from ..cache import cache
+from ..cache import business_config_tag, cache, user_tag
 from ..database import get_db
+from ..db_replica import get_async_read_db
 from ..models import BusinessConfig, FormTemplate, User, UserTemplateCustomization
 
 logger = logging.getLogger(__name__)
@@ -179,7 +182,12 @@ async def get_templates(
         )
 
     # Cache the result for 5 minutes (convert to dict for JSON serialization)
-    cache.set(cache_key, [t.model_dump() for t in templates], ttl=300)
+    cache.set(
+        cache_key,
+        [t.model_dump() for t in templates],
+        ttl=300,
+        tags=(user_tag(current_user.id), business_config_tag(current_user.id)),
+    )
 
     logger.info(
         f"✅ Returning {len(templates)} total templates to user {current_user.email} (cached)"
@@ -665,7 +673,9 @@ async def get_template_by_domain(template_id: str, request: Request, db: Session
 
 # Public endpoints for client forms
 @router.get("/public/{owner_uid}", response_model=list[FormTemplateSchema])
-async def get_public_templates(owner_uid: str, request: Request, db: Session = Depends(get_db)):
+async def get_public_templates(
+    owner_uid: str, request: Request, db: AsyncSession = Depends(get_async_read_db)
+):
     """Get all templates for a business (public access for embed/template selection) - filtered by active templates"""
     logger.info(f"🔍 Fetching public templates for owner_uid: {owner_uid}")
 
@@ -681,7 +691,9 @@ async def get_public_templates(owner_uid: str, request: Request, db: Session = D
             )
 
     # Find the user by firebase_uid
-    user = db.query(User).filter(User.firebase_uid == owner_uid).first()
+    user = (
+        await db.execute(select(User).where(User.firebase_uid == owner_uid))
+    ).scalar_one_or_none()
     if not user:
         logger.error(f"❌ User not found for owner_uid: {owner_uid}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -689,7 +701,9 @@ async def get_public_templates(owner_uid: str, request: Request, db: Session = D
     logger.info(f"✅ Found user: {user.email} (id: {user.id})")
 
     # Get user's business config to check active templates
-    business_config = db.query(BusinessConfig).filter(BusinessConfig.user_id == user.id).first()
+    business_config = (
+        await db.execute(select(BusinessConfig).where(BusinessConfig.user_id == user.id))
+    ).scalar_one_or_none()
 
     # Get active template IDs
     active_template_ids = None
@@ -701,17 +715,17 @@ async def get_public_templates(owner_uid: str, request: Request, db: Session = D
     # If no active templates configured, return all templates (backward compatibility)
 
     # Get system templates (pre-built)
-    system_templates_query = db.query(FormTemplate).filter(
+    system_templates_query = select(FormTemplate).where(
         FormTemplate.is_system_template, FormTemplate.is_active
     )
 
     # Filter by active templates if configured
     if active_template_ids:
-        system_templates_query = system_templates_query.filter(
+        system_templates_query = system_templates_query.where(
             FormTemplate.template_id.in_(active_template_ids)
         )
 
-    system_templates = system_templates_query.all()
+    system_templates = (await db.execute(system_templates_query)).scalars().all()
     logger.info(f"📋 Found {len(system_templates)} system templates")
 
     # Log image URLs for debugging
@@ -720,17 +734,27 @@ async def get_public_templates(owner_uid: str, request: Request, db: Session = D
 
     # Get user's custom templates (always include these)
     user_templates = (
-        db.query(FormTemplate).filter(FormTemplate.user_id == user.id, FormTemplate.is_active).all()
+        (
+            await db.execute(
+                select(FormTemplate).where(FormTemplate.user_id == user.id, FormTemplate.is_active)
+            )
+        )
+        .scalars()
+        .all()
     )
     logger.info(f"📋 Found {len(user_templates)} user custom templates")
 
     # Get user's customizations
     customizations = (
-        db.query(UserTemplateCustomization)
-        .filter(
-            UserTemplateCustomization.user_id == user.id,
-            UserTemplateCustomization.is_active,
+        (
+            await db.execute(
+                select(UserTemplateCustomization).where(
+                    UserTemplateCustomization.user_id == user.id,
+                    UserTemplateCustomization.is_active,
+                )
+            )
         )
+        .scalars()
         .all()
     )
 
@@ -778,7 +802,10 @@ async def get_public_templates(owner_uid: str, request: Request, db: Session = D
 
 @router.get("/public/{owner_uid}/{template_id}", response_model=FormTemplateSchema)
 async def get_public_template(
-    owner_uid: str, template_id: str, request: Request, db: Session = Depends(get_db)
+    owner_uid: str,
+    template_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Get a template for public client form access"""
     # If this is a custom domain request, validate that the domain belongs to the requested user
@@ -793,30 +820,40 @@ async def get_public_template(
             )
 
     # Find the user by firebase_uid
-    user = db.query(User).filter(User.firebase_uid == owner_uid).first()
-    if not user:
+    user_id = (
+        await db.execute(select(User.id).where(User.firebase_uid == owner_uid))
+    ).scalar_one_or_none()
+    if user_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     # First check if it's a system template
     template = (
-        db.query(FormTemplate)
-        .filter(
-            FormTemplate.template_id == template_id,
-            FormTemplate.is_system_template,
-            FormTemplate.is_active,
+        (
+            await db.execute(
+                select(FormTemplate).where(
+                    FormTemplate.template_id == template_id,
+                    FormTemplate.is_system_template,
+                    FormTemplate.is_active,
+                )
+            )
         )
+        .scalars()
         .first()
     )
 
     if not template:
         # Check if it's a user's custom template
         template = (
-            db.query(FormTemplate)
-            .filter(
-                FormTemplate.template_id == template_id,
-                FormTemplate.user_id == user.id,
-                FormTemplate.is_active,
+            (
+                await db.execute(
+                    select(FormTemplate).where(
+                        FormTemplate.template_id == template_id,
+                        FormTemplate.user_id == user_id,
+                        FormTemplate.is_active,
+                    )
+                )
             )
+            .scalars()
             .first()
         )
 
@@ -828,12 +865,16 @@ async def get_public_template(
     # Check if user has customizations for this system template
     if template.is_system_template:
         customization = (
-            db.query(UserTemplateCustomization)
-            .filter(
-                UserTemplateCustomization.user_id == user.id,
-                UserTemplateCustomization.template_id == template.id,
-                UserTemplateCustomization.is_active,
+            (
+                await db.execute(
+                    select(UserTemplateCustomization).where(
+                        UserTemplateCustomization.user_id == user_id,
+                        UserTemplateCustomization.template_id == template.id,
+                        UserTemplateCustomization.is_active,
+                    )
+                )
             )
+            .scalars()
             .first()
         )
 
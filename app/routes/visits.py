@@ -5,7 +5,17 @@ Visit Management Routes
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    UploadFile,
+    File,
+    Form,
+    Query,
+    Request,
+    Response,
+)
 from pydantic import BaseModel, Field, validator
 from sqlalchemy.orm import Session
 
@@ -13,6 +23,7 @@ from ..auth import get_current_user
 from ..database import get_db
 from ..models import Contract, User
 from ..models_visit import Visit
+from ..pagination import ListParams, filter_status, paginate, set_page_headers
 from ..services.visit_service import VisitService
 
 router = APIRouter(prefix="/visits", tags=["visits"])
@@ -404,18 +415,31 @@ async def delete_visit_photo(
     return {"message": "Photo deleted successfully", "remaining_count": visit.photo_count}
 
 
+VISIT_SORT_FIELDS = {
+    "scheduled_date": Visit.scheduled_date,
+    "created_at": Visit.created_at,
+    "visit_number": Visit.visit_number,
+}
+
+
 @router.get("/all", response_model=List[VisitResponse])
 async def get_all_visits_filtered(
+    request: Request,
+    response: Response,
     client_id: Optional[int] = None,
     contract_id: Optional[int] = None,
-    status: Optional[str] = None,
+    status: Optional[str] = Query(None, description="Filter by status (comma-separated)"),
     month: Optional[int] = None,
     year: Optional[int] = None,
     week: Optional[int] = None,
+    params: ListParams = Depends(),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Get all visits with filters for the dedicated Visits Management page"""
+    """
+    Get visits with filters for the dedicated Visits Management page
+    Paginated with limit/cursor; the next cursor is returned in X-Next-Cursor
+    """
     from sqlalchemy import and_, extract
 
     query = db.query(Visit).filter(Visit.user_id == current_user.id)
@@ -427,8 +451,7 @@ async def get_all_visits_filtered(
     if contract_id:
         query = query.filter(Visit.contract_id == contract_id)
 
-    if status:
-        query = query.filter(Visit.status == status)
+    query = filter_status(query, Visit.status, status)
 
     # Time-based filters
     if year and month:
@@ -449,10 +472,13 @@ async def get_all_visits_filtered(
             )
         )
 
-    # Order by scheduled date
-    visits = query.order_by(Visit.scheduled_date.desc()).all()
+    # Most recent scheduled date first unless another sort is requested
+    page = paginate(
+        query, params, model=Visit, sort_fields=VISIT_SORT_FIELDS, default_sort="-scheduled_date"
+    )
+    set_page_headers(request, response, page)
 
-    return [VisitResponse.from_orm(v) for v in visits]
+    return [VisitResponse.from_orm(v) for v in page.items]
 
 
 @router.get("/grouped-by-contract")
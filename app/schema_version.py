@@ -0,0 +1,148 @@
+"""
+Schema version
+The database records the schema it is at in a one-row schema_version table, written by
+run_migration.py --create-all / --stamp. At startup each worker reads that row and compares it with the
+version of the schema the models describe, instead of reflecting every table with
+create_all - DDL only happens in the explicit migrate step.
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from .database import Base
+
+logger = logging.getLogger(__name__)
+
+# Development convenience: run the create_all migrate step at startup when the recorded
+# version differs. Keep it off in production - migrations are a deploy step there
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "false").lower() == "true"
+
+CREATE_VERSION_TABLE_SQL = text(
+    "CREATE TABLE IF NOT EXISTS schema_version ("
+    "id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1), "
+    "version VARCHAR(64) NOT NULL, "
+    "migration VARCHAR(255), "
+    "applied_at TIMESTAMP NOT NULL DEFAULT now())"
+)
+STAMP_VERSION_SQL = text(
+    "INSERT INTO schema_version (id, version, migration, applied_at) "
+    "VALUES (1, :version, :migration, now()) "
+    "ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version, "
+    "migration = EXCLUDED.migration, applied_at = EXCLUDED.applied_at"
+)
+READ_VERSION_SQL = text("SELECT version, migration, applied_at FROM schema_version WHERE id = 1")
+# Serializes migrate steps started at the same time (e.g. by several deploy hooks)
+MIGRATE_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('schema_version'))")
+
+
+def _load_models() -> None:
+    """Register every model module with Base.metadata"""
+    from . import (  # noqa: F401
+        models,
+        models_google_calendar,
+        models_invoice,
+        models_quickbooks,
+        models_square,
+        models_twilio,
+        models_visit,
+    )
+
+
+def _type_name(column) -> str:
+    try:
+        return str(column.type)
+    except Exception:
+        return type(column.type).__name__
+
+
+@lru_cache(maxsize=1)
+def expected_schema_version() -> str:
+    """Fingerprint of the tables, columns and indexes the models define"""
+    _load_models()
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"table {table.name}")
+        parts.extend(
+            f"  {column.name} {_type_name(column)} "
+            f"{'pk' if column.primary_key else ''} {'null' if column.nullable else 'not null'}"
+            for column in table.columns
+        )
+        parts.extend(
+            f"  index {index.name}" for index in sorted(table.indexes, key=lambda i: i.name or "")
+        )
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def stamp_schema_version(conn, migration: Optional[str] = None) -> str:
+    """Record the models' schema version in the caller's transaction"""
+    version = expected_schema_version()
+    conn.execute(CREATE_VERSION_TABLE_SQL)
+    conn.execute(STAMP_VERSION_SQL, {"version": version, "migration": migration})
+    return version
+
+
+def create_schema(conn) -> str:
+    """Create missing tables and indexes (create_all) and stamp the version"""
+    _load_models()
+    conn.execute(MIGRATE_LOCK_SQL)
+    Base.metadata.create_all(bind=conn, checkfirst=True)
+    return stamp_schema_version(conn, "create_all")
+
+
+def current_schema_version(engine) -> Optional[dict]:
+    """The recorded schema_version row, or None if nothing was ever stamped"""
+    with engine.connect() as conn:
+        try:
+            row = conn.execute(READ_VERSION_SQL).first()
+        except ProgrammingError:
+            return None  # Table doesn't exist yet
+    return dict(row._mapping) if row else None
+
+
+def check_schema_version(engine) -> bool:
+    """
+    Compare the database's schema version with the models' (one indexed row).
+    Logs how to migrate when they differ; with DB_AUTO_MIGRATE it runs create_all instead.
+    """
+    expected = expected_schema_version()
+    try:
+        recorded = current_schema_version(engine)
+    except Exception as e:
+        logger.error(f"❌ Could not read schema version: {e}")
+        return False
+
+    if recorded and recorded["version"] == expected:
+        logger.info(f"✅ Database schema is at version {expected}")
+        return True
+
+    if DB_AUTO_MIGRATE:
+        try:
+            with engine.begin() as conn:
+                create_schema(conn)
+            logger.info(f"✅ DB_AUTO_MIGRATE: schema created/updated to version {expected}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ DB_AUTO_MIGRATE failed: {e}")
+            return False
+
+    if recorded is None:
+        logger.warning(
+            "⚠️ Database has no schema_version row - run "
+            "`python run_migration.py --create-all` (new database) or "
+            "`python run_migration.py --stamp` (schema already up to date)"
+        )
+    else:
+        logger.warning(
+            f"⚠️ Database schema version {recorded['version']} "
+            f"(last migration: {recorded['migration']}, {recorded['applied_at']}) "
+            f"differs from the models' version {expected} - apply the pending migrations "
+            f"with `python run_migration.py <migration_file.sql>`, then "
+            f"`python run_migration.py --stamp`"
+        )
+    return False
@@ -6,12 +6,19 @@ import logging
 from typing import Callable
 
 from fastapi import Request, Response
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.orm import Session
 from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
+# Session.info key holding the user id applied to each of the session's transactions
+RLS_USER_ID_KEY = "rls_user_id"
+# Session.info key holding the transaction that has already checked out its connection
+RLS_CONNECTED_TRANSACTION_KEY = "rls_connected_transaction"
+# Transaction-local (SET LOCAL) - the setting can't leak to the next user of a pooled connection
+SET_RLS_USER_SQL = text("SELECT set_config('app.current_user_id', :user_id, true)")
+
 
 class RLSMiddleware(BaseHTTPMiddleware):
     """
@@ -66,16 +73,32 @@ def set_rls_context(db: Session, user_id: int) -> None:
             set_rls_context(db, current_user.id)
             clients = db.query(Client).all()  # Automatically filtered by user_id
             return clients
+
+    The setting is transaction-local and is applied as each of the session's transactions
+    begins on its connection (right before its first statement), so no round trip is
+    spent here unless a transaction is already running.
     """
-    try:
-        db.execute(
-            text("SELECT set_config('app.current_user_id', :user_id, false)"),
-            {"user_id": str(user_id)},
-        )
-        logger.debug(f"RLS context set for user_id={user_id}")
-    except Exception as e:
-        logger.error(f"Failed to set RLS context for user_id={user_id}: {e}")
-        raise
+    db.info[RLS_USER_ID_KEY] = str(user_id)
+    if _connection_begun(db):
+        try:
+            db.execute(SET_RLS_USER_SQL, {"user_id": str(user_id)})
+        except Exception as e:
+            logger.error(f"Failed to set RLS context for user_id={user_id}: {e}")
+            raise
+    logger.debug(f"RLS context set for user_id={user_id}")
+
+
+def _connection_begun(db: Session) -> bool:
+    transaction = db.get_transaction()
+    return transaction is not None and db.info.get(RLS_CONNECTED_TRANSACTION_KEY) is transaction
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_rls_context(session, transaction, connection):
+    session.info[RLS_CONNECTED_TRANSACTION_KEY] = transaction
+    user_id = session.info.get(RLS_USER_ID_KEY)
+    if user_id is not None:
+        connection.execute(SET_RLS_USER_SQL, {"user_id": user_id})
 
 
 def clear_rls_context(db: Session) -> None:
@@ -85,8 +108,10 @@ def clear_rls_context(db: Session) -> None:
     Args:
         db: SQLAlchemy database session
     """
+    db.info.pop(RLS_USER_ID_KEY, None)
     try:
-        db.execute(text("SELECT set_config('app.current_user_id', '', false)"))
+        if _connection_begun(db):
+            db.execute(SET_RLS_USER_SQL, {"user_id": ""})
         logger.debug("RLS context cleared")
     except Exception as e:
         logger.error(f"Failed to clear RLS context: {e}")
@@ -0,0 +1,212 @@
+"""
+Branding Asset Cache
+Keeps logos and signatures from R2 as ready-made data URLs for contract HTML.
+Entries are keyed by R2 key + ETag, held in an in-process LRU with a byte budget
+and backed by a local disk tier shared by workers on the same host. The disk tier
+keeps one file per key (superseded ETags are deleted) and is pruned oldest-first
+once it grows past its own byte budget.
+"""
+
+import asyncio
+import base64
+import hashlib
+import logging
+import mimetypes
+import os
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from ..config import R2_BUCKET_NAME
+
+logger = logging.getLogger(__name__)
+
+ASSET_CACHE_MAX_BYTES = int(os.getenv("ASSET_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 32MB
+ASSET_CACHE_DISK_MAX_BYTES = int(
+    os.getenv("ASSET_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))
+)  # 256MB
+ASSET_CACHE_DIR = os.getenv(
+    "ASSET_CACHE_DIR", os.path.join(tempfile.gettempdir(), "cleanenroll-asset-cache")
+)
+
+
+class AssetCache:
+    """LRU of data URLs (memory) in front of a directory of data URL files (disk)"""
+
+    def __init__(
+        self,
+        max_bytes: int = ASSET_CACHE_MAX_BYTES,
+        cache_dir: str = ASSET_CACHE_DIR,
+        disk_max_bytes: int = ASSET_CACHE_DISK_MAX_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def _entry_id(key: str, etag: str) -> str:
+        return hashlib.sha256(f"{key}\0{etag}".encode()).hexdigest()
+
+    @staticmethod
+    def _key_id(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+    def _disk_path(self, key: str, entry_id: str) -> str:
+        # "<key hash>.<entry hash>" so every file for a key shares a prefix
+        return os.path.join(self.cache_dir, f"{self._key_id(key)}.{entry_id[:32]}.dataurl")
+
+    def get(self, key: str, etag: str) -> Optional[str]:
+        """Look up a data URL - memory first, then disk (promoted to memory on hit)"""
+        entry_id = self._entry_id(key, etag)
+        with self._lock:
+            data_url = self._entries.get(entry_id)
+            if data_url is not None:
+                self._entries.move_to_end(entry_id)
+                return data_url
+
+        path = self._disk_path(key, entry_id)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data_url = f.read()
+        except OSError:
+            return None
+
+        try:
+            os.utime(path)  # Disk pruning evicts by mtime - mark as recently used
+        except OSError:
+            pass
+
+        self._remember(entry_id, data_url)
+        return data_url
+
+    def put(self, key: str, etag: str, data_url: str):
+        """Store a data URL in memory and on disk"""
+        entry_id = self._entry_id(key, etag)
+        self._remember(entry_id, data_url)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._disk_path(key, entry_id)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data_url)
+            os.replace(tmp_path, path)  # Atomic so concurrent readers never see partial files
+        except OSError as e:
+            logger.warning(f"⚠️ Asset cache disk write failed for {key}: {e}")
+            return
+
+        self._prune_disk(keep=path, key_prefix=f"{self._key_id(key)}.")
+
+    def _prune_disk(self, keep: str, key_prefix: str):
+        """Delete files for superseded ETags of the same key, then the oldest files over budget"""
+        files = []
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".dataurl"):
+                        continue
+                    if entry.name.startswith(key_prefix) and entry.path != keep:
+                        _remove_quietly(entry.path)
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError as e:
+            logger.debug(f"Asset cache disk scan failed: {e}")
+            return
+
+        if total <= self.disk_max_bytes:
+            return
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.disk_max_bytes:
+                break
+            if path == keep:
+                continue
+            _remove_quietly(path)
+            total -= size
+
+    def _remember(self, entry_id: str, data_url: str):
+        size = len(data_url)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(entry_id, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[entry_id] = data_url
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def fetch_data_url(self, key: str, r2=None) -> Optional[str]:
+        """
+        Return the R2 object at `key` as a data URL.
+        Costs one HEAD request on a cache hit; the body is only downloaded when the ETag changed.
+        """
+        if r2 is None:
+            from ..routes.upload import get_r2_client
+
+            r2 = get_r2_client()
+
+        head = r2.head_object(Bucket=R2_BUCKET_NAME, Key=key)
+        etag = head.get("ETag", "").strip('"')
+
+        data_url = self.get(key, etag)
+        if data_url is not None:
+            logger.debug(f"✅ Asset cache HIT: {key}")
+            return data_url
+
+        logger.info(f"📥 Asset cache MISS, downloading from R2: {key}")
+        obj = r2.get_object(Bucket=R2_BUCKET_NAME, Key=key)
+        body = obj["Body"].read()
+        if not body:
+            logger.warning(f"⚠️ R2 asset has 0 bytes: {key}")
+            return None
+
+        content_type = _content_type(key, obj.get("ContentType"))
+        data_url = f"data:{content_type};base64,{base64.b64encode(body).decode('utf-8')}"
+        self.put(key, etag or obj.get("ETag", "").strip('"'), data_url)
+        return data_url
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _content_type(key: str, stored: Optional[str]) -> str:
+    if stored and stored.startswith("image/"):
+        # Handle content types that might have charset
+        return stored.split(";")[0].strip()
+    if key.lower().endswith(".svg"):
+        return "image/svg+xml"
+    return mimetypes.guess_type(key)[0] or "image/png"
+
+
+# Global asset cache instance
+asset_cache = AssetCache()
+
+
+async def get_asset_data_url(key: str) -> Optional[str]:
+    """Get an R2 image as a data URL through the asset cache (None on failure)"""
+    if not key:
+        return None
+    try:
+        return await asyncio.to_thread(asset_cache.fetch_data_url, key)
+    except Exception as e:
+        logger.error(f"❌ Failed to load asset {key}: {type(e).__name__}: {e}")
+        return None
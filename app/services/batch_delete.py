@@ -0,0 +1,191 @@
+"""
+Batch Delete
+Set-based deletion of clients (including quote requests) and contracts. Each batch is
+one ownership-checked DELETE per table inside a single transaction, instead of loading
+and deleting every row through the ORM with a commit per client.
+"""
+
+import logging
+
+from sqlalchemy import ARRAY, Integer, any_, bindparam, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..models import (
+    Client,
+    Contract,
+    QuoteHistory,
+    Schedule,
+    SchedulingProposal,
+    ScopeEmailReminder,
+    ScopeProposal,
+    ScopeProposalAuditLog,
+    User,
+)
+from ..models_invoice import Invoice
+from ..models_visit import Visit
+
+logger = logging.getLogger(__name__)
+
+# Rows are removed with Core-style DELETEs - nothing in the session needs syncing
+BULK_OPTIONS = {"synchronize_session": False}
+
+
+def _ids(ids: list[int]):
+    """One array parameter (= ANY(:ids)) instead of an IN list with a parameter per id"""
+    return any_(bindparam(None, ids, type_=ARRAY(Integer)))
+
+
+def _in(column, ids):
+    """column = ANY(:ids) for a list of ids, column IN (...) for a subquery"""
+    return column == _ids(ids) if isinstance(ids, list) else column.in_(ids)
+
+
+def _results(requested: list[int], deleted: set[int]) -> list[dict]:
+    return [
+        {"id": item_id, "status": "deleted" if item_id in deleted else "not_found"}
+        for item_id in requested
+    ]
+
+
+def _delete_contract_dependents(db: Session, contract_ids, client_ids=None) -> None:
+    """
+    Delete rows referencing the given contracts (and clients, if given), children first.
+    contract_ids may be a list or a subquery of contract ids.
+    """
+
+    def owned(model):
+        condition = _in(model.contract_id, contract_ids)
+        if client_ids is not None:
+            condition = or_(model.client_id == _ids(client_ids), condition)
+        return condition
+
+    # Visits reference invoices, so they go first
+    db.execute(delete(Visit).where(owned(Visit)), execution_options=BULK_OPTIONS)
+    db.execute(delete(Invoice).where(owned(Invoice)), execution_options=BULK_OPTIONS)
+    db.execute(
+        delete(SchedulingProposal).where(owned(SchedulingProposal)),
+        execution_options=BULK_OPTIONS,
+    )
+
+    if client_ids is None:
+        # Proposals outlive a deleted contract (contract_id is optional)
+        db.execute(
+            update(ScopeProposal)
+            .where(_in(ScopeProposal.contract_id, contract_ids))
+            .values(contract_id=None),
+            execution_options=BULK_OPTIONS,
+        )
+        return
+
+    proposal_ids = select(ScopeProposal.id).where(owned(ScopeProposal)).scalar_subquery()
+    for model in (ScopeEmailReminder, ScopeProposalAuditLog):
+        db.execute(
+            delete(model).where(model.proposal_id.in_(proposal_ids)),
+            execution_options=BULK_OPTIONS,
+        )
+    db.execute(delete(ScopeProposal).where(owned(ScopeProposal)), execution_options=BULK_OPTIONS)
+
+
+def delete_clients(db: Session, user: User, client_ids: list[int]) -> dict:
+    """
+    Delete the user's clients among client_ids with everything attached to them.
+    Ids that don't exist or belong to another user are reported as not_found.
+    The monthly client counter is decremented once for all deleted clients that had
+    signed a contract.
+    """
+    from ..plan_limits import check_and_reset_monthly_counter, decrement_client_count
+    from .dashboard_summary import invalidate_dashboard_summary
+
+    requested = list(dict.fromkeys(client_ids))
+    # May commit a counter reset - done before any row is touched
+    check_and_reset_monthly_counter(user, db)
+
+    try:
+        signed = (
+            select(Contract.id)
+            .where(
+                Contract.client_id == Client.id,
+                or_(
+                    func.coalesce(Contract.client_signature, "") != "",
+                    Contract.client_signature_timestamp.isnot(None),
+                ),
+            )
+            .exists()
+        )
+        owned = db.execute(
+            select(Client.id, signed).where(Client.id == _ids(requested), Client.user_id == user.id)
+        ).all()
+        owned_ids = [row[0] for row in owned]
+        signed_count = sum(1 for row in owned if row[1])
+
+        deleted = set()
+        if owned_ids:
+            contract_ids = (
+                select(Contract.id).where(Contract.client_id == _ids(owned_ids)).scalar_subquery()
+            )
+            _delete_contract_dependents(db, contract_ids, client_ids=owned_ids)
+            for model in (Schedule, QuoteHistory, Contract):
+                db.execute(
+                    delete(model).where(model.client_id == _ids(owned_ids)),
+                    execution_options=BULK_OPTIONS,
+                )
+            deleted = set(
+                db.execute(
+                    delete(Client)
+                    .where(Client.id == _ids(owned_ids), Client.user_id == user.id)
+                    .returning(Client.id),
+                    execution_options=BULK_OPTIONS,
+                ).scalars()
+            )
+            decrement_client_count(user, db, count=signed_count, commit=False)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if deleted:
+        invalidate_dashboard_summary(user.id)
+    logger.info(
+        f"✅ User {user.id} deleted {len(deleted)}/{len(requested)} clients "
+        f"({signed_count} signed)"
+    )
+    return {"deletedCount": len(deleted), "results": _results(requested, deleted)}
+
+
+def delete_contracts(db: Session, user_id: int, contract_ids: list[int]) -> dict:
+    """Delete the user's contracts among contract_ids with their visits and invoices"""
+    from .dashboard_summary import invalidate_dashboard_summary
+
+    requested = list(dict.fromkeys(contract_ids))
+    try:
+        owned_ids = (
+            db.execute(
+                select(Contract.id).where(
+                    Contract.id == _ids(requested), Contract.user_id == user_id
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+        deleted = set()
+        if owned_ids:
+            _delete_contract_dependents(db, owned_ids)
+            deleted = set(
+                db.execute(
+                    delete(Contract)
+                    .where(Contract.id == _ids(owned_ids), Contract.user_id == user_id)
+                    .returning(Contract.id),
+                    execution_options=BULK_OPTIONS,
+                ).scalars()
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if deleted:
+        invalidate_dashboard_summary(user_id)
+    logger.info(f"✅ User {user_id} deleted {len(deleted)}/{len(requested)} contracts")
+    return {"deletedCount": len(deleted), "results": _results(requested, deleted)}
@@ -0,0 +1,100 @@
+"""
+Client Search
+Ranked, trigram-indexed search over a tenant's clients (business name, contact name,
+email) for the dashboard search box and typeahead. Queries run under a statement
+timeout so a slow search returns nothing instead of tying up a connection.
+"""
+
+import logging
+import os
+import re
+
+from sqlalchemy import Select, case, func, literal, or_, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Client
+
+logger = logging.getLogger(__name__)
+
+# Hard latency budget per search query
+CLIENT_SEARCH_TIMEOUT_MS = int(os.getenv("CLIENT_SEARCH_TIMEOUT_MS", "250"))
+CLIENT_SEARCH_MAX_RESULTS = 50
+# Shorter terms have no trigrams, so only word prefixes are matched
+MIN_TRIGRAM_LENGTH = 3
+
+QUERY_CANCELED_SQLSTATE = "57014"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_term(q: str) -> str:
+    """Lower-case and collapse whitespace to match the generated search_text column"""
+    return _WHITESPACE_RE.sub(" ", q).strip().lower()[:100]
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_search_query(user_id: int, term: str, limit: int) -> Select:
+    """
+    Rank clients matching `term`.
+    Matches are substrings of search_text or fuzzy word matches (pg_trgm word similarity),
+    both served by the trigram GIN index. Names/emails starting with the term rank first,
+    then by word similarity, then newest first.
+    """
+    document = Client.search_text
+    escaped = escape_like(term)
+    starts_with = or_(
+        func.lower(Client.business_name).like(f"{escaped}%"),
+        func.lower(Client.contact_name).like(f"{escaped}%"),
+        func.lower(Client.email).like(f"{escaped}%"),
+    )
+
+    if len(term) >= MIN_TRIGRAM_LENGTH:
+        match = or_(document.like(f"%{escaped}%"), document.op("%>")(term))
+        similarity = func.word_similarity(term, document)
+    else:
+        match = or_(document.like(f"{escaped}%"), document.like(f"% {escaped}%"))
+        similarity = literal(0.0)
+
+    score = (case((starts_with, 1.0), else_=0.0) + similarity).label("score")
+
+    return (
+        select(
+            Client.id,
+            Client.public_id,
+            Client.business_name,
+            Client.contact_name,
+            Client.email,
+            Client.status,
+            score,
+        )
+        .where(Client.user_id == user_id, Client.status != "pending_signature", match)
+        .order_by(score.desc(), Client.created_at.desc(), Client.id.desc())
+        .limit(limit)
+    )
+
+
+async def search_clients(
+    db: AsyncSession, user_id: int, q: str, limit: int = 10
+) -> tuple[list, bool]:
+    """Return (rows, timed_out) - an empty result with timed_out=True past the budget"""
+    term = normalize_term(q)
+    if not term:
+        return [], False
+
+    try:
+        # SET LOCAL ends with the request's transaction
+        await db.execute(text(f"SET LOCAL statement_timeout = {int(CLIENT_SEARCH_TIMEOUT_MS)}"))
+        rows = (await db.execute(build_search_query(user_id, term, limit))).all()
+        return rows, False
+    except DBAPIError as e:
+        if getattr(e.orig, "sqlstate", None) != QUERY_CANCELED_SQLSTATE:
+            raise
+        await db.rollback()
+        logger.warning(
+            f"⏱️ Client search exceeded {CLIENT_SEARCH_TIMEOUT_MS}ms for user {user_id} "
+            f"(term length {len(term)})"
+        )
+        return [], True
@@ -0,0 +1,260 @@
+"""
+Bulk Contract PDF Re-render
+Regenerates a business's contract PDFs after branding, terms or pricing changes.
+Runs on the low-priority ARQ queue with bounded concurrency, a resumable checkpoint
+and progress reported through /jobs/status/{job_id}
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from ..models import BusinessConfig, Client, Contract
+from .job_events import PROGRESS_TTL, publish_job_event
+from .pdf_renderer import PDF_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+LOW_PRIORITY_QUEUE = "arq:queue:low"
+
+# Concurrent renders per job - defaults to the browser pool size so a bulk job never
+# queues more pages than the pool has open
+RERENDER_CONCURRENCY = int(os.getenv("CONTRACT_RERENDER_CONCURRENCY", str(PDF_POOL_SIZE)))
+RERENDER_BATCH_SIZE = int(os.getenv("CONTRACT_RERENDER_BATCH_SIZE", "20"))
+
+# Unsigned drafts are always safe to regenerate; signed/active contracts are executed
+# documents, so they are only re-rendered when the provider explicitly asks for it
+UNSIGNED_STATUSES = ["new"]
+SIGNED_STATUSES = ["signed", "active"]
+
+# Provider terms printed in the MSA, recorded in Contract.terms_snapshot with the quote
+CONTRACT_TERM_FIELDS = [
+    "payment_due_days",
+    "late_fee_percent",
+    "cancellation_window",
+    "premium_evening_weekend",
+    "accepted_payment_methods",
+]
+
+
+def _checkpoint_key(user_id: int, job_id: str) -> str:
+    # Per run: ARQ retries of a job share its id, a new job always starts from the beginning
+    return f"contract_rerender:{user_id}:{job_id}:checkpoint"
+
+
+def _lock_key(user_id: int) -> str:
+    return f"contract_rerender:{user_id}:lock"
+
+
+def build_contract_quote(config: BusinessConfig, client: Client) -> dict:
+    """Quote for an existing contract, honouring a provider-adjusted price"""
+    from ..routes.contracts_pdf import calculate_quote
+
+    quote = calculate_quote(config, client.form_data or {})
+
+    if client.adjusted_quote_amount is not None:
+        quote["final_price"] = float(client.adjusted_quote_amount)
+        quote["base_price"] = float(client.adjusted_quote_amount)
+        quote["discount_amount"] = 0.0
+        quote["discount_percent"] = 0.0
+        quote["first_cleaning_discount_amount"] = 0.0
+        quote["addon_amount"] = 0.0
+        quote["addon_details"] = []
+
+    return quote
+
+
+def snapshot_contract_terms(
+    contract: Contract, config: BusinessConfig, form_data: dict, quote: dict
+) -> None:
+    """Record the quote, form data and provider terms a contract's PDF shows (no commit)"""
+    contract.terms_snapshot = {
+        "quote": quote,
+        "form_data": form_data,
+        "terms": {field: getattr(config, field) for field in CONTRACT_TERM_FIELDS},
+    }
+
+
+def _signed_render_config(config: BusinessConfig, terms: dict) -> BusinessConfig:
+    """Transient config with the current branding and the terms a contract was signed with"""
+    return BusinessConfig(
+        user_id=config.user_id,
+        business_name=config.business_name,
+        logo_url=config.logo_url,
+        signature_url=config.signature_url,
+        rate_per_sqft=config.rate_per_sqft,
+        hourly_rate=config.hourly_rate,
+        flat_rate=config.flat_rate,
+        **{field: terms.get(field) for field in CONTRACT_TERM_FIELDS},
+    )
+
+
+async def rerender_contract_pdf(
+    db: Session, config: BusinessConfig, contract: Contract, r2=None
+) -> dict:
+    """
+    Regenerate one contract's PDF, keeping its signatures, creation date and contract
+    number. Unsigned contracts are re-priced from the current business config and their
+    total_value updated to match; signed/active contracts keep the pricing and terms in
+    their terms_snapshot and only pick up the current branding. Updates pdf_key/pdf_hash
+    (no commit).
+    """
+    from ..routes.contracts_pdf import generate_contract_html
+    from .pdf_render_cache import render_pdf_cached
+
+    client = db.query(Client).filter(Client.id == contract.client_id).first()
+    if not client:
+        raise ValueError(f"Client not found: {contract.client_id}")
+
+    if contract.status in UNSIGNED_STATUSES:
+        render_config = config
+        form_data = client.form_data or {}
+        quote = build_contract_quote(config, client)
+        snapshot_contract_terms(contract, config, form_data, quote)
+        contract.total_value = quote["final_price"]
+    else:
+        if not contract.terms_snapshot:
+            raise ValueError(f"No terms snapshot for signed contract {contract.id}")
+        render_config = _signed_render_config(config, contract.terms_snapshot["terms"])
+        form_data = contract.terms_snapshot["form_data"]
+        quote = contract.terms_snapshot["quote"]
+
+    html = await generate_contract_html(
+        render_config,
+        client,
+        form_data,
+        quote,
+        db,
+        client_signature=contract.client_signature,
+        provider_signature=contract.provider_signature,
+        contract_created_at=contract.created_at,
+        contract_public_id=contract.public_id,
+    )
+
+    render = await render_pdf_cached(html, r2=r2)
+    contract.pdf_key = render["pdf_key"]
+    contract.pdf_hash = render["pdf_hash"]
+    return render
+
+
+async def rerender_business_contracts(
+    redis, db: Session, user_id: int, job_id: str, include_signed: bool = False
+) -> dict:
+    """
+    Re-render every affected contract of a business in id order.
+
+    Contracts are processed in batches; after each batch is committed the highest id is
+    stored as a checkpoint for this job_id, so a retry of the same job continues where
+    it stopped while a new job (e.g. after another branding change) re-renders everything.
+    The checkpoint is cleared once the run completes.
+    """
+    from ..routes.upload import get_r2_client
+
+    # One bulk run per business at a time
+    if not await redis.set(_lock_key(user_id), job_id, nx=True, ex=PROGRESS_TTL):
+        owner = await redis.get(_lock_key(user_id))
+        owner = owner.decode() if isinstance(owner, bytes) else owner
+        if owner != job_id:  # A retry of this same job may reclaim its own lock
+            logger.warning(f"⚠️ Contract re-render already running for user {user_id}: {owner}")
+            return {"status": "skipped", "reason": "already_running", "running_job_id": owner}
+
+    try:
+        config = db.query(BusinessConfig).filter(BusinessConfig.user_id == user_id).first()
+        if not config:
+            raise ValueError(f"Business config not found for user {user_id}")
+
+        # Signed contracts rendered before terms snapshots existed are left as they are -
+        # there is no record of the terms they were signed with to re-render them from
+        affected = Contract.status.in_(UNSIGNED_STATUSES)
+        skipped_signed = 0
+        if include_signed:
+            signed = Contract.status.in_(SIGNED_STATUSES)
+            affected = or_(affected, and_(signed, Contract.terms_snapshot.isnot(None)))
+            skipped_signed = (
+                db.query(Contract.id)
+                .filter(Contract.user_id == user_id, signed, Contract.terms_snapshot.is_(None))
+                .count()
+            )
+        query = db.query(Contract.id).filter(Contract.user_id == user_id, affected)
+
+        checkpoint = await redis.get(_checkpoint_key(user_id, job_id))
+        last_id = int(checkpoint) if checkpoint else 0
+        contract_ids = [
+            row.id for row in query.filter(Contract.id > last_id).order_by(Contract.id).all()
+        ]
+        already_done = query.filter(Contract.id <= last_id).count() if last_id else 0
+
+        progress = {
+            "total": already_done + len(contract_ids),
+            "processed": already_done,
+            "rendered": 0,
+            "cached": 0,
+            "failed": 0,
+            "failed_contract_ids": [],
+            "skipped_signed": skipped_signed,
+            "resumed_from": last_id or None,
+            "percent": 0,
+            "updated_at": None,
+        }
+
+        async def publish(status: str = "in_progress", result: Optional[dict] = None):
+            total = progress["total"]
+            progress["percent"] = round(progress["processed"] * 100 / total) if total else 100
+            progress["updated_at"] = datetime.utcnow().isoformat()
+            await publish_job_event(redis, job_id, status, progress, result=result)
+
+        await publish()
+        logger.info(
+            f"🔄 Re-rendering {len(contract_ids)} contracts for user {user_id} "
+            f"(resuming after id {last_id}, concurrency {RERENDER_CONCURRENCY})"
+        )
+        if skipped_signed:
+            logger.warning(
+                f"⚠️ Skipping {skipped_signed} signed contracts for user {user_id} "
+                f"without a terms snapshot"
+            )
+
+        r2 = get_r2_client()
+        semaphore = asyncio.Semaphore(RERENDER_CONCURRENCY)
+
+        async def render_one(contract: Contract):
+            async with semaphore:
+                try:
+                    render = await rerender_contract_pdf(db, config, contract, r2=r2)
+                    progress["cached" if render["cached"] else "rendered"] += 1
+                except Exception as e:
+                    logger.error(f"❌ Re-render failed for contract {contract.id}: {e}")
+                    progress["failed"] += 1
+                    progress["failed_contract_ids"].append(contract.id)
+                progress["processed"] += 1
+
+        for start in range(0, len(contract_ids), RERENDER_BATCH_SIZE):
+            batch_ids = contract_ids[start : start + RERENDER_BATCH_SIZE]
+            contracts = (
+                db.query(Contract).filter(Contract.id.in_(batch_ids)).order_by(Contract.id).all()
+            )
+            await asyncio.gather(*(render_one(contract) for contract in contracts))
+            db.commit()
+
+            await redis.set(_checkpoint_key(user_id, job_id), batch_ids[-1], ex=PROGRESS_TTL)
+            await publish()
+
+        await redis.delete(_checkpoint_key(user_id, job_id))
+        logger.info(
+            f"✅ Contract re-render complete for user {user_id}: {progress['rendered']} rendered, "
+            f"{progress['cached']} unchanged, {progress['failed']} failed"
+        )
+        result = {"status": "completed", **progress}
+        await publish("complete", result)
+        return result
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        await redis.delete(_lock_key(user_id))
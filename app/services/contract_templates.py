@@ -0,0 +1,51 @@
+"""
+Precompiled Jinja2 Templates for Contract Documents
+MSA and Exhibit A markup lives in app/templates/contracts/. Templates are compiled
+and the static stylesheets are read once at import; each render only fills in the
+per-contract blocks.
+"""
+
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+from markupsafe import Markup
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+def _money(value) -> str:
+    """Format a number as 1,234.56"""
+    return f"{value:,.2f}"
+
+
+def _load_static(name: str) -> Markup:
+    """Read a static fragment once and mark it safe for verbatim inclusion"""
+    return Markup(  # noqa: S704 - static file shipped with the code
+        (TEMPLATES_DIR / "contracts" / name).read_text(encoding="utf-8")
+    )
+
+
+_env = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=select_autoescape(["html"]),
+    undefined=StrictUndefined,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,  # Templates ship with the code - never re-stat them
+)
+_env.filters["money"] = _money
+_env.globals["msa_styles"] = _load_static("msa_styles.css")
+_env.globals["exhibit_a_styles"] = _load_static("exhibit_a_styles.css")
+
+MSA_TEMPLATE = _env.get_template("contracts/msa.html")
+EXHIBIT_A_TEMPLATE = _env.get_template("contracts/exhibit_a.html")
+
+
+def render_msa(**context) -> str:
+    """Render the Master Service Agreement HTML"""
+    return MSA_TEMPLATE.render(**context)
+
+
+def render_exhibit_a(**context) -> str:
+    """Render the Exhibit A - Detailed Scope of Work HTML"""
+    return EXHIBIT_A_TEMPLATE.render(**context)
@@ -0,0 +1,295 @@
+"""
+CSV Export
+Streams clients, contracts, invoices and visits as CSV straight from a server-side
+cursor, and writes gzipped exports to R2 from a background job for very large tenants
+"""
+
+import asyncio
+import csv
+import gzip
+import io
+import logging
+import os
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session
+
+from ..config import R2_BUCKET_NAME
+from ..models import Client, Contract
+from ..models_invoice import Invoice
+from ..models_visit import Visit
+from ..pagination import filter_status
+from .job_events import publish_job_event
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_YIELD_PER = int(os.getenv("CSV_EXPORT_YIELD_PER", "1000"))
+# Rows buffered into each streamed chunk
+EXPORT_CHUNK_ROWS = int(os.getenv("CSV_EXPORT_CHUNK_ROWS", "500"))
+# Download links for background exports
+EXPORT_URL_EXPIRATION = int(os.getenv("CSV_EXPORT_URL_EXPIRATION", str(24 * 3600)))
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    model: type
+    # (CSV header, model attribute) in column order
+    columns: tuple
+    # Column the start_date/end_date filters apply to
+    date_attr: str = "created_at"
+    # Adds a "Client" column with the client's business name
+    join_client: bool = False
+    search_attrs: tuple = ()
+
+
+EXPORTS = {
+    "clients": ExportSpec(
+        model=Client,
+        columns=(
+            ("ID", "id"),
+            ("Business Name", "business_name"),
+            ("Contact Name", "contact_name"),
+            ("Email", "email"),
+            ("Phone", "phone"),
+            ("Property Type", "property_type"),
+            ("Property Size (sq ft)", "property_size"),
+            ("Frequency", "frequency"),
+            ("Status", "status"),
+            ("Notes", "notes"),
+            ("Created At", "created_at"),
+        ),
+        # Generated lower(name/contact/email) column with a trigram index
+        search_attrs=("search_text",),
+    ),
+    "contracts": ExportSpec(
+        model=Contract,
+        columns=(
+            ("ID", "id"),
+            ("Title", "title"),
+            ("Type", "contract_type"),
+            ("Status", "status"),
+            ("Start Date", "start_date"),
+            ("End Date", "end_date"),
+            ("Total Value", "total_value"),
+            ("Currency", "currency"),
+            ("Payment Terms", "payment_terms"),
+            ("Signed At", "signed_at"),
+            ("Created At", "created_at"),
+        ),
+        join_client=True,
+        search_attrs=("title",),
+    ),
+    "invoices": ExportSpec(
+        model=Invoice,
+        columns=(
+            ("ID", "id"),
+            ("Invoice Number", "invoice_number"),
+            ("Title", "title"),
+            ("Status", "status"),
+            ("Base Amount", "base_amount"),
+            ("Discount", "frequency_discount"),
+            ("Add-ons", "addon_amount"),
+            ("Tax", "tax_amount"),
+            ("Total", "total_amount"),
+            ("Currency", "currency"),
+            ("Issue Date", "issue_date"),
+            ("Due Date", "due_date"),
+            ("Paid At", "paid_at"),
+            ("Created At", "created_at"),
+        ),
+        join_client=True,
+        search_attrs=("invoice_number", "title"),
+    ),
+    "visits": ExportSpec(
+        model=Visit,
+        columns=(
+            ("ID", "id"),
+            ("Contract ID", "contract_id"),
+            ("Visit Number", "visit_number"),
+            ("Title", "title"),
+            ("Scheduled Date", "scheduled_date"),
+            ("Start Time", "scheduled_start_time"),
+            ("End Time", "scheduled_end_time"),
+            ("Status", "status"),
+            ("Amount", "visit_amount"),
+            ("Currency", "currency"),
+            ("Payment Status", "payment_status"),
+            ("Completed At", "actual_end_time"),
+        ),
+        date_attr="scheduled_date",
+        join_client=True,
+        search_attrs=("title",),
+    ),
+}
+
+
+def parse_export_filters(
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> dict:
+    """Normalize export query parameters into a JSON-safe dict (also passed to ARQ jobs)"""
+    filters = {"status": status, "search": search, "start_date": None, "end_date": None}
+    for key, value in (("start_date", start_date), ("end_date", end_date)):
+        if not value:
+            continue
+        try:
+            filters[key] = datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+        except ValueError as e:
+            logger.warning(f"  Invalid {key} format: {value} - {e}")
+    return filters
+
+
+def export_query(db: Session, entity: str, user_id: int, filters: dict) -> Query:
+    """Column-only query for an export - no ORM objects are built per row"""
+    spec = EXPORTS[entity]
+    model = spec.model
+    columns = [getattr(model, attr) for _, attr in spec.columns]
+    if spec.join_client:
+        query = db.query(*columns, Client.business_name).outerjoin(
+            Client, model.client_id == Client.id
+        )
+    else:
+        query = db.query(*columns)
+
+    query = query.filter(model.user_id == user_id)
+    if model is Client:
+        # Clients that haven't signed yet are not exported (same as the list view)
+        query = query.filter(Client.status != "pending_signature")
+
+    query = filter_status(query, model.status, filters.get("status"))
+
+    if filters.get("search") and spec.search_attrs:
+        term = f"%{filters['search'].lower()}%"
+        query = query.filter(or_(*(getattr(model, attr).ilike(term) for attr in spec.search_attrs)))
+
+    date_column = getattr(model, spec.date_attr)
+    if filters.get("start_date"):
+        query = query.filter(date_column >= datetime.fromisoformat(filters["start_date"]))
+    if filters.get("end_date"):
+        query = query.filter(date_column <= datetime.fromisoformat(filters["end_date"]))
+
+    return query.order_by(date_column.desc(), model.id.desc())
+
+
+def _format(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+def iter_csv(db: Session, entity: str, user_id: int, filters: dict) -> Iterator[str]:
+    """
+    Yield the CSV in chunks of EXPORT_CHUNK_ROWS rows.
+    yield_per streams results through a server-side cursor, so memory stays flat
+    regardless of the tenant's size.
+    """
+    spec = EXPORTS[entity]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    header = [name for name, _ in spec.columns]
+    if spec.join_client:
+        header.insert(1, "Client")
+    writer.writerow(header)
+
+    rows = 0
+    for row in export_query(db, entity, user_id, filters).yield_per(EXPORT_YIELD_PER):
+        values = [_format(value) for value in row]
+        if spec.join_client:
+            values.insert(1, values.pop())
+        writer.writerow(values)
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+    logger.info(f"✅ CSV export streamed: {rows} {entity} for user {user_id}")
+
+
+def stream_csv(entity: str, user_id: int, filters: dict) -> Iterator[str]:
+    """
+    Streaming body for StreamingResponse. Owns its session, because request-scoped
+    dependencies are closed before the response body is sent.
+    """
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield from iter_csv(db, entity, user_id, filters)
+    finally:
+        db.close()
+
+
+def export_filename(entity: str, suffix: str = ".csv") -> str:
+    return f"{entity}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}"
+
+
+def _write_gzip_export(db: Session, entity: str, user_id: int, filters: dict, fileobj) -> int:
+    """Write a gzipped CSV into fileobj and return its compressed size"""
+    with gzip.GzipFile(fileobj=fileobj, mode="wb") as gz:
+        with io.TextIOWrapper(gz, encoding="utf-8", newline="") as text:
+            for chunk in iter_csv(db, entity, user_id, filters):
+                text.write(chunk)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+async def export_csv_to_r2(
+    redis, db: Session, entity: str, user_id: int, filters: dict, job_id: str
+) -> dict:
+    """
+    Background export: write a gzipped CSV to R2 and return a presigned download link.
+    The file is spooled to a temp file so only one cursor batch is in memory at a time.
+    """
+    from ..routes.upload import get_r2_client
+
+    filename = export_filename(entity, ".csv.gz")
+    key = f"exports/{user_id}/{job_id}/{filename}"
+    await publish_job_event(redis, job_id, "in_progress", {"percent": 5, "stage": "querying"})
+
+    r2 = get_r2_client()
+    with tempfile.TemporaryFile() as fileobj:
+        # Cursor iteration and the upload are blocking - keep them off the worker's loop
+        size = await asyncio.to_thread(_write_gzip_export, db, entity, user_id, filters, fileobj)
+        await publish_job_event(redis, job_id, "in_progress", {"percent": 80, "stage": "uploading"})
+        await asyncio.to_thread(
+            r2.upload_fileobj,
+            fileobj,
+            R2_BUCKET_NAME,
+            key,
+            ExtraArgs={"ContentType": "application/gzip"},
+        )
+
+    download_url = r2.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": R2_BUCKET_NAME,
+            "Key": key,
+            "ResponseContentDisposition": f"attachment; filename={filename}",
+        },
+        ExpiresIn=EXPORT_URL_EXPIRATION,
+    )
+
+    logger.info(f"✅ CSV export uploaded for user {user_id}: {key} ({size} bytes)")
+    return {
+        "status": "completed",
+        "entity": entity,
+        "key": key,
+        "filename": filename,
+        "size": size,
+        "download_url": download_url,
+        "expires_in": EXPORT_URL_EXPIRATION,
+    }
@@ -0,0 +1,146 @@
+"""
+Dashboard Summary
+Quote, contract, visit and invoice counters for the dashboard home, computed with
+filtered aggregates in a single round trip and cached per user in Redis. Cached
+summaries are dropped when a session commits writes to any of the counted tables.
+"""
+
+import logging
+import os
+from datetime import datetime
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from ..cache import cache, user_tag
+from ..models import Client, Contract
+from ..models_invoice import Invoice
+from ..models_visit import Visit
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_SUMMARY_TTL = int(os.getenv("DASHBOARD_SUMMARY_TTL", "300"))
+
+QUOTE_STATUSES = ("pending_review", "approved", "adjusted", "rejected")
+ACTIVE_CONTRACT_STATUSES = ("signed", "active")
+UPCOMING_VISIT_STATUSES = ("scheduled", "in_progress")
+UNPAID_INVOICE_STATUSES = ("pending", "sent", "overdue")
+
+# Writes to these tables change the summary
+SUMMARY_MODELS = (Client, Contract, Visit, Invoice)
+
+
+def summary_cache_key(user_id: int) -> str:
+    return f"dashboard_summary:{user_id}"
+
+
+def quote_stats_query(user_id: int):
+    """One row: count per quote status plus the value of quotes awaiting review"""
+    counts = [
+        func.count().filter(Client.quote_status == status).label(f"{status}_count")
+        for status in QUOTE_STATUSES
+    ]
+    pending_value = func.coalesce(
+        func.sum(Client.original_quote_amount).filter(Client.quote_status == "pending_review"),
+        0,
+    ).label("total_pending_value")
+    return select(*counts, pending_value).where(Client.user_id == user_id)
+
+
+def summary_query(user_id: int, now: datetime):
+    """Every counter as one row - each table is scanned once through its user_id index"""
+    quotes = quote_stats_query(user_id).subquery("quotes")
+    contracts = (
+        select(
+            func.count()
+            .filter(Contract.status.in_(ACTIVE_CONTRACT_STATUSES))
+            .label("active_contracts"),
+            func.count().filter(Contract.status == "new").label("new_contracts"),
+        )
+        .where(Contract.user_id == user_id)
+        .subquery("contracts")
+    )
+    visits = (
+        select(
+            func.count().label("upcoming_visits"),
+            func.min(Visit.scheduled_date).label("next_visit_at"),
+        )
+        .where(
+            Visit.user_id == user_id,
+            Visit.status.in_(UPCOMING_VISIT_STATUSES),
+            Visit.scheduled_date >= now,
+        )
+        .subquery("visits")
+    )
+    invoices = (
+        select(
+            func.count().label("unpaid_invoices"),
+            func.coalesce(func.sum(Invoice.total_amount), 0).label("unpaid_amount"),
+            func.count().filter(Invoice.due_date < now).label("overdue_invoices"),
+        )
+        .where(Invoice.user_id == user_id, Invoice.status.in_(UNPAID_INVOICE_STATUSES))
+        .subquery("invoices")
+    )
+    return select(quotes, contracts, visits, invoices)
+
+
+def compute_dashboard_summary(db: Session, user_id: int) -> dict:
+    row = db.execute(summary_query(user_id, datetime.utcnow())).one()
+    return {
+        "quotes": {
+            "pending_count": row.pending_review_count,
+            "approved_count": row.approved_count,
+            "adjusted_count": row.adjusted_count,
+            "rejected_count": row.rejected_count,
+            "total_pending_value": float(row.total_pending_value),
+        },
+        "contracts": {"active": row.active_contracts, "new": row.new_contracts},
+        "visits": {
+            "upcoming": row.upcoming_visits,
+            "next_visit_at": row.next_visit_at.isoformat() if row.next_visit_at else None,
+        },
+        "invoices": {
+            "unpaid_count": row.unpaid_invoices,
+            "unpaid_amount": float(row.unpaid_amount),
+            "overdue_count": row.overdue_invoices,
+        },
+    }
+
+
+def get_dashboard_summary(db: Session, user_id: int) -> dict:
+    """Cached summary (Redis, DASHBOARD_SUMMARY_TTL) - computed on a miss"""
+    key = summary_cache_key(user_id)
+    summary = cache.get(key)
+    if summary is not None:
+        return summary
+
+    summary = compute_dashboard_summary(db, user_id)
+    cache.set(key, summary, DASHBOARD_SUMMARY_TTL, tags=(user_tag(user_id),))
+    return summary
+
+
+def invalidate_dashboard_summary(user_id: int) -> bool:
+    return cache.delete(summary_cache_key(user_id))
+
+
+# Invalidation: collect the tenants touched by each flush and drop their cached summary
+# once the transaction commits. Bulk query.update()/delete() bypass flush events, so
+# callers using them invalidate explicitly; the TTL bounds anything that slips through.
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_dirty_tenants(session, _flush_context, _instances):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, SUMMARY_MODELS) and obj.user_id is not None:
+            session.info.setdefault("dashboard_dirty_users", set()).add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dirty_tenants(session):
+    for user_id in session.info.pop("dashboard_dirty_users", ()):
+        invalidate_dashboard_summary(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_tenants(session):
+    session.info.pop("dashboard_dirty_users", None)
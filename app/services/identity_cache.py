@@ -0,0 +1,202 @@
+"""
+Identity Cache
+The authenticated user's row (plan fields included) and business config, cached per
+firebase_uid for IDENTITY_CACHE_TTL seconds so get_current_user doesn't query them on
+every request. A cached identity is attached to the request's session as a clean,
+persistent User - routes can lazy-load relationships and write to it as before.
+Entries are dropped when a session commits changes to the user or its business config,
+in this process and - over the cache's pub/sub channel - in every other API and ARQ
+worker; the short TTL only bounds staleness while Redis is unreachable.
+Counters that routes read-modify-write (clients_this_month, month_reset_date) must not
+be trusted from a cached row: app/plan_limits.py reloads them and updates them in SQL.
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..cache import cache
+from ..models import BusinessConfig, User
+
+logger = logging.getLogger(__name__)
+
+IDENTITY_CACHE_TTL = float(os.getenv("IDENTITY_CACHE_TTL", "30"))
+IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", "10000"))
+# Key published on the cache invalidation channel when a user's identity changes
+IDENTITY_INVALIDATION_PREFIX = "identity:user:"
+
+
+def _loaded_columns(obj) -> dict:
+    """Column values already loaded on obj (never triggers a load)"""
+    state = inspect(obj)
+    return {
+        attr.key: state.dict[attr.key]
+        for attr in state.mapper.column_attrs
+        if attr.key in state.dict
+    }
+
+
+def _copy_columns(columns: dict) -> dict:
+    # JSON columns are mutable - each request gets its own copy
+    return {
+        key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        for key, value in columns.items()
+    }
+
+
+class IdentityCache:
+    """LRU of firebase_uid -> (user columns, business config columns or None, expiry)"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._uid_by_user_id: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, firebase_uid: str) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(firebase_uid)
+            if entry is None or time.monotonic() >= entry[2]:
+                if entry is not None:
+                    self._remove(firebase_uid)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(firebase_uid)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, user: User) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        config = inspect(user).dict.get("business_config")
+        user_columns = _copy_columns(_loaded_columns(user))
+        config_columns = _copy_columns(_loaded_columns(config)) if config is not None else None
+        with self._lock:
+            self._remove(user.firebase_uid)
+            self._entries[user.firebase_uid] = (
+                user_columns,
+                config_columns,
+                time.monotonic() + self.ttl,
+            )
+            self._uid_by_user_id[user.id] = user.firebase_uid
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            firebase_uid = self._uid_by_user_id.get(user_id)
+            if firebase_uid is not None:
+                self._remove(firebase_uid)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._uid_by_user_id.clear()
+
+    def _remove(self, firebase_uid: str) -> None:
+        entry = self._entries.pop(firebase_uid, None)
+        if entry is not None:
+            self._uid_by_user_id.pop(entry[0].get("id"), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+identity_cache = IdentityCache(IDENTITY_CACHE_SIZE, IDENTITY_CACHE_TTL)
+
+
+def load_cached_user(db: Session, firebase_uid: str) -> Optional[User]:
+    """The cached user attached to db without a query, or None on a miss"""
+    entry = identity_cache.get(firebase_uid)
+    if entry is None:
+        return None
+    user_columns, config_columns = entry
+
+    existing = db.identity_map.get(db.identity_key(User, user_columns["id"]))
+    if existing is not None:
+        return existing
+
+    user = User(**_copy_columns(user_columns))
+    user.business_config = None
+    if config_columns is not None:
+        user.business_config = BusinessConfig(**_copy_columns(config_columns))
+        make_transient_to_detached(user.business_config)
+    # Detached with clean history: add() makes it persistent as if just loaded
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+def cache_user(user: User) -> None:
+    # Listen for identity changes committed by other processes before caching anything
+    cache.on_invalidation(_apply_remote_invalidation)
+    identity_cache.put(user)
+
+
+def invalidate_identity_on_commit(session: Session, user_id: int) -> None:
+    """Drop the user's cached identity once session commits - for bulk UPDATEs flush can't see"""
+    session.info.setdefault("identity_dirty_users", set()).add(user_id)
+
+
+def _apply_remote_invalidation(keys, patterns) -> None:
+    if "*" in patterns:
+        identity_cache.clear()  # Listener (re)subscribed - messages may have been missed
+        return
+    for key in keys:
+        if key.startswith(IDENTITY_INVALIDATION_PREFIX):
+            try:
+                identity_cache.invalidate_user(int(key[len(IDENTITY_INVALIDATION_PREFIX) :]))
+            except ValueError:
+                continue
+
+
+# Invalidation: collect users whose row or business config a flush touched and drop their
+# cached identity once the transaction commits (same pattern as the dashboard summary).
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changed_identities(session, _flush_context, _instances):
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User) and inspect(obj).identity:
+            session.info.setdefault("identity_dirty_users", set()).add(inspect(obj).identity[0])
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, BusinessConfig) and obj.user_id is not None:
+            session.info.setdefault("identity_dirty_users", set()).add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_identities(session):
+    user_ids = session.info.pop("identity_dirty_users", ())
+    if not user_ids:
+        return
+    for user_id in user_ids:
+        identity_cache.invalidate_user(user_id)
+    # Other API workers and the ARQ worker hold their own copies
+    cache.publish_invalidation(keys=[f"{IDENTITY_INVALIDATION_PREFIX}{uid}" for uid in user_ids])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_identities(session):
+    session.info.pop("identity_dirty_users", None)
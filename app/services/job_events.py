@@ -0,0 +1,131 @@
+"""
+Background Job Progress Events
+Workers publish status/progress updates to Redis pub/sub and keep the latest snapshot
+under job_progress:{job_id}; the API fans them out to SSE subscribers through a single
+pattern subscription per process
+"""
+
+import asyncio
+import json
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_CHANNEL_PREFIX = "job_events:"
+PROGRESS_TTL = 24 * 3600  # Snapshots outlive ARQ's keep_result
+TERMINAL_STATUSES = ("complete", "failed")
+
+
+def progress_key(job_id: str) -> str:
+    return f"job_progress:{job_id}"
+
+
+def job_channel(job_id: str) -> str:
+    return f"{JOB_EVENTS_CHANNEL_PREFIX}{job_id}"
+
+
+async def publish_job_event(
+    redis,
+    job_id: str,
+    status: str,
+    progress: Optional[dict] = None,
+    result: Optional[dict] = None,
+    error: Optional[str] = None,
+):
+    """
+    Store the job's progress snapshot and publish an event shaped like JobStatusResponse.
+    Never raises - progress reporting must not fail the job itself.
+    """
+    event = {"jobId": job_id, "status": status, "progress": progress}
+    if result is not None:
+        event["result"] = result
+    if error is not None:
+        event["error"] = error
+
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            if progress is not None:
+                pipe.set(progress_key(job_id), json.dumps(progress), ex=PROGRESS_TTL)
+            pipe.publish(job_channel(job_id), json.dumps(event, default=str))
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to publish progress for job {job_id}: {e}")
+
+
+class JobEventHub:
+    """
+    One Redis pattern subscription per API process, dispatching job events to
+    per-request asyncio queues - SSE clients never hold their own Redis connection
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self, pool, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(pool))
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(job_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[job_id]
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def _dispatch(self, channel: str, data: str):
+        job_id = channel[len(JOB_EVENTS_CHANNEL_PREFIX) :]
+        queues = self._subscribers.get(job_id)
+        if not queues:
+            return
+        event = json.loads(data)
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.debug(f"Dropping event for slow subscriber of job {job_id}")
+
+    async def _listen(self, pool):
+        """Run until no subscribers are left; reconnect with backoff on errors"""
+        delay = 1
+        while self._subscribers:
+            pubsub = pool.pubsub()
+            try:
+                await pubsub.psubscribe(f"{JOB_EVENTS_CHANNEL_PREFIX}*")
+                delay = 1
+                while self._subscribers:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "pmessage":
+                        channel, data = message["channel"], message["data"]
+                        if isinstance(channel, bytes):
+                            channel = channel.decode()
+                        self._dispatch(channel, data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Subscribers still re-check status periodically while we reconnect
+                logger.warning(f"⚠️ Job event subscription failed, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception as e:
+                    logger.debug(f"Pub/sub close failed (non-critical): {e}")
+
+
+# Global hub instance
+job_event_hub = JobEventHub()
@@ -0,0 +1,98 @@
+"""
+Content-Addressed PDF Render Cache
+Identical HTML + render options map to one PDF object in R2, so retries and
+regenerations with unchanged inputs skip Chromium and the upload entirely
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+from ..cache import cache
+from ..config import R2_BUCKET_NAME
+from .pdf_renderer import PDF_OPTIONS, render_pdf
+
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_PREFIX = "pdf-cache/"
+PDF_CACHE_TTL = int(os.getenv("PDF_CACHE_TTL", str(30 * 24 * 3600)))  # Redis index TTL (30 days)
+
+
+def compute_render_hash(html: str) -> str:
+    """SHA-256 over the render options and the final HTML"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(PDF_OPTIONS, sort_keys=True).encode("utf-8"))
+    digest.update(b"\n")
+    digest.update(html.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_key(render_hash: str) -> str:
+    return f"pdf_render:{render_hash}"
+
+
+def _object_key(render_hash: str) -> str:
+    return f"{PDF_CACHE_PREFIX}{render_hash}.pdf"
+
+
+def _lookup(r2, render_hash: str) -> Optional[dict]:
+    """Find an existing render - Redis index first, then the R2 object itself"""
+    entry = cache.get(_cache_key(render_hash))
+    if entry:
+        return entry
+
+    # Redis entry may have expired while the object is still in R2
+    try:
+        head = r2.head_object(Bucket=R2_BUCKET_NAME, Key=_object_key(render_hash))
+    except Exception:
+        return None
+
+    pdf_hash = (head.get("Metadata") or {}).get("pdf-sha256")
+    if not pdf_hash:
+        return None
+
+    entry = {"pdf_key": _object_key(render_hash), "pdf_hash": pdf_hash}
+    cache.set(_cache_key(render_hash), entry, PDF_CACHE_TTL)
+    return entry
+
+
+async def render_pdf_cached(html: str, r2=None) -> dict:
+    """
+    Render HTML to a PDF stored under pdf-cache/, reusing an identical earlier render
+
+    Returns:
+        dict with pdf_key, pdf_hash (SHA-256 of the PDF bytes), render_hash and cached flag
+    """
+    if r2 is None:
+        from ..routes.upload import get_r2_client
+
+        r2 = get_r2_client()
+
+    render_hash = compute_render_hash(html)
+
+    entry = await asyncio.to_thread(_lookup, r2, render_hash)
+    if entry:
+        logger.info(f"♻️ PDF render cache HIT: {render_hash[:12]} -> {entry['pdf_key']}")
+        return {**entry, "render_hash": render_hash, "cached": True}
+
+    logger.info(f"📄 PDF render cache MISS: {render_hash[:12]}")
+    pdf_bytes = await render_pdf(html)
+    pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    pdf_key = _object_key(render_hash)
+
+    await asyncio.to_thread(
+        r2.put_object,
+        Bucket=R2_BUCKET_NAME,
+        Key=pdf_key,
+        Body=pdf_bytes,
+        ContentType="application/pdf",
+        Metadata={"pdf-sha256": pdf_hash},
+    )
+    entry = {"pdf_key": pdf_key, "pdf_hash": pdf_hash}
+    cache.set(_cache_key(render_hash), entry, PDF_CACHE_TTL)
+    logger.info(f"✅ PDF rendered and cached ({len(pdf_bytes)} bytes): {pdf_key}")
+
+    return {**entry, "render_hash": render_hash, "cached": False}
@@ -0,0 +1,276 @@
+"""
+Persistent Playwright Browser Pool for PDF Rendering
+Keeps warm Chromium contexts alive so contracts and Exhibit A PDFs skip the cold start
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import subprocess
+import sys
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration
+PDF_POOL_SIZE = int(os.getenv("PDF_POOL_SIZE", "2"))  # Warm contexts (= concurrent renders)
+PDF_MAX_RENDERS_PER_BROWSER = int(os.getenv("PDF_MAX_RENDERS_PER_BROWSER", "200"))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))  # Seconds per render
+
+# Render options shared by the pool and the subprocess fallback (app/pdf_worker.py)
+PDF_OPTIONS = {
+    "format": "A4",
+    "margin": {"top": "20px", "bottom": "20px", "left": "20px", "right": "20px"},
+    "print_background": True,
+}
+
+
+class PDFRenderError(Exception):
+    """Raised when a PDF could not be rendered"""
+
+
+class _Slot:
+    """A warm browser context with a reusable page"""
+
+    __slots__ = ("context", "page")
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+
+
+class BrowserPool:
+    """
+    Long-lived Chromium with N warm contexts.
+
+    - Each render borrows one context/page from a queue and returns it afterwards
+    - The browser is recycled after `max_renders` renders, on a crash, or after a timeout
+    - Every render is bounded by `render_timeout`
+    """
+
+    def __init__(
+        self,
+        size: int = PDF_POOL_SIZE,
+        max_renders: int = PDF_MAX_RENDERS_PER_BROWSER,
+        render_timeout: float = PDF_RENDER_TIMEOUT,
+    ):
+        self.size = max(1, size)
+        self.max_renders = max(1, max_renders)
+        self.render_timeout = render_timeout
+
+        self._playwright = None
+        self._browser = None
+        self._slots: Optional[asyncio.Queue] = None
+        self._recycle_lock: Optional[asyncio.Lock] = None
+        self._renders = 0
+        self._needs_recycle = False
+        self._started = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._started
+
+    async def start(self):
+        """Launch Chromium and open the warm contexts"""
+        if self._started:
+            return
+
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._slots = asyncio.Queue()
+        self._recycle_lock = asyncio.Lock()
+        for slot in await self._launch():
+            self._slots.put_nowait(slot)
+        self._started = True
+        logger.info(
+            f"🖨️ PDF browser pool started: size={self.size}, "
+            f"recycle_after={self.max_renders}, timeout={self.render_timeout}s"
+        )
+
+    async def stop(self):
+        """Close the browser and stop Playwright"""
+        if not self._started:
+            return
+
+        self._started = False
+        self._wake_waiters()
+        await self._close_browser()
+        try:
+            await self._playwright.stop()
+        except Exception as e:
+            logger.debug(f"Playwright stop failed (non-critical): {e}")
+        self._playwright = None
+        self._slots = None
+        logger.info("🖨️ PDF browser pool stopped")
+
+    async def render(self, html: str) -> bytes:
+        """Render HTML to PDF bytes on a warm page"""
+        if not self._started:
+            raise PDFRenderError("PDF browser pool is not running")
+
+        # A crash/disconnect flagged since the last render - don't hand out a dead page
+        if self._needs_recycle and not self._recycle_lock.locked():
+            try:
+                await self._recycle()
+            except Exception as e:
+                raise PDFRenderError(f"PDF browser relaunch failed: {str(e)}") from e
+
+        slots = self._slots
+        slot = await self._acquire()
+        error: Optional[PDFRenderError] = None
+        pdf = b""
+        try:
+            pdf = await asyncio.wait_for(self._render_on(slot, html), timeout=self.render_timeout)
+        except asyncio.TimeoutError as e:
+            # The page may be wedged mid-render - start over with a fresh browser
+            self._needs_recycle = True
+            error = PDFRenderError(
+                f"PDF generation timed out after {self.render_timeout:g} seconds"
+            )
+            error.__cause__ = e
+        except Exception as e:
+            # Crashed page/browser - recycle before serving the next render
+            self._needs_recycle = True
+            error = PDFRenderError(f"PDF generation error: {str(e)}")
+            error.__cause__ = e
+        finally:
+            slots.put_nowait(slot)
+            self._renders += 1
+            if self._renders >= self.max_renders:
+                self._needs_recycle = True
+
+        # Recycle after the slot is back; a relaunch failure must not replace this render's outcome
+        if self._needs_recycle and not self._recycle_lock.locked():
+            try:
+                await self._recycle()
+            except Exception as e:
+                logger.debug(f"PDF browser recycle after render failed: {e}")
+
+        if error is not None:
+            raise error
+        return pdf
+
+    async def _acquire(self) -> _Slot:
+        slots = self._slots
+        while True:
+            slot = await slots.get()
+            if slot is None:
+                # Pool shut down or failed to relaunch - pass the sentinel on to the next waiter
+                slots.put_nowait(None)
+                raise PDFRenderError("PDF browser pool is not running")
+            if not self._recycle_lock.locked():
+                return slot
+            # Browser is being recycled - hand the slot to the recycler and wait for a fresh one
+            slots.put_nowait(slot)
+            async with self._recycle_lock:
+                pass
+
+    async def _render_on(self, slot: _Slot, html: str) -> bytes:
+        await slot.page.set_content(html, wait_until="networkidle")
+        return await slot.page.pdf(**PDF_OPTIONS)
+
+    async def _launch(self) -> list:
+        self._browser = await self._playwright.chromium.launch()
+        self._browser.on("disconnected", self._on_disconnected)
+        self._renders = 0
+        self._needs_recycle = False
+
+        slots = []
+        for _ in range(self.size):
+            context = await self._browser.new_context()
+            page = await context.new_page()
+            slots.append(_Slot(context, page))
+        return slots
+
+    def _on_disconnected(self, _browser):
+        if self._started:
+            logger.warning("⚠️ PDF browser disconnected - recycling on next render")
+            self._needs_recycle = True
+
+    def _wake_waiters(self):
+        """Release coroutines blocked in _acquire once the pool can no longer serve renders"""
+        if self._slots is not None:
+            for _ in range(self.size):
+                self._slots.put_nowait(None)
+
+    async def _close_browser(self):
+        browser, self._browser = self._browser, None
+        if browser is None:
+            return
+        try:
+            browser.remove_listener("disconnected", self._on_disconnected)
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"Browser close failed (non-critical): {e}")
+
+    async def _recycle(self):
+        """Drain every slot, relaunch Chromium and refill the queue"""
+        async with self._recycle_lock:
+            if not self._started or not self._needs_recycle:
+                return
+
+            logger.info(f"♻️ Recycling PDF browser after {self._renders} renders")
+            # Wait for in-flight renders to hand their slots back
+            for _ in range(self.size):
+                await self._slots.get()
+
+            await self._close_browser()
+            try:
+                slots = await self._launch()
+            except Exception:
+                logger.exception("❌ Failed to relaunch PDF browser")
+                self._started = False
+                self._wake_waiters()
+                raise
+            for slot in slots:
+                self._slots.put_nowait(slot)
+
+
+# Process-wide pool; started by the ARQ worker (see app/worker.py startup)
+pdf_browser_pool = BrowserPool()
+
+
+def _render_in_subprocess(html: str) -> bytes:
+    """Render via app/pdf_worker.py in a separate interpreter (cold Chromium)"""
+    worker_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "pdf_worker.py"))
+
+    # Encode HTML as base64 to safely pass via stdin
+    html_b64 = base64.b64encode(html.encode("utf-8")).decode("utf-8")
+
+    try:
+        result = subprocess.run(  # noqa: S603 - fixed interpreter and script path
+            [sys.executable, worker_path],
+            input=html_b64,
+            capture_output=True,
+            text=True,
+            timeout=120,  # 120 second timeout for slow systems
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+        )
+
+        if result.returncode != 0:
+            raise Exception(f"PDF worker failed (exit {result.returncode}): {result.stderr}")
+
+        # Decode the base64 PDF from stdout
+        pdf_b64 = result.stdout.strip()
+        if not pdf_b64:
+            raise Exception("PDF worker returned empty output")
+        return base64.b64decode(pdf_b64)
+    except subprocess.TimeoutExpired as e:
+        raise PDFRenderError("PDF generation timed out after 120 seconds") from e
+    except Exception as e:
+        raise PDFRenderError(f"PDF generation error: {str(e)}") from e
+
+
+async def render_pdf(html: str) -> bytes:
+    """
+    Convert HTML to PDF.
+    Uses the warm browser pool when this process owns one (ARQ worker),
+    otherwise falls back to a one-off subprocess render.
+    """
+    if pdf_browser_pool.is_running:
+        return await pdf_browser_pool.render(html)
+
+    # Run in thread pool to not block the event loop
+    return await asyncio.to_thread(_render_in_subprocess, html)
@@ -0,0 +1,43 @@
+"""
+JSONB helpers
+Server-side projections and GIN-indexable filters for JSONB columns (clients.form_data)
+"""
+
+from typing import Optional
+
+from sqlalchemy import and_, func, literal
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Longest key list a projection accepts - jsonb_build_object takes 100 arguments
+MAX_PROJECTION_KEYS = 50
+
+
+def parse_keys(keys: Optional[str]) -> list[str]:
+    """Split a comma-separated key list from a query parameter (duplicates dropped)"""
+    if not keys:
+        return []
+    return list(dict.fromkeys(key.strip() for key in keys.split(",") if key.strip()))[
+        :MAX_PROJECTION_KEYS
+    ]
+
+
+def jsonb_projection(column, keys: list[str]):
+    """
+    jsonb_build_object() of only `keys` from a JSONB column, so list views
+    transfer the fields they display instead of the whole document.
+    Missing keys come back as null.
+    """
+    args = []
+    for key in keys:
+        args.extend((literal(key), column[key]))
+    return func.jsonb_build_object(*args, type_=JSONB)
+
+
+def jsonb_contains(column, **values):
+    """column @> {key: value} - served by a GIN (jsonb_ops) index on the column"""
+    return column.contains(values)
+
+
+def jsonb_array_not_empty(column, key: str):
+    """True when column[key] holds a non-empty array (key existence via the GIN index)"""
+    return and_(column.has_key(key), column[key] != func.jsonb_build_array())
@@ -7,6 +7,7 @@ import logging
 import os
 
 from arq.connections import RedisSettings
+from sqlalchemy import and_, func, or_
 
 # Import all models at module level to ensure SQLAlchemy can resolve relationships
 # This must happen before any database operations
@@ -20,6 +21,8 @@ from . import models_quickbooks  # noqa: F401 - QuickBooks models
 from . import models_square  # noqa: F401 - Square models
 from . import models_twilio  # noqa: F401 - Twilio models
 from . import models_visit  # noqa: F401 - Visit models
+from .services import dashboard_summary  # noqa: F401 - Summary cache invalidation
+from .services.contract_rerender import LOW_PRIORITY_QUEUE, snapshot_contract_terms
 
 # Import specific models needed for type hints
 from .models import BusinessConfig, Client, Contract, User
@@ -76,12 +79,21 @@ async def generate_contract_pdf_task(
     """
     from datetime import datetime
 
-    from .config import R2_BUCKET_NAME
-    from .routes.contracts_pdf import calculate_quote, generate_contract_html, html_to_pdf
+    from .routes.contracts_pdf import calculate_quote, generate_contract_html
     from .routes.upload import get_r2_client
+    from .services.job_events import publish_job_event
+    from .services.pdf_render_cache import render_pdf_cached
 
+    job_id = ctx.get("job_id", "unknown")
     logger.info(f"🚀 ARQ Worker: Starting contract PDF generation for client {client_id}")
-    logger.info(f"📋 Job ID: {ctx.get('job_id', 'unknown')}")
+    logger.info(f"📋 Job ID: {job_id}")
+
+    async def report(percent: int, stage: str):
+        await publish_job_event(
+            ctx["redis"], job_id, "in_progress", {"percent": percent, "stage": stage}
+        )
+
+    await report(5, "Loading client details")
 
     db = SessionLocal()
     try:
@@ -109,6 +121,7 @@ async def generate_contract_pdf_task(
         logger.info(f"✅ Business config found: {config.business_name}")
 
         # Calculate quote
+        await report(15, "Calculating quote")
         try:
             logger.info(f"💰 Calculating quote...")
             quote = calculate_quote(config, form_data)
@@ -131,34 +144,48 @@ async def generate_contract_pdf_task(
             quote["addon_amount"] = 0
             quote["addon_details"] = []
 
-        # Create contract record first to get public_id for secure contract numbering
-        logger.info(f"📝 Creating contract record...")
-
         # Use adjusted quote amount if available, otherwise use calculated quote
         contract_amount = client.adjusted_quote_amount or quote.get(
             "final_price", quote.get("total", 0)
         )
         logger.info(f"💰 Contract amount: ${contract_amount}")
 
-        contract = Contract(
-            user_id=user.id,
-            client_id=client_id,
-            title=f"Cleaning Contract - {client.business_name or client.contact_name}",
-            total_value=contract_amount,
-            status="new" if not signature else "signed",
+        # Retries and regenerate clicks reuse the client's unsigned contract (or, when a
+        # signed run is retried, the contract it already signed), so its public_id (contract
+        # number) and created_at (contract date) - and with them the HTML and its render
+        # hash - stay the same across runs
+        reusable = and_(
+            Contract.status == "new", func.coalesce(Contract.client_signature, "") == ""
         )
-
         if signature:
+            reusable = or_(reusable, Contract.client_signature == signature)
+        contract = (
+            db.query(Contract)
+            .filter(Contract.user_id == user.id, Contract.client_id == client_id, reusable)
+            .order_by(Contract.id.desc())
+            .first()
+        )
+        if contract is None:
+            logger.info(f"📝 Creating contract record...")
+            contract = Contract(user_id=user.id, client_id=client_id)
+            db.add(contract)
+        else:
+            logger.info(f"♻️ Reusing unsigned contract record: ID={contract.id}")
+
+        contract.title = f"Cleaning Contract - {client.business_name or client.contact_name}"
+        contract.total_value = contract_amount
+        contract.status = "new" if not signature else "signed"
+        if signature and contract.client_signature != signature:
             contract.client_signature = signature
             contract.signed_at = datetime.now()
 
-        db.add(contract)
         db.commit()
         db.refresh(contract)
 
-        logger.info(f"✅ Contract created: ID={contract.id}, Public ID={contract.public_id}")
+        logger.info(f"✅ Contract ready: ID={contract.id}, Public ID={contract.public_id}")
 
         # Generate HTML with contract public_id for secure contract numbering
+        await report(30, "Preparing contract")
         try:
             logger.info(f"📄 Generating contract HTML...")
             html = await generate_contract_html(
@@ -168,6 +195,7 @@ async def generate_contract_pdf_task(
                 quote,
                 db,
                 client_signature=signature,
+                contract_created_at=contract.created_at,
                 contract_public_id=contract.public_id,
             )
             logger.info(f"✅ Contract HTML generated ({len(html)} chars)")
@@ -176,33 +204,25 @@ async def generate_contract_pdf_task(
             db.rollback()
             raise Exception(f"Failed to generate contract HTML: {str(e)}") from e
 
-        # Generate PDF
+        # Render PDF and upload to R2 - identical HTML reuses the existing pdf-cache/ object
+        await report(50, "Rendering PDF")
         try:
             logger.info(f"📄 Converting HTML to PDF...")
-            pdf_bytes = await html_to_pdf(html)
-            logger.info(f"✅ PDF generated ({len(pdf_bytes)} bytes)")
+            render = await render_pdf_cached(html, r2=get_r2_client())
+            pdf_key = render["pdf_key"]
+            logger.info(
+                f"✅ PDF ready at {pdf_key} ({'cache hit' if render['cached'] else 'rendered'})"
+            )
         except Exception as e:
             logger.error(f"❌ PDF generation failed: {str(e)}")
             db.rollback()
             raise Exception(f"Failed to generate PDF: {str(e)}") from e
 
-        # Upload to R2
-        pdf_key = f"contracts/{user.firebase_uid}/{contract.public_id}.pdf"
-
-        try:
-            logger.info(f"📤 Uploading PDF to R2: {pdf_key}")
-            r2_client = get_r2_client()
-            r2_client.put_object(
-                Bucket=R2_BUCKET_NAME, Key=pdf_key, Body=pdf_bytes, ContentType="application/pdf"
-            )
-            logger.info(f"✅ PDF uploaded to R2: {pdf_key}")
-        except Exception as e:
-            logger.error(f"❌ R2 upload failed: {str(e)}")
-            db.rollback()
-            raise Exception(f"Failed to upload PDF to storage: {str(e)}") from e
-
-        # Update contract with PDF key
+        # Update contract with PDF key and the pricing and terms it shows
+        await report(90, "Saving contract")
         contract.pdf_key = pdf_key
+        contract.pdf_hash = render["pdf_hash"]
+        snapshot_contract_terms(contract, config, form_data, quote)
         db.commit()
 
         # Generate presigned URL (7 days)
@@ -224,15 +244,20 @@ async def generate_contract_pdf_task(
             f"✅ ARQ Worker: Contract generation completed successfully: ID={contract.id}, Public ID={contract.public_id}"
         )
 
-        return {
+        result = {
             "contract_id": contract.id,
             "contract_public_id": contract.public_id,
             "pdf_url": backend_pdf_url,
             "status": "completed",
         }
+        await publish_job_event(
+            ctx["redis"], job_id, "complete", {"percent": 100, "stage": "Done"}, result=result
+        )
+        return result
 
     except Exception as e:
         logger.error(f"❌ ARQ Worker: Contract generation failed: {type(e).__name__}: {str(e)}")
+        await publish_job_event(ctx["redis"], job_id, "failed", error=str(e))
         import traceback
 
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -467,6 +492,85 @@ async def reset_monthly_client_limits_task(ctx):
         db.close()
 
 
+async def rerender_business_contracts_task(ctx, user_id: int, include_signed: bool = False):
+    """
+    Low-priority job to regenerate all affected contract PDFs for a business
+    after its branding, terms or pricing changed
+
+    Args:
+        ctx: ARQ context
+        user_id: Business owner user ID
+        include_signed: Also re-render signed/active contracts (default: unsigned only)
+    """
+    from .services.contract_rerender import rerender_business_contracts
+    from .services.job_events import publish_job_event
+
+    job_id = ctx.get("job_id", "unknown")
+    logger.info(
+        f"🚀 ARQ Worker: Starting bulk contract re-render for user {user_id} (job {job_id})"
+    )
+
+    db = SessionLocal()
+    try:
+        return await rerender_business_contracts(
+            ctx["redis"], db, user_id, job_id, include_signed=include_signed
+        )
+    except Exception as e:
+        logger.error(f"❌ Bulk contract re-render failed for user {user_id}: {str(e)}")
+        await publish_job_event(ctx["redis"], job_id, "failed", error=str(e))
+        raise
+    finally:
+        db.close()
+
+
+async def export_csv_task(ctx, user_id: int, entity: str, filters: dict):
+    """
+    Low-priority job that writes a gzipped CSV export to R2
+
+    Args:
+        ctx: ARQ context
+        user_id: Business owner user ID
+        entity: clients, contracts, invoices or visits
+        filters: Normalized export filters (see parse_export_filters)
+    """
+    from .services.csv_export import export_csv_to_r2
+    from .services.job_events import publish_job_event
+
+    job_id = ctx.get("job_id", "unknown")
+    logger.info(f"🚀 ARQ Worker: Starting {entity} CSV export for user {user_id} (job {job_id})")
+
+    db = SessionLocal()
+    try:
+        result = await export_csv_to_r2(ctx["redis"], db, entity, user_id, filters, job_id)
+        await publish_job_event(ctx["redis"], job_id, "complete", {"percent": 100}, result=result)
+        return result
+    except Exception as e:
+        logger.error(f"❌ {entity} CSV export failed for user {user_id}: {str(e)}")
+        await publish_job_event(ctx["redis"], job_id, "failed", error=str(e))
+        raise
+    finally:
+        db.close()
+
+
+async def startup(ctx):
+    """Start the warm PDF browser pool owned by this worker"""
+    from .services.pdf_renderer import pdf_browser_pool
+
+    try:
+        await pdf_browser_pool.start()
+    except Exception as e:
+        # Renders fall back to the subprocess path until the worker restarts
+        logger.error(f"❌ Failed to start PDF browser pool: {e}")
+    ctx["pdf_browser_pool"] = pdf_browser_pool
+
+
+async def shutdown(ctx):
+    """Close the PDF browser pool"""
+    from .services.pdf_renderer import pdf_browser_pool
+
+    await pdf_browser_pool.stop()
+
+
 class WorkerSettings:
     """ARQ Worker Settings - Optimized for Scale"""
 
@@ -478,6 +582,8 @@ class WorkerSettings:
         reset_monthly_client_limits_task,
     ]
     redis_settings = get_redis_settings()
+    on_startup = startup
+    on_shutdown = shutdown
 
     # Scalability settings - adjust based on server resources
     # For 2GB RAM: max_jobs=10, For 4GB RAM: max_jobs=20, For 8GB RAM: max_jobs=40
@@ -505,3 +611,25 @@ class WorkerSettings:
     ]
 
     logger.info(f"🔧 ARQ Worker configured: max_jobs={max_jobs}, timeout={job_timeout}s")
+
+
+class LowPriorityWorkerSettings:
+    """
+    ARQ settings for the low-priority queue (bulk jobs)
+    Run as a separate worker: arq app.worker.LowPriorityWorkerSettings
+    """
+
+    queue_name = LOW_PRIORITY_QUEUE
+    functions = [rerender_business_contracts_task, export_csv_task]
+    redis_settings = get_redis_settings()
+    on_startup = startup
+    on_shutdown = shutdown
+
+    # Few long jobs - each one already renders RERENDER_CONCURRENCY contracts at a time
+    max_jobs = int(os.getenv("ARQ_LOW_PRIORITY_MAX_JOBS", "2"))
+    job_timeout = int(os.getenv("ARQ_LOW_PRIORITY_JOB_TIMEOUT", "3600"))
+    keep_result = int(os.getenv("ARQ_KEEP_RESULT", "3600"))
+    health_check_interval = 60
+
+    # Retries resume from the job's checkpoint
+    max_tries = 3
@@ -0,0 +1,197 @@
+"""
+Benchmark: batch client delete, set-based vs the per-client ORM loop
+Usage: python benchmarks/bench_batch_delete.py [--clients 200] [--contracts 2] [--visits 4]
+
+Seeds one tenant with --clients clients, each with signed contracts, invoices, visits
+and a schedule, then deletes them all through the old loop (load client, walk its
+contracts, db.delete, decrement_client_count per signed client) and through
+services.batch_delete.delete_clients. Reports wall time, SQL statements and commits.
+Everything runs inside an outer transaction that is rolled back; the session's
+commits become savepoint releases. Requires DATABASE_URL.
+"""
+
+import argparse
+import logging
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+# Import all model files so SQLAlchemy can resolve relationships
+from app import (  # noqa: E402, F401
+    models_google_calendar,
+    models_quickbooks,
+    models_square,
+    models_twilio,
+)
+from app.database import engine  # noqa: E402
+from app.models import Client, Contract, Schedule, User  # noqa: E402
+from app.models_invoice import Invoice  # noqa: E402
+from app.models_visit import Visit  # noqa: E402
+from app.services.batch_delete import delete_clients  # noqa: E402
+
+
+def seed(conn, clients: int, contracts: int, visits: int) -> tuple[int, list]:
+    run = uuid.uuid4().hex[:8]
+    now = datetime.utcnow()
+    user_id = conn.execute(
+        insert(User).returning(User.id),
+        {
+            "firebase_uid": f"bench-delete-{run}",
+            "email": f"bench-delete-{run}@example.test",
+            "plan": "scale",
+            "clients_this_month": clients,
+        },
+    ).scalar_one()
+
+    client_ids = (
+        conn.execute(
+            insert(Client).returning(Client.id),
+            [
+                {"user_id": user_id, "business_name": f"Client {i}", "status": "active"}
+                for i in range(clients)
+            ],
+        )
+        .scalars()
+        .all()
+    )
+    contract_rows = conn.execute(
+        insert(Contract).returning(Contract.id, Contract.client_id),
+        [
+            {
+                "user_id": user_id,
+                "client_id": client_id,
+                "title": f"Contract {n}",
+                "status": "signed",
+                "client_signature": "data:image/png;base64,",
+                "client_signature_timestamp": now,
+            }
+            for client_id in client_ids
+            for n in range(contracts)
+        ],
+    ).all()
+    conn.execute(
+        insert(Invoice),
+        [
+            {
+                "user_id": user_id,
+                "client_id": client_id,
+                "contract_id": contract_id,
+                "invoice_number": f"B-{run}-{contract_id}",
+                "title": "Service",
+                "base_amount": 100.0,
+                "total_amount": 100.0,
+            }
+            for contract_id, client_id in contract_rows
+        ],
+    )
+    conn.execute(
+        insert(Visit),
+        [
+            {
+                "user_id": user_id,
+                "client_id": client_id,
+                "contract_id": contract_id,
+                "visit_number": n + 1,
+                "title": f"Visit {n + 1}",
+                "scheduled_date": now + timedelta(days=7 * n),
+            }
+            for contract_id, client_id in contract_rows
+            for n in range(visits)
+        ],
+    )
+    conn.execute(
+        insert(Schedule),
+        [
+            {"user_id": user_id, "client_id": client_id, "title": "Clean", "scheduled_date": now}
+            for client_id in client_ids
+        ],
+    )
+    return user_id, client_ids
+
+
+def legacy_delete(db: Session, user: User, client_ids: list) -> int:
+    """The per-client loop batch-delete used before services.batch_delete"""
+    from app.plan_limits import decrement_client_count
+
+    deleted_count = 0
+    signed_clients_count = 0
+    for client_id in client_ids:
+        client = db.query(Client).filter(Client.id == client_id, Client.user_id == user.id).first()
+        if client:
+            if any(c.client_signature or c.client_signature_timestamp for c in client.contracts):
+                signed_clients_count += 1
+            contract_ids = [c.id for c in client.contracts]
+            if contract_ids:
+                db.query(Invoice).filter(Invoice.contract_id.in_(contract_ids)).delete(
+                    synchronize_session=False
+                )
+            db.delete(client)
+            deleted_count += 1
+    db.commit()
+    for _ in range(signed_clients_count):
+        decrement_client_count(user, db)
+    return deleted_count
+
+
+def run(conn, label: str, args, delete) -> None:
+    savepoint = conn.begin_nested()
+    user_id, client_ids = seed(conn, args.clients, args.contracts, args.visits)
+
+    stats = {"statements": 0, "commits": 0}
+
+    def count_statement(*_args):
+        stats["statements"] += 1
+
+    event.listen(conn, "before_cursor_execute", count_statement)
+    with Session(bind=conn, join_transaction_mode="create_savepoint") as db:
+        event.listen(
+            db, "after_commit", lambda _s: stats.__setitem__("commits", stats["commits"] + 1)
+        )
+        user = db.get(User, user_id)
+        start = time.perf_counter()
+        deleted = delete(db, user, client_ids)
+        elapsed = (time.perf_counter() - start) * 1000
+    event.remove(conn, "before_cursor_execute", count_statement)
+    savepoint.rollback()
+
+    print(
+        f"  {label:<10} {elapsed:9.1f} ms   {stats['statements']:6d} statements   "
+        f"{stats['commits']:4d} commits   ({deleted} clients)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--contracts", type=int, default=2, help="Contracts per client")
+    parser.add_argument("--visits", type=int, default=4, help="Visits per contract")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print(
+        f"Deleting {args.clients} clients ({args.contracts} contracts, "
+        f"{args.contracts * args.visits} visits each)"
+    )
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            run(conn, "legacy", args, legacy_delete)
+            run(
+                conn,
+                "set-based",
+                args,
+                lambda db, user, ids: delete_clients(db, user, ids)["deletedCount"],
+            )
+        finally:
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: per-user cache invalidation latency as the keyspace grows
+Usage: python benchmarks/bench_cache_invalidation.py [--sizes 10000,100000,1000000]
+
+Fills Redis with unrelated keys up to each --sizes total, caches a few tagged entries
+for one user and times invalidating them with invalidate_user_cache as shipped and with
+the old KEYS pattern delete. invalidate_user_cache should stay flat while KEYS grows
+with the keyspace. Uses BENCH_REDIS_URL (default redis://localhost:6379/15) - never point it at
+a shared Redis; every key it writes is under bench: and is removed at the end.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import redis  # noqa: E402
+
+import app.cache  # noqa: E402
+from app.cache import Cache, invalidate_user_cache, tag_key, user_tag  # noqa: E402
+
+PREFIX = "bench:"
+FILL_BATCH = 10_000
+
+
+def fill(client, start: int, end: int) -> None:
+    for batch_start in range(start, end, FILL_BATCH):
+        pipe = client.pipeline(transaction=False)
+        for i in range(batch_start, min(batch_start + FILL_BATCH, end)):
+            pipe.set(f"{PREFIX}filler:{i}", "x", ex=3600)
+        pipe.execute()
+
+
+def cache_user_entries(cache: Cache, user_id: int, entries: int) -> None:
+    for i in range(entries):
+        cache.set(f"{PREFIX}entry{i}:{user_id}", {"i": i}, 600, tags=(user_tag(user_id),))
+
+
+def keys_delete(client, user_id: int) -> int:
+    """The previous invalidate_user_cache: two KEYS pattern scans"""
+    deleted = 0
+    for pattern in (f"*:{user_id}:*", f"*:{user_id}"):
+        keys = client.keys(pattern)
+        if keys:
+            deleted += client.delete(*keys)
+    return deleted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--entries", type=int, default=20, help="Cached entries for the user")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    client = redis.from_url(
+        os.getenv("BENCH_REDIS_URL", "redis://localhost:6379/15"), decode_responses=True
+    )
+    cache = Cache(l1_size=0)
+    cache.redis_client = client
+    # invalidate_user_cache goes through the module-level cache
+    app.cache.cache = cache
+    user_id = 424242
+
+    def tags():
+        cache_user_entries(cache, user_id, args.entries)
+        start = time.perf_counter()
+        invalidate_user_cache(user_id)
+        return (time.perf_counter() - start) * 1000
+
+    def keys():
+        cache_user_entries(cache, user_id, args.entries)
+        client.delete(tag_key(user_tag(user_id)))
+        start = time.perf_counter()
+        keys_delete(client, user_id)
+        return (time.perf_counter() - start) * 1000
+
+    print(f"{'keys':>10}  {'invalidate_user_cache':>21}  {'KEYS pattern':>13}")
+    filled = 0
+    try:
+        for size in (int(s) for s in args.sizes.split(",")):
+            fill(client, filled, size)
+            filled = size
+            tag_ms = statistics.median(tags() for _ in range(args.repeat))
+            keys_ms = statistics.median(keys() for _ in range(args.repeat))
+            print(f"{size:>10}  {tag_ms:>18.2f} ms  {keys_ms:>10.2f} ms")
+    finally:
+        cache.delete_pattern(f"{PREFIX}*")
+        client.delete(tag_key(user_tag(user_id)))
+
+
+if __name__ == "__main__":
+    main()
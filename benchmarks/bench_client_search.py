@@ -0,0 +1,146 @@
+"""
+Benchmark: client search on a large tenant, trigram-indexed search vs the legacy ILIKE filter
+Usage: python benchmarks/bench_client_search.py [--clients 100000] [--queries 200]
+
+Seeds one tenant with --clients synthetic clients inside a transaction that is rolled
+back, then times typeahead prefixes, full terms and misspelled terms through
+build_search_query() and through the old ilike('%term%') OR across three columns.
+Requires migrations/add_client_search_trgm.sql on the target database (DATABASE_URL).
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert, or_, select, text  # noqa: E402
+
+# Import all model files so SQLAlchemy can resolve relationships
+from app import (  # noqa: E402, F401
+    models_google_calendar,
+    models_invoice,
+    models_quickbooks,
+    models_square,
+    models_twilio,
+    models_visit,
+)
+from app.database import engine  # noqa: E402
+from app.models import Client, User  # noqa: E402
+from app.services.client_search import build_search_query, normalize_term  # noqa: E402
+
+PREFIXES = ["Sparkle", "Bright", "Prime", "Metro", "Summit", "Harbor", "Evergreen", "Apex"]
+NOUNS = ["Dental", "Offices", "Fitness", "Clinic", "Bakery", "Motors", "Realty", "Academy"]
+SUFFIXES = ["LLC", "Inc", "Group", "Partners", "Co", "Studio", "Center", "Holdings"]
+FIRST_NAMES = ["Maria", "James", "Aiko", "Omar", "Priya", "Lucas", "Chen", "Fatima", "Noah"]
+LAST_NAMES = ["Garcia", "Okafor", "Schmidt", "Nguyen", "Haddad", "Kowalski", "Silva", "Tanaka"]
+
+
+def seed(conn, clients: int, rng: random.Random) -> tuple[int, list]:
+    run = uuid.uuid4().hex[:8]
+    user_id = conn.execute(
+        insert(User).returning(User.id),
+        {"firebase_uid": f"bench-search-{run}", "email": f"bench-search-{run}@example.test"},
+    ).scalar_one()
+
+    rows, names = [], []
+    for i in range(clients):
+        business = f"{rng.choice(PREFIXES)} {rng.choice(NOUNS)} {rng.choice(SUFFIXES)} {i}"
+        contact = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        rows.append(
+            {
+                "user_id": user_id,
+                "business_name": business,
+                "contact_name": contact,
+                "email": f"{contact.split()[0].lower()}.{i}@{business.split()[0].lower()}.test",
+                "status": "active",
+            }
+        )
+        names.append(business)
+    conn.execute(insert(Client), rows)
+    conn.execute(text("ANALYZE clients"))
+    return user_id, names
+
+
+def make_terms(names: list, count: int, rng: random.Random) -> dict:
+    """Typeahead prefixes, exact words and one-letter typos drawn from the seeded names"""
+    typeahead, exact, typos = [], [], []
+    for _ in range(count):
+        name = rng.choice(names)
+        word = rng.choice(name.split()[:2])
+        typeahead.append(name[: rng.randint(2, 6)])
+        exact.append(word)
+        pos = rng.randrange(len(word))
+        typos.append(word[:pos] + rng.choice("aeiou") + word[pos + 1 :])
+    return {"typeahead": typeahead, "exact word": exact, "typo": typos}
+
+
+def legacy_query(user_id: int, term: str, limit: int):
+    pattern = f"%{term.lower()}%"
+    return (
+        select(Client.id)
+        .where(
+            Client.user_id == user_id,
+            Client.status != "pending_signature",
+            or_(
+                Client.business_name.ilike(pattern),
+                Client.contact_name.ilike(pattern),
+                Client.email.ilike(pattern),
+            ),
+        )
+        .order_by(Client.created_at.desc())
+        .limit(limit)
+    )
+
+
+def bench(conn, label: str, build, terms: list) -> None:
+    timings = []
+    for term in terms:
+        start = time.perf_counter()
+        conn.execute(build(term)).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"  {label:<10} p50 {statistics.median(timings):7.2f} ms   "
+        f"p95 {p95:7.2f} ms   max {timings[-1]:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(7)  # noqa: S311 - reproducible fixtures, not security
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            start = time.perf_counter()
+            user_id, names = seed(conn, args.clients, rng)
+            print(f"Seeded {args.clients} clients in {time.perf_counter() - start:.1f}s")
+
+            for kind, terms in make_terms(names, args.queries, rng).items():
+                print(f"{kind} ({len(terms)} queries)")
+                bench(
+                    conn,
+                    "trigram",
+                    lambda term: build_search_query(user_id, normalize_term(term), args.limit),
+                    terms,
+                )
+                bench(conn, "legacy", lambda term: legacy_query(user_id, term, args.limit), terms)
+        finally:
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
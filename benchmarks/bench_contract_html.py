@@ -0,0 +1,195 @@
+"""
+Micro-benchmark: contract HTML rendering, legacy f-string builders vs precompiled Jinja2
+Usage: python benchmarks/bench_contract_html.py [--iterations 2000] [--baseline REV]
+
+Loads the f-string builders from git (by default the commit before the Jinja2 port),
+renders the same fixtures through both implementations, checks that they produce the
+same document text, and prints the mean time per render.
+"""
+
+import argparse
+import asyncio
+import html as html_lib
+import logging
+import re
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Import all model files so SQLAlchemy can resolve relationships
+from app import (  # noqa: E402, F401
+    models_google_calendar,
+    models_invoice,
+    models_quickbooks,
+    models_square,
+    models_twilio,
+    models_visit,
+)
+from app.models import BusinessConfig, Client  # noqa: E402
+from app.routes.contracts_pdf import calculate_quote, generate_contract_html  # noqa: E402
+from app.services.exhibit_a_generator import generate_exhibit_a_html  # noqa: E402
+
+SIGNATURE = "data:image/png;base64," + "iVBORw0KGgo" * 400
+
+
+def _git(*args: str) -> str:
+    command = ["git", *args]  # Fixed git invocation on this repository
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)  # noqa: S603
+    result.check_returncode()
+    return result.stdout
+
+
+def default_baseline() -> str:
+    """The commit before app/templates/contracts/msa.html was added"""
+    added = _git("log", "--diff-filter=A", "--format=%H", "--", "app/templates/contracts/msa.html")
+    return f"{added.split()[-1]}^"
+
+
+def load_baseline_module(rev: str, path: str, package: str) -> types.ModuleType:
+    """Execute `path` as it was at `rev` inside `package`, so its relative imports resolve"""
+    module = types.ModuleType(f"{package}._baseline_{Path(path).stem}")
+    module.__package__ = package
+    module.__file__ = str(ROOT / path)
+    exec(compile(_git("show", f"{rev}:{path}"), f"{rev}:{path}", "exec"), module.__dict__)  # noqa: S102
+    return module
+
+
+def build_fixtures() -> list:
+    """(name, config, client, form_data, signatures) tuples covering the main template branches"""
+    sqft_config = BusinessConfig(
+        user_id=1,
+        business_name="Sparkle & Shine Commercial",
+        pricing_model="sqft",
+        rate_per_sqft=0.12,
+        discount_weekly=10,
+        first_cleaning_discount_type="fixed",
+        first_cleaning_discount_value=25,
+        addon_windows=8,
+        payment_due_days=30,
+        late_fee_percent=2,
+        cancellation_window=48,
+        premium_evening_weekend=15,
+        accepted_payment_methods=["check", "bank-transfer", "card"],
+    )
+    sqft_client = Client(
+        user_id=1,
+        business_name="Acme Offices",
+        contact_name="Jane Doe",
+        email="jane@acme.test",
+        phone="555-0100",
+        property_type="Office",
+    )
+    sqft_form = {
+        "squareFootage": "4200",
+        "cleaningFrequency": "Weekly",
+        "billingAddress": "1 Market St, Springfield",
+        "selectedAddons": ["addon_windows"],
+        "addonQuantities": {"addon_windows": 12},
+        "isFirstCleaning": True,
+        "contractTermDuration": "12",
+        "contractTermUnit": "Months",
+        "specialRequests": "Badge access after 6pm <front desk>",
+    }
+
+    pending_config = BusinessConfig(
+        user_id=2, business_name="Packages Co", pricing_model="packages", custom_packages=[]
+    )
+    pending_client = Client(user_id=2, business_name="Retail One", contact_name=None)
+    pending_form = {"cleaningFrequency": "Monthly"}
+
+    return [
+        ("signed sqft contract", sqft_config, sqft_client, sqft_form, SIGNATURE),
+        ("quote-pending draft", pending_config, pending_client, pending_form, None),
+    ]
+
+
+EXHIBIT_SCOPE = {
+    "selectedTasks": {
+        "lobby-reception": ["vacuum-carpets", "dust-surfaces", "empty-trash"],
+        "restrooms": ["clean-toilets", "restock-supplies"],
+        "empty-area": [],
+    },
+    "consumablesResponsibility": "client",
+    "specialNotes": "Use fragrance-free products in the clinic wing",
+}
+
+
+def normalize(document: str) -> str:
+    """Compare document text, ignoring markup whitespace and entity escaping"""
+    document = html_lib.unescape(document)
+    document = re.sub(r">\s+<", "><", document)
+    return re.sub(r"\s+", " ", document).strip()
+
+
+def bench(label: str, fn, iterations: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call_us = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"  {label:<10} {per_call_us:10.1f} µs/render")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--baseline", help="git revision holding the f-string builders")
+    args = parser.parse_args()
+
+    baseline = args.baseline or default_baseline()
+    legacy_generate_contract_html = load_baseline_module(
+        baseline, "app/routes/contracts_pdf.py", "app.routes"
+    ).generate_contract_html
+    legacy_generate_exhibit_a_html = load_baseline_module(
+        baseline, "app/services/exhibit_a_generator.py", "app.services"
+    ).generate_exhibit_a_html
+    print(f"Baseline: {_git('rev-parse', '--short', baseline).strip()}")
+
+    # Quote calculation and HTML generation log on every call
+    logging.disable(logging.WARNING)
+    loop = asyncio.new_event_loop()
+    failures = 0
+
+    for name, config, client, form_data, signature in build_fixtures():
+        quote = calculate_quote(config, form_data)
+        kwargs = {"client_signature": signature, "contract_public_id": "a7b3c9d2-0000"}
+
+        def legacy(config=config, client=client, form_data=form_data, quote=quote, kwargs=kwargs):
+            return loop.run_until_complete(
+                legacy_generate_contract_html(config, client, form_data, quote, None, **kwargs)
+            )
+
+        def jinja(config=config, client=client, form_data=form_data, quote=quote, kwargs=kwargs):
+            return loop.run_until_complete(
+                generate_contract_html(config, client, form_data, quote, None, **kwargs)
+            )
+
+        same = normalize(legacy()) == normalize(jinja())
+        failures += not same
+        print(f"MSA - {name} ({'identical text' if same else 'OUTPUT DIFFERS'})")
+        old = bench("f-string", legacy, args.iterations)
+        new = bench("jinja2", jinja, args.iterations)
+        print(f"  speedup    {old / new:10.2f}x")
+
+    args_exhibit = (EXHIBIT_SCOPE, "Acme Offices", "Sparkle & Shine", "Service Agreement - Acme")
+    same = normalize(legacy_generate_exhibit_a_html(*args_exhibit)) == normalize(
+        generate_exhibit_a_html(*args_exhibit)
+    )
+    failures += not same
+    print(f"Exhibit A ({'identical text' if same else 'OUTPUT DIFFERS'})")
+    old = bench("f-string", lambda: legacy_generate_exhibit_a_html(*args_exhibit), args.iterations)
+    new = bench("jinja2", lambda: generate_exhibit_a_html(*args_exhibit), args.iterations)
+    print(f"  speedup    {old / new:10.2f}x")
+
+    loop.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: Firebase ID token verification, full verification vs the verified-token cache
+Usage: python benchmarks/bench_token_verify.py [--requests 5000] [--tokens 50]
+
+Signs --tokens ID tokens with a throwaway RSA key installed as a Google signing key,
+then verifies --requests of them round-robin through auth.verify_firebase_token -
+once with the cache cleared before every call (base64/JSON decoding, RSA-SHA256 and
+claim checks each time) and once with the cache warm. No network or database access;
+DATABASE_URL only needs to be set for the app modules to import.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cryptography.hazmat.primitives import hashes  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import padding, rsa  # noqa: E402
+
+from app import auth  # noqa: E402
+
+PROJECT_ID = "bench-project"
+KID = "bench-kid"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_token(private_key, uid: str) -> str:
+    now = int(time.time())
+    header = _b64(json.dumps({"alg": "RS256", "kid": KID, "typ": "JWT"}).encode())
+    payload = _b64(
+        json.dumps(
+            {
+                "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+                "aud": PROJECT_ID,
+                "auth_time": now,
+                "user_id": uid,
+                "sub": uid,
+                "iat": now,
+                "exp": now + 3600,
+                "email": f"{uid}@example.test",
+            }
+        ).encode()
+    )
+    signature = private_key.sign(
+        f"{header}.{payload}".encode(), padding.PKCS1v15(), hashes.SHA256()
+    )
+    return f"{header}.{payload}.{_b64(signature)}"
+
+
+async def run(label: str, tokens: list[str], requests: int, cold: bool) -> None:
+    auth.verified_tokens.clear()
+    start = time.perf_counter()
+    for i in range(requests):
+        if cold:
+            auth.verified_tokens.clear()
+        await auth.verify_firebase_token(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {label:<10} {elapsed * 1000:9.1f} ms total   "
+        f"{elapsed / requests * 1_000_000:8.1f} µs/request"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--tokens", type=int, default=50, help="Distinct users/tokens")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    auth.FIREBASE_PROJECT_ID = PROJECT_ID
+    auth.google_keys.keys = {KID: private_key.public_key()}
+    auth.google_keys.expires_at = auth.google_keys.next_refresh_at = time.time() + 3600
+
+    tokens = [make_token(private_key, f"user-{i}") for i in range(args.tokens)]
+    print(f"Verifying {args.requests} requests over {args.tokens} tokens")
+    await run("uncached", tokens, args.requests, cold=True)
+    await run("cached", tokens, args.requests, cold=False)
+    print(f"  cache stats: {auth.verified_tokens.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
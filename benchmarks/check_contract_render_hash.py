@@ -0,0 +1,66 @@
+"""
+Check: repeated contract generation for the same client hits the PDF render cache
+Usage: python benchmarks/check_contract_render_hash.py
+
+generate_contract_pdf_task reuses the client's contract on retries and regenerate clicks
+and passes its public_id and created_at into the HTML. This renders the HTML twice per
+fixture the way the task does - as two separate runs for the same contract and inputs -
+and checks both runs produce the same render hash (so the second run skips Chromium).
+It also checks a new contract record would change the hash, which is why reuse matters.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.routes.contracts_pdf import calculate_quote, generate_contract_html  # noqa: E402
+from app.services.pdf_render_cache import compute_render_hash  # noqa: E402
+from benchmarks.bench_contract_html import build_fixtures  # noqa: E402
+
+
+async def render_hash(config, client, form_data, signature, public_id, created_at) -> str:
+    html = await generate_contract_html(
+        config,
+        client,
+        form_data,
+        calculate_quote(config, form_data),
+        None,
+        client_signature=signature,
+        contract_created_at=created_at,
+        contract_public_id=public_id,
+    )
+    return compute_render_hash(html)
+
+
+async def main() -> int:
+    logging.disable(logging.WARNING)
+    failures = 0
+
+    for name, config, client, form_data, signature in build_fixtures():
+        public_id = str(uuid.uuid4())
+        created_at = datetime.utcnow() - timedelta(days=3)
+        args = (config, client, form_data, signature)
+
+        first = await render_hash(*args, public_id, created_at)
+        time.sleep(1.1)  # A later run, as a retry or regenerate click would be
+        second = await render_hash(*args, public_id, created_at)
+        fresh = await render_hash(*args, str(uuid.uuid4()), created_at)
+
+        stable = first == second
+        failures += not stable or fresh == first
+        print(
+            f"{name}: same contract {'same hash' if stable else 'HASH DIFFERS'}, "
+            f"new contract record {'changes hash' if fresh != first else 'SAME HASH'}"
+        )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
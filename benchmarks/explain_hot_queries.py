@@ -0,0 +1,287 @@
+"""
+EXPLAIN regression check for the per-tenant hot queries
+Usage: python benchmarks/explain_hot_queries.py [--seed] [--tenants 50] [--rows 400]
+
+Runs EXPLAIN (FORMAT JSON) for the dashboard/public-form queries covered by
+migrations/add_tenant_composite_indexes.sql and exits non-zero if any of them plans a
+sequential scan on a tenant table. Point DATABASE_URL at a staging snapshot, or pass
+--seed to insert synthetic tenants first - everything runs in one transaction that is
+rolled back, so nothing is left behind.
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import desc, func, insert, select, text  # noqa: E402
+
+# Import all model files so SQLAlchemy can resolve relationships
+from app import (  # noqa: E402, F401
+    models_google_calendar,
+    models_quickbooks,
+    models_square,
+    models_twilio,
+)
+from app.database import engine  # noqa: E402
+from app.models import Client, Contract, Schedule, User  # noqa: E402
+from app.models_invoice import Invoice  # noqa: E402
+from app.models_visit import Visit  # noqa: E402
+
+HOT_TABLES = {"clients", "contracts", "schedules", "invoices", "visits"}
+
+CLIENT_STATUSES = ["pending_signature", "new", "active", "scheduled", "completed"]
+QUOTE_STATUSES = [None, "pending_review", "approved", "adjusted", "rejected"]
+INVOICE_STATUSES = ["draft", "pending", "sent", "paid", "cancelled"]
+SCHEDULE_STATUSES = ["scheduled", "pending", "confirmed", "completed", "cancelled"]
+
+
+def seed(conn, tenants: int, rows: int) -> dict:
+    """Insert synthetic tenants and return ids to parameterize the hot queries with"""
+    rng = random.Random(42)  # noqa: S311 - reproducible fixtures, not security
+    now = datetime.utcnow()
+    run = uuid.uuid4().hex[:8]
+
+    user_ids = list(
+        conn.execute(
+            insert(User).returning(User.id),
+            [
+                {"firebase_uid": f"explain-{run}-{i}", "email": f"explain-{run}-{i}@example.test"}
+                for i in range(tenants)
+            ],
+        ).scalars()
+    )
+
+    client_rows = []
+    for user_id in user_ids:
+        for i in range(rows):
+            created = now - timedelta(days=rng.randint(0, 720), minutes=rng.randint(0, 1440))
+            quote_status = rng.choice(QUOTE_STATUSES)
+            client_rows.append(
+                {
+                    "user_id": user_id,
+                    "business_name": f"Client {i}",
+                    "status": rng.choice(CLIENT_STATUSES),
+                    "quote_status": quote_status,
+                    "quote_submitted_at": created if quote_status else None,
+                    "created_at": created,
+                }
+            )
+    clients = conn.execute(insert(Client).returning(Client.id, Client.user_id), client_rows).all()
+
+    contract_rows = [
+        {
+            "user_id": user_id,
+            "client_id": client_id,
+            "title": "Cleaning Agreement",
+            "status": rng.choice(["new", "signed", "active", "cancelled"]),
+            "client_signature": "data:image/png;base64,AA" if rng.random() < 0.6 else None,
+            "client_signature_ip": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.1",
+        }
+        for client_id, user_id in clients
+    ]
+    contracts = conn.execute(
+        insert(Contract).returning(Contract.id, Contract.user_id, Contract.client_id),
+        contract_rows,
+    ).all()
+
+    schedule_rows, invoice_rows, visit_rows = [], [], []
+    for contract_id, user_id, client_id in contracts:
+        day = (now + timedelta(days=rng.randint(-180, 180))).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        schedule_rows.append(
+            {
+                "user_id": user_id,
+                "client_id": client_id,
+                "title": "Cleaning",
+                "scheduled_date": day,
+                "status": rng.choice(SCHEDULE_STATUSES),
+            }
+        )
+        status = rng.choice(INVOICE_STATUSES)
+        invoice_rows.append(
+            {
+                "user_id": user_id,
+                "client_id": client_id,
+                "contract_id": contract_id,
+                "invoice_number": f"EXPLAIN-{run}-{contract_id}",
+                "title": "Cleaning Service",
+                "base_amount": 150.0,
+                "total_amount": 150.0,
+                "status": status,
+                "paid_at": now - timedelta(days=rng.randint(0, 365)) if status == "paid" else None,
+            }
+        )
+        for visit_number in range(1, 5):
+            visit_rows.append(
+                {
+                    "user_id": user_id,
+                    "client_id": client_id,
+                    "contract_id": contract_id,
+                    "visit_number": visit_number,
+                    "title": f"Visit #{visit_number}",
+                    "scheduled_date": day + timedelta(weeks=visit_number),
+                }
+            )
+
+    conn.execute(insert(Schedule), schedule_rows)
+    conn.execute(insert(Invoice), invoice_rows)
+    conn.execute(insert(Visit), visit_rows)
+
+    for table in sorted(HOT_TABLES):
+        conn.execute(text(f"ANALYZE {table}"))
+
+    print(
+        f"Seeded {tenants} tenants: {len(clients)} clients/contracts/schedules/invoices, "
+        f"{len(visit_rows)} visits"
+    )
+    return {"user_id": user_ids[len(user_ids) // 2]}
+
+
+def pick_ids(conn, user_id=None) -> dict:
+    """Representative ids from the data - a mid-sized tenant and one of its contracts/clients"""
+    if user_id is None:
+        tenants = list(
+            conn.execute(
+                select(Client.user_id).group_by(Client.user_id).order_by(func.count())
+            ).scalars()
+        )
+        if not tenants:
+            sys.exit("No clients found - pass --seed to insert synthetic tenants")
+        user_id = tenants[len(tenants) // 2]
+    contract_id, client_id = conn.execute(
+        select(Contract.id, Contract.client_id).where(Contract.user_id == user_id).limit(1)
+    ).one()
+    day = conn.execute(
+        select(Schedule.scheduled_date).where(Schedule.user_id == user_id).limit(1)
+    ).scalar() or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    return {"user_id": user_id, "contract_id": contract_id, "client_id": client_id, "day": day}
+
+
+def hot_queries(ids: dict) -> list:
+    """(name, statement) pairs mirroring the route queries the composite indexes target"""
+    user_id = ids["user_id"]
+    return [
+        (
+            "clients list",
+            select(Client)
+            .where(Client.user_id == user_id, Client.status != "pending_signature")
+            .order_by(Client.created_at.desc()),
+        ),
+        (
+            "quote requests",
+            select(Client)
+            .where(Client.user_id == user_id, Client.quote_status == "pending_review")
+            .order_by(Client.quote_submitted_at.desc()),
+        ),
+        (
+            "busy slots",
+            select(Schedule).where(
+                Schedule.user_id == user_id,
+                Schedule.scheduled_date == ids["day"],
+                Schedule.status.in_(["scheduled", "in-progress", "pending", "confirmed"]),
+            ),
+        ),
+        (
+            "paid invoices",
+            select(Invoice)
+            .where(Invoice.user_id == user_id, Invoice.status == "paid")
+            .order_by(Invoice.paid_at.desc()),
+        ),
+        (
+            "client last payment",
+            select(Invoice.paid_at)
+            .where(Invoice.client_id == ids["client_id"], Invoice.status == "paid")
+            .order_by(Invoice.paid_at.desc())
+            .limit(1),
+        ),
+        (
+            "contract visits",
+            select(Visit)
+            .where(Visit.contract_id == ids["contract_id"])
+            .order_by(desc(Visit.visit_number)),
+        ),
+        (
+            "first-cleaning ip check",
+            select(Contract.id)
+            .where(
+                Contract.user_id == user_id,
+                Contract.client_signature_ip == "10.0.0.1",
+                Contract.client_signature.isnot(None),
+            )
+            .limit(1),
+        ),
+        (
+            "contracts to re-render",
+            select(Contract.id)
+            .where(Contract.user_id == user_id, Contract.status.in_(["new"]))
+            .order_by(Contract.id),
+        ),
+    ]
+
+
+def walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+def explain(conn, statement) -> dict:
+    compiled = statement.compile(
+        dialect=engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    raw = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params).scalar()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", action="store_true", help="insert synthetic tenants first")
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=400, help="clients per seeded tenant")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    failures = 0
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            seeded = seed(conn, args.tenants, args.rows) if args.seed else {}
+            ids = pick_ids(conn, seeded.get("user_id"))
+
+            for name, statement in hot_queries(ids):
+                plan = explain(conn, statement)
+                nodes = list(walk(plan))
+                seq_scans = [
+                    node["Relation Name"]
+                    for node in nodes
+                    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in HOT_TABLES
+                ]
+                indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+                cost = plan["Total Cost"]
+
+                if seq_scans:
+                    failures += 1
+                    print(f"  FAIL {name:<24} Seq Scan on {', '.join(seq_scans)} (cost {cost})")
+                else:
+                    print(
+                        f"  ok   {name:<24} {', '.join(indexes) or plan['Node Type']} (cost {cost})"
+                    )
+        finally:
+            trans.rollback()
+
+    if failures:
+        print(f"{failures} hot queries plan a sequential scan - check the composite indexes")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
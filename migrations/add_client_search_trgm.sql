@@ -0,0 +1,16 @@
+-- Migration: Trigram-indexed client search
+-- Adds a generated, lower-cased search_text column (business name, contact name, email)
+-- with a pg_trgm GIN index. Serves GET /clients/search and the ILIKE filters of the
+-- client exports. Adding a stored generated column rewrites the table - run off-peak.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE clients ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (
+        lower(coalesce(business_name, '') || ' ' || coalesce(contact_name, '') || ' ' || coalesce(email, ''))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_clients_search_text_trgm
+    ON clients USING gin (search_text gin_trgm_ops);
+
+ANALYZE clients;
@@ -0,0 +1,8 @@
+-- Add terms snapshot to contracts table
+-- Stores the quote, form data and provider terms a contract PDF was rendered with, so
+-- bulk re-renders of signed contracts refresh branding without changing what was signed
+
+ALTER TABLE contracts ADD COLUMN IF NOT EXISTS terms_snapshot JSONB;
+
+-- Add comment
+COMMENT ON COLUMN contracts.terms_snapshot IS 'Quote, form data and provider terms the contract PDF was last rendered with';
@@ -0,0 +1,49 @@
+-- Migration: Composite indexes for per-tenant hot queries
+-- Every dashboard list filters by user_id first and then by a status/date column; the
+-- single-column indexes force a bitmap AND or a sort over the whole tenant. Verify with
+-- python benchmarks/explain_hot_queries.py after applying.
+--
+-- On large production tables, run each statement manually with CREATE INDEX CONCURRENTLY
+-- (outside a transaction) to avoid blocking writes while the index builds.
+
+-- Clients list: user_id + status != 'pending_signature' ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_clients_user_status_created
+    ON clients(user_id, status, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_clients_user_created_signed
+    ON clients(user_id, created_at DESC)
+    WHERE status <> 'pending_signature';
+
+-- Quote requests: user_id + quote_status ORDER BY quote_submitted_at DESC
+CREATE INDEX IF NOT EXISTS idx_clients_user_quote_status_submitted
+    ON clients(user_id, quote_status, quote_submitted_at DESC);
+
+-- Busy slots / calendar: user_id + scheduled_date
+CREATE INDEX IF NOT EXISTS idx_schedules_user_scheduled_date
+    ON schedules(user_id, scheduled_date);
+
+-- Payouts and notifications: user_id/client_id + status ORDER BY paid_at DESC
+CREATE INDEX IF NOT EXISTS idx_invoices_user_status_paid
+    ON invoices(user_id, status, paid_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_invoices_client_status_paid
+    ON invoices(client_id, status, paid_at DESC);
+
+-- Next visit number: contract_id ORDER BY visit_number DESC LIMIT 1
+CREATE INDEX IF NOT EXISTS idx_visits_contract_visit_number
+    ON visits(contract_id, visit_number);
+
+-- First-cleaning detection: signed contracts by IP for one business
+CREATE INDEX IF NOT EXISTS idx_contracts_user_signature_ip
+    ON contracts(user_id, client_signature_ip)
+    WHERE client_signature IS NOT NULL;
+
+-- Contract lists and bulk re-render: user_id + status
+CREATE INDEX IF NOT EXISTS idx_contracts_user_status
+    ON contracts(user_id, status);
+
+ANALYZE clients;
+ANALYZE schedules;
+ANALYZE invoices;
+ANALYZE visits;
+ANALYZE contracts;
@@ -0,0 +1,19 @@
+-- Migration: Store form and scope documents as JSONB
+-- JSON columns are stored as text and re-parsed on every read; JSONB is stored decomposed,
+-- supports containment/key-existence operators and can be GIN indexed.
+-- Each ALTER rewrites its table under an ACCESS EXCLUSIVE lock - run off-peak.
+
+ALTER TABLE clients ALTER COLUMN form_data TYPE JSONB USING form_data::jsonb;
+ALTER TABLE contracts ALTER COLUMN scope_of_work TYPE JSONB USING scope_of_work::jsonb;
+ALTER TABLE contracts ALTER COLUMN custom_scope TYPE JSONB USING custom_scope::jsonb;
+ALTER TABLE business_configs ALTER COLUMN custom_packages TYPE JSONB USING custom_packages::jsonb;
+ALTER TABLE scope_proposals ALTER COLUMN scope_data TYPE JSONB USING scope_data::jsonb;
+
+-- Default jsonb_ops (not jsonb_path_ops) so both @> (cleaningFrequency, selectedPackage)
+-- and ? (propertyShots) filters can use the index
+CREATE INDEX IF NOT EXISTS idx_clients_form_data_gin ON clients USING gin (form_data);
+
+ANALYZE clients;
+ANALYZE contracts;
+ANALYZE business_configs;
+ANALYZE scope_proposals;
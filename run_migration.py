@@ -1,6 +1,12 @@
 """
 Generic migration runner script
 Usage: python run_migration.py <migration_file.sql>
+       python run_migration.py --create-all   # create missing tables (new database)
+       python run_migration.py --stamp        # record the schema version without DDL
+
+Only --create-all and --stamp record the models' schema version in the schema_version
+table; applying a single SQL file can't tell whether other migrations are still pending.
+Run --stamp once every pending file is applied. App workers only compare that row at startup.
 """
 import sys
 import logging
@@ -9,6 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.database import engine
+from app.schema_version import create_schema, stamp_schema_version
 from sqlalchemy import text
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -26,7 +33,10 @@ def run_migration(migration_file_path: str):
     with open(migration_file, 'r') as f:
         sql = f.read()
     
-    statements = [s.strip() for s in sql.split(';') if s.strip() and not s.strip().startswith('--')]
+    # Drop full-line comments first - a comment directly above a statement would
+    # otherwise make the whole statement look like a comment and skip it
+    sql = '\n'.join(line for line in sql.splitlines() if not line.strip().startswith('--'))
+    statements = [s.strip() for s in sql.split(';') if s.strip()]
     
     logger.info(f"Found {len(statements)} SQL statements to execute")
     
@@ -37,14 +47,35 @@ def run_migration(migration_file_path: str):
         conn.commit()
     
     logger.info("✅ Migration completed successfully!")
+    logger.info(
+        "Run `python run_migration.py --stamp` once all pending migrations are applied "
+        "to record the schema version"
+    )
+
+def create_all():
+    """Create missing tables and indexes from the models - the explicit migrate step"""
+    with engine.begin() as conn:
+        version = create_schema(conn)
+    logger.info(f"✅ Tables created. Schema version: {version}")
+
+def stamp():
+    """Record the current schema version for a database that is already up to date"""
+    with engine.begin() as conn:
+        version = stamp_schema_version(conn, 'stamp')
+    logger.info(f"✅ Schema version stamped: {version}")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        logger.error("Usage: python run_migration.py <migration_file.sql>")
+        logger.error("Usage: python run_migration.py <migration_file.sql> | --create-all | --stamp")
         sys.exit(1)
     
     try:
-        run_migration(sys.argv[1])
+        if sys.argv[1] == '--create-all':
+            create_all()
+        elif sys.argv[1] == '--stamp':
+            stamp()
+        else:
+            run_migration(sys.argv[1])
     except Exception as e:
         logger.error(f"❌ Migration failed: {e}")
         sys.exit(1)